@@ -9,7 +9,11 @@ from api.resources.auth import blp as AuthBlueprint
 from api.resources.order import blp as OrderBlueprint
 from api import jwt_callbacks
 from api.celery_app import init_celery
+from api.services.blocklist import init_blocklist
+from api.services.email_templates import init_email_templates
+from api.services.order_events import init_order_events
 from api.extensions import metrics
+from api.cli import stats_cli, events_cli
 
 def create_app(test_config=None):
     app = Flask(__name__)
@@ -31,6 +35,12 @@ def create_app(test_config=None):
     api.register_blueprint(OrderBlueprint)
 
     init_celery(app)
+    init_blocklist(app)
+    init_email_templates(app)
+    init_order_events(app)
     metrics.init_app(app)
+
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(events_cli)
     
     return app
\ No newline at end of file
@@ -1,11 +1,34 @@
 from celery import Celery
+from kombu import Queue
+
+from api.tasks.monitoring import init_task_monitoring
 
 celery = Celery('api')
 
+ORDERS_QUEUE = "orders"
+EMAIL_QUEUE = "email"
+DEBUG_QUEUE = "debug"
+
 def init_celery(app):
     celery.conf.update(
         broker_url=app.config['CELERY_BROKER_URL'],
-        result_backend=app.config['CELERY_RESULT_BACKEND']
+        result_backend=app.config['CELERY_RESULT_BACKEND'],
+        # Each queue has its own worker service, so a backlog of emails or debug
+        # tasks never delays order processing. Unrouted tasks stay on `celery`.
+        task_queues=[
+            Queue(ORDERS_QUEUE),
+            Queue(EMAIL_QUEUE),
+            Queue(DEBUG_QUEUE),
+            Queue("celery"),
+        ],
+        task_routes={
+            "api.tasks.order.*": {"queue": ORDERS_QUEUE},
+            "api.tasks.email.*": {"queue": EMAIL_QUEUE},
+            "api.tasks.debug.*": {"queue": DEBUG_QUEUE},
+        },
+        # Redis emulates priorities with one list per step, 0 is consumed first
+        broker_transport_options={"priority_steps": list(range(10)), "sep": ":"},
+        worker_prefetch_multiplier=app.config['CELERY_WORKER_PREFETCH_MULTIPLIER']
     )
 
     class ContextTask(celery.Task):
@@ -16,5 +39,6 @@ def init_celery(app):
     celery.Task = ContextTask
 
     celery.autodiscover_tasks(["api.tasks"])
+    init_task_monitoring(app)
 
     return celery
\ No newline at end of file
@@ -0,0 +1,54 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from api.extensions import db
+from api.services.order_stats import rebuild_order_stats
+from api.services.order_event_archive import create_partitions, archive_partitions
+
+stats_cli = AppGroup("stats", help="Order statistics rollups.")
+events_cli = AppGroup("events", help="Order events partitions and archive.")
+
+@stats_cli.command("rebuild")
+@click.option("--batch-size", default=1000, show_default=True, help="Orders read per query.")
+def rebuild_stats(batch_size: int) -> None:
+    """
+    Recompute the order statistics rollups from the orders table, e.g. after drift.
+    Usage: flask --app api stats rebuild
+    """
+    counted = rebuild_order_stats(batch_size)
+    click.echo(f"Rebuilt order statistics from {counted} orders.")
+
+def _require_partitioning() -> None:
+    if db.engine.dialect.name != "postgresql":
+        raise click.ClickException("order_events is only partitioned on Postgres.")
+
+@events_cli.command("create-partitions")
+@click.option("--months-ahead", type=int, help="Defaults to ORDER_EVENTS_PARTITIONS_AHEAD.")
+def create_event_partitions(months_ahead: int | None) -> None:
+    """
+    Create the monthly order_events partitions of the coming months. Run it at least
+    monthly, events past the last partition land in the default one.
+    Usage: flask --app api events create-partitions
+    """
+    _require_partitioning()
+    if months_ahead is None:
+        months_ahead = current_app.config['ORDER_EVENTS_PARTITIONS_AHEAD']
+
+    created = create_partitions(months_ahead)
+    click.echo(f"Created partitions: {', '.join(created) or 'none'}.")
+
+@events_cli.command("archive")
+@click.option("--retention-months", type=int, help="Defaults to ORDER_EVENTS_RETENTION_MONTHS.")
+def archive_event_partitions(retention_months: int | None) -> None:
+    """
+    Move order_events partitions past the retention into order_event_archive and
+    drop them. Archived events are still returned by OrderModel.events.
+    Usage: flask --app api events archive
+    """
+    _require_partitioning()
+    if retention_months is None:
+        retention_months = current_app.config['ORDER_EVENTS_RETENTION_MONTHS']
+
+    for name, orders in archive_partitions(retention_months):
+        click.echo(f"Archived {name}: events of {orders} orders.")
@@ -1,7 +1,12 @@
 import os
+import tempfile
+from decimal import Decimal
 
 class Config:
     PROPAGATE_EXCEPTIONS = True
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 1024 * 1024))  # bytes, larger request bodies get 413
+    # Bytes, for /api/orders/batch only: fits a batch of ORDERS_BATCH_MAX_ITEMS items with every field at its maximum
+    ORDERS_BATCH_MAX_CONTENT_LENGTH = int(os.getenv("ORDERS_BATCH_MAX_CONTENT_LENGTH", 4 * 1024 * 1024))
     API_TITLE = "Event-driven Order Processing API built with Flask, Celery, Redis and JWT, featuring asynchronous workflows, audit event logging and full observability via Prometheus and Grafana"
     API_VERSION = "v1"
     
@@ -17,5 +22,83 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = 300  # 5 minutes
     JWT_REFRESH_TOKEN_EXPIRES = 2592000  # 30 days
 
+    PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", 29000))
+    # Hashing processes per app process (each gunicorn worker has its own pool), so keep
+    # gunicorn workers * PASSWORD_HASH_WORKERS around the CPU count. 0 hashes in the request thread
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 32))
+
+    # Upper bound (seconds) for a logout to be seen by other workers when a pub/sub message is missed
+    BLOCKLIST_CACHE_TTL = float(os.getenv("BLOCKLIST_CACHE_TTL", 5))
+    BLOCKLIST_CACHE_MAXSIZE = int(os.getenv("BLOCKLIST_CACHE_MAXSIZE", 10000))
+    BLOCKLIST_PUBSUB_ENABLED = os.getenv("BLOCKLIST_PUBSUB_ENABLED", "1") == "1"
+
+    # Token buckets per client (JWT identity or IP) and per scope: `capacity` is the allowed
+    # burst, `rate` the tokens added back per second
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+    RATE_LIMITS = {
+        "orders": {
+            "capacity": int(os.getenv("RATE_LIMIT_ORDERS_BURST", 20)),
+            "rate": float(os.getenv("RATE_LIMIT_ORDERS_RATE", 5)),
+            "global_capacity": int(os.getenv("RATE_LIMIT_ORDERS_GLOBAL_BURST", 2000)),
+            "global_rate": float(os.getenv("RATE_LIMIT_ORDERS_GLOBAL_RATE", 1000)),
+        },
+        "auth": {
+            "capacity": int(os.getenv("RATE_LIMIT_AUTH_BURST", 10)),
+            "rate": float(os.getenv("RATE_LIMIT_AUTH_RATE", 0.5)),
+            "global_capacity": int(os.getenv("RATE_LIMIT_AUTH_GLOBAL_BURST", 200)),
+            "global_rate": float(os.getenv("RATE_LIMIT_AUTH_GLOBAL_RATE", 100)),
+        },
+    }
+
     CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/1")
-    CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/2")
\ No newline at end of file
+    CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/2")
+    # Messages reserved per worker thread/process. Set per worker service in docker-compose.yml:
+    # 1 for orders and debug (priorities apply, long tasks don't hold others back), higher for email
+    CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.getenv("CELERY_WORKER_PREFETCH_MULTIPLIER", 1))
+    # Port of the worker metrics endpoint. Prefork workers also need PROMETHEUS_MULTIPROC_DIR
+    CELERY_METRICS_PORT = int(os.getenv("CELERY_METRICS_PORT", 9102))
+
+    # Broker priority of order tasks, 0 is consumed first and 9 last. Large fresh orders go
+    # first, small ones and retries can't starve them.
+    ORDER_TASK_PRIORITY = int(os.getenv("ORDER_TASK_PRIORITY", 0))
+    ORDER_SMALL_TOTAL_PRIORITY = int(os.getenv("ORDER_SMALL_TOTAL_PRIORITY", 3))
+    ORDER_RETRY_PRIORITY = int(os.getenv("ORDER_RETRY_PRIORITY", 6))
+    ORDER_SMALL_TOTAL = Decimal(os.getenv("ORDER_SMALL_TOTAL", "20.00"))
+
+    # Orders processed at the same time by one worker process (needs `--pool threads`)
+    ORDER_PROCESSING_CONCURRENCY = int(os.getenv("ORDER_PROCESSING_CONCURRENCY", 100))
+    ORDER_PROCESSING_SIMULATED_LATENCY = float(os.getenv("ORDER_PROCESSING_SIMULATED_LATENCY", 5))  # seconds
+    # Seconds a task attempt owns a PROCESSING order, other deliveries back off meanwhile.
+    # Keep it above the time an attempt takes and below the broker's visibility timeout
+    ORDER_CLAIM_LEASE = int(os.getenv("ORDER_CLAIM_LEASE", 600))
+
+    EMAIL_BATCH_WINDOW = float(os.getenv("EMAIL_BATCH_WINDOW", 2))  # seconds
+    EMAIL_BATCH_MAX_SIZE = int(os.getenv("EMAIL_BATCH_MAX_SIZE", 500))  # Mailgun allows up to 1000 recipients
+    EMAIL_BATCH_SENDING = os.getenv("EMAIL_BATCH_SENDING", "1") == "1"
+    EMAIL_HTTP_POOL_SIZE = int(os.getenv("EMAIL_HTTP_POOL_SIZE", 10))
+    # Seconds after which emails taken by a batch that never finished (dead worker) are
+    # queued again, keep it above the time to send EMAIL_BATCH_MAX_SIZE emails one by one
+    EMAIL_BATCH_ACK_TIMEOUT = int(os.getenv("EMAIL_BATCH_ACK_TIMEOUT", 3600))
+    # Jinja bytecode cache shared by the workers of a host
+    EMAIL_TEMPLATE_CACHE_DIR = os.getenv("EMAIL_TEMPLATE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "orderprocessing-jinja-cache"))
+    EMAIL_TEMPLATE_AUTO_RELOAD = os.getenv("EMAIL_TEMPLATE_AUTO_RELOAD", "0") == "1"  # also disables the render cache
+    EMAIL_TEMPLATE_RENDER_CACHE_SIZE = int(os.getenv("EMAIL_TEMPLATE_RENDER_CACHE_SIZE", 1024))
+
+    OUTBOX_RELAY_BATCH_SIZE = int(os.getenv("OUTBOX_RELAY_BATCH_SIZE", 500))
+    OUTBOX_RELAY_POLL_INTERVAL = float(os.getenv("OUTBOX_RELAY_POLL_INTERVAL", 0.5))  # seconds
+    OUTBOX_RELAY_METRICS_PORT = int(os.getenv("OUTBOX_RELAY_METRICS_PORT", 9101))
+
+    ORDER_STATUS_CACHE_TTL = int(os.getenv("ORDER_STATUS_CACHE_TTL", 60))  # seconds
+    ORDER_CANCELLATION_FLAG_TTL = int(os.getenv("ORDER_CANCELLATION_FLAG_TTL", 3600))  # seconds, outlives all retries
+    IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", 86400))  # seconds a stored response is replayed
+    IDEMPOTENCY_LOCK_TTL = int(os.getenv("IDEMPOTENCY_LOCK_TTL", 30))  # seconds
+    IDEMPOTENCY_WAIT = float(os.getenv("IDEMPOTENCY_WAIT", 2))  # seconds a duplicate waits for the first request
+    ORDER_EVENTS_STREAM_TIMEOUT = int(os.getenv("ORDER_EVENTS_STREAM_TIMEOUT", 300))  # seconds
+    ORDER_EVENTS_STREAM_HEARTBEAT = int(os.getenv("ORDER_EVENTS_STREAM_HEARTBEAT", 15))  # seconds
+    # Open streams per process, each holds a gunicorn thread: keep it below GUNICORN_THREADS
+    # on the API service, the events service (docker-compose `web-events`) serves the rest
+    ORDER_EVENTS_MAX_STREAMS = int(os.getenv("ORDER_EVENTS_MAX_STREAMS", 2))
+    ORDER_EXPORT_BATCH_SIZE = int(os.getenv("ORDER_EXPORT_BATCH_SIZE", 500))  # orders fetched per round trip
+    ORDER_EVENTS_PARTITIONS_AHEAD = int(os.getenv("ORDER_EVENTS_PARTITIONS_AHEAD", 3))  # months
+    ORDER_EVENTS_RETENTION_MONTHS = int(os.getenv("ORDER_EVENTS_RETENTION_MONTHS", 6))  # months kept before the current one
\ No newline at end of file
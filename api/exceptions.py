@@ -6,4 +6,23 @@ class EmailPermanentError(Exception): pass
 # Exceptions used by order processing tasks
 
 class BusinessLogicError(Exception): pass
-class TemporaryInfrastructureError(Exception): pass
\ No newline at end of file
+class TemporaryInfrastructureError(Exception): pass
+class InvalidOrderTransitionError(Exception): pass
+
+# Exceptions used by cursor pagination
+
+class InvalidCursorError(Exception): pass
+
+# Exceptions used by password hashing
+
+class PasswordHashingSaturatedError(Exception): pass
+
+# Exceptions used by idempotent requests
+
+class IdempotencyConflictError(Exception): pass
+class IdempotencyKeyMismatchError(Exception): pass
+
+
+# Exceptions used by rate limiting
+
+class RateLimitExceededError(Exception): pass
@@ -1,11 +1,19 @@
+import os
 from flask_smorest import Api
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from prometheus_flask_exporter import PrometheusMetrics
+from prometheus_flask_exporter.multiprocess import GunicornInternalPrometheusMetrics
 
 db = SQLAlchemy()
 migrate = Migrate()
 api = Api()
 jwt = JWTManager()
-metrics = PrometheusMetrics.for_app_factory()
\ No newline at end of file
+
+# Under gunicorn (see gunicorn.conf.py) every worker writes its samples to
+# PROMETHEUS_MULTIPROC_DIR and /metrics aggregates all of them.
+if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+    metrics = GunicornInternalPrometheusMetrics.for_app_factory()
+else:
+    metrics = PrometheusMetrics.for_app_factory()
\ No newline at end of file
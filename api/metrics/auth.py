@@ -0,0 +1,29 @@
+from prometheus_client import Counter, Histogram
+
+blocklist_cache_hits_total = Counter(
+    "blocklist_cache_hits_total",
+    "Total number of token blocklist lookups served from the in-process cache"
+)
+
+blocklist_cache_misses_total = Counter(
+    "blocklist_cache_misses_total",
+    "Total number of token blocklist lookups that went to Redis"
+)
+
+password_hash_queue_wait_seconds = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time password hashing jobs wait for a free worker",
+    ["operation"]
+)
+
+password_hash_duration_seconds = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password",
+    ["operation"]
+)
+
+password_hash_rejected_total = Counter(
+    "password_hash_rejected_total",
+    "Total number of password hashing jobs rejected because the pool was saturated",
+    ["operation"]
+)
@@ -13,4 +13,19 @@ orders_items_total = Counter(
 orders_total_amount_sum = Counter(
     "orders_total_amount_sum",
     "Total value of all created orders"
-)
\ No newline at end of file
+)
+
+order_status_cache_hits_total = Counter(
+    "order_status_cache_hits_total",
+    "Total number of order status reads served from cache"
+)
+
+order_status_cache_misses_total = Counter(
+    "order_status_cache_misses_total",
+    "Total number of order status reads that missed the cache"
+)
+
+order_status_cache_invalidations_total = Counter(
+    "order_status_cache_invalidations_total",
+    "Total number of order status cache invalidations"
+)
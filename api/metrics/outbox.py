@@ -0,0 +1,21 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+outbox_lag_seconds = Gauge(
+    "outbox_lag_seconds",
+    "Age of the oldest outbox message waiting to be relayed"
+)
+
+outbox_messages_relayed_total = Counter(
+    "outbox_messages_relayed_total",
+    "Total number of outbox messages published to the broker"
+)
+
+outbox_relay_batch_duration_seconds = Histogram(
+    "outbox_relay_batch_duration_seconds",
+    "Time spent relaying one batch of outbox messages"
+)
+
+outbox_relay_errors_total = Counter(
+    "outbox_relay_errors_total",
+    "Total number of failed outbox relay batches"
+)
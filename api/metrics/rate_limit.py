@@ -0,0 +1,13 @@
+from prometheus_client import Counter
+
+rate_limit_allowed_total = Counter(
+    "rate_limit_allowed_total",
+    "Total number of requests admitted by the rate limiter",
+    ["scope"]
+)
+
+rate_limit_rejected_total = Counter(
+    "rate_limit_rejected_total",
+    "Total number of requests rejected by the rate limiter",
+    ["scope", "bucket"]
+)
@@ -0,0 +1,29 @@
+from prometheus_client import Counter, Histogram
+
+TASK_SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+celery_task_runtime_seconds = Histogram(
+    "celery_task_runtime_seconds",
+    "Time a worker spends running a task",
+    ["task_name"],
+    buckets=TASK_SECONDS_BUCKETS
+)
+
+celery_task_queue_wait_seconds = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time between publishing a task (or its ETA) and a worker starting it",
+    ["task_name", "queue"],
+    buckets=TASK_SECONDS_BUCKETS
+)
+
+celery_task_retries_total = Counter(
+    "celery_task_retries_total",
+    "Total number of task retries",
+    ["task_name", "reason"]
+)
+
+celery_task_failures_total = Counter(
+    "celery_task_failures_total",
+    "Total number of tasks that ended in failure",
+    ["task_name", "reason"]
+)
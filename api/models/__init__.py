@@ -1,4 +1,7 @@
 from api.models.user import UserModel
-from api.models.order import OrderModel, OrderStatus
+from api.models.order import OrderModel, OrderStatus, ORDER_STATUS_TRANSITIONS
 from api.models.order_item import OrderItemModel
-from api.models.order_event import OrderEventModel, OrderEventType
\ No newline at end of file
+from api.models.order_event import OrderEventModel, OrderEventType
+from api.models.order_event_archive import OrderEventArchiveModel
+from api.models.outbox_message import OutboxMessageModel
+from api.models.order_daily_stats import OrderDailyStatsModel
\ No newline at end of file
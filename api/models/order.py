@@ -9,8 +9,21 @@ class OrderStatus(enum.Enum):
     FAILED = "failed"
     CANCELLED = "cancelled"
 
+# Allowed status changes, everything else is rejected. Final statuses have no way out.
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.PENDING: frozenset({OrderStatus.PROCESSING, OrderStatus.CANCELLED}),
+    OrderStatus.PROCESSING: frozenset({OrderStatus.COMPLETED, OrderStatus.FAILED, OrderStatus.CANCELLED}),
+    OrderStatus.COMPLETED: frozenset(),
+    OrderStatus.FAILED: frozenset(),
+    OrderStatus.CANCELLED: frozenset(),
+}
+
 class OrderModel(db.Model):
     __tablename__ = "orders"
+    __table_args__ = (
+        db.Index("ix_orders_uuid_user_id", "uuid", "user_id"),
+        db.Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     uuid = db.Column(db.String(36), unique=True, nullable=False, index=True)
@@ -23,6 +36,10 @@ class OrderModel(db.Model):
         index=True
     )
     total_amount = db.Column(db.Numeric(10, 2), nullable=False)
+    # Id of the process_order_task message, assigned when the order is enqueued
+    task_id = db.Column(db.String(36), nullable=True)
+    # Start of the lease of the task attempt processing the order, NULL when released
+    claimed_at = db.Column(db.DateTime(timezone=True), nullable=True)
 
     created_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now())
     updated_at = db.Column(
@@ -38,16 +55,31 @@ class OrderModel(db.Model):
         back_populates="order", 
         cascade="all, delete-orphan"
     )
-    events = db.relationship(
+    # Events still in the order_events partitions, see `events` for the full history.
+    recent_events = db.relationship(
         "OrderEventModel",
         back_populates="order",
         cascade="all, delete-orphan",
         order_by="OrderEventModel.created_at"
     )
+    event_archive = db.relationship(
+        "OrderEventArchiveModel",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<Order id={self.id} status={self.status.value}>"
     
     @property
     def status_value(self):
-        return self.status.value
\ No newline at end of file
+        return self.status.value
+
+    @property
+    def events(self):
+        """
+        Full event history: events of archived partitions first, then the recent ones.
+        Load both `recent_events` and `event_archive` up front when reading many orders.
+        """
+        archived = self.event_archive.to_events() if self.event_archive is not None else []
+        return archived + list(self.recent_events)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from api.extensions import db
+from api.models.order import OrderStatus
+
+class OrderDailyStatsModel(db.Model):
+    """
+    Rollup of orders per user, day the order was created and current status.
+    Maintained incrementally by api.services.order_stats, never written directly.
+    """
+    __tablename__ = "order_daily_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.Enum(OrderStatus), primary_key=True)
+
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<OrderDailyStats user_id={self.user_id} day={self.day} status={self.status.value}>"
\ No newline at end of file
@@ -12,6 +12,11 @@ class OrderEventType(enum.Enum):
 
 class OrderEventModel(db.Model):
     __tablename__ = "order_events"
+    # On Postgres the table is partitioned by month on created_at (primary key
+    # (id, created_at)), old partitions are moved to order_event_archive.
+    __table_args__ = (
+        db.Index("ix_order_events_order_id_created_at", "order_id", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey("orders.id"), nullable=False)
@@ -23,10 +28,10 @@ class OrderEventModel(db.Model):
     )
     payload = db.Column(db.JSON, nullable=True)
 
-    created_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now())
+    created_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now(), nullable=False)
 
     # Relationships
-    order = db.relationship("OrderModel", back_populates="events")
+    order = db.relationship("OrderModel", back_populates="recent_events")
 
     def __repr__(self):
         return f"<OrderEvent order_id={self.order_id} event={self.event_type.value}>"
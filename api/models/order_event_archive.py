@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from api.extensions import db
+from api.models.order_event import OrderEventModel, OrderEventType
+
+class OrderEventArchiveModel(db.Model):
+    """
+    Events of an order moved out of the monthly order_events partitions, one row per order
+    with the events as a JSON array (oldest first). Written only by
+    api.services.order_event_archive, read through OrderModel.events.
+    """
+    __tablename__ = "order_event_archive"
+
+    order_id = db.Column(db.Integer, db.ForeignKey("orders.id"), primary_key=True)
+    events = db.Column(db.JSON, nullable=False)
+    archived_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now())
+
+    def __repr__(self):
+        return f"<OrderEventArchive order_id={self.order_id} events={len(self.events)}>"
+
+    def to_events(self) -> list[OrderEventModel]:
+        # Transient instances, never added to the session.
+        return [
+            OrderEventModel(
+                id=event['id'],
+                order_id=self.order_id,
+                event_type=OrderEventType[event['event_type']],
+                payload=event['payload'],
+                created_at=datetime.fromisoformat(event['created_at'])
+            )
+            for event in self.events
+        ]
@@ -4,7 +4,7 @@ class OrderItemModel(db.Model):
     __tablename__ = "order_items"
 
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey("orders.id"), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey("orders.id"), nullable=False, index=True)
 
     product_name = db.Column(db.String(120), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
@@ -0,0 +1,15 @@
+from api.extensions import db
+
+class OutboxMessageModel(db.Model):
+    __tablename__ = "outbox_messages"
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_name = db.Column(db.String(255), nullable=False)
+    args = db.Column(db.JSON, nullable=False)
+    priority = db.Column(db.SmallInteger, nullable=True)
+    task_id = db.Column(db.String(36), nullable=True)
+
+    created_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now())
+
+    def __repr__(self):
+        return f"<OutboxMessage id={self.id} task={self.task_name}>"
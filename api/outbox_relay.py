@@ -0,0 +1,36 @@
+import time
+from kombu.exceptions import OperationalError
+from prometheus_client import start_http_server
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+
+from api import create_app
+from api.extensions import db
+from api.services.outbox import relay_outbox_batch
+from api.metrics.outbox import outbox_relay_errors_total
+
+app = create_app()
+
+def run_outbox_relay() -> None:
+    batch_size = app.config['OUTBOX_RELAY_BATCH_SIZE']
+    poll_interval = app.config['OUTBOX_RELAY_POLL_INTERVAL']
+
+    start_http_server(app.config['OUTBOX_RELAY_METRICS_PORT'])
+    app.logger.info("Outbox relay started.", extra={"batch_size": batch_size})
+
+    while True:
+        with app.app_context():
+            try:
+                relayed = relay_outbox_batch(batch_size)
+            except (SQLAlchemyError, RedisError, OperationalError) as e:
+                db.session.rollback()
+                outbox_relay_errors_total.inc()
+                app.logger.error("Failed to relay outbox batch.", extra={"error": str(e)})
+                relayed = 0
+
+        # A full batch means there is a backlog, keep draining without waiting.
+        if relayed < batch_size:
+            time.sleep(poll_interval)
+
+if __name__ == "__main__":
+    run_outbox_relay()
@@ -1,7 +1,6 @@
 from flask import current_app
 from flask.views import MethodView
 from flask_smorest import abort, Blueprint
-from passlib.hash import pbkdf2_sha256 as sha256
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt, get_jwt_identity
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timezone
@@ -10,24 +9,38 @@ from redis.exceptions import RedisError
 from api.extensions import db
 from api.models import UserModel
 from api.schemas import UserRegisterSchema, UserLoginSchema
+from api.exceptions import PasswordHashingSaturatedError
 from api.services.blocklist import add_jti_to_blocklist
+from api.services.password_hashing import hash_password, verify_password, needs_rehash
+from api.services.rate_limit import rate_limit
 from api.tasks import email as email_tasks
 
 blp = Blueprint("auth", __name__, description="Endpoints for user registration and authentication.")
 
+def _abort_busy():
+    abort(503, message="Server is busy, please try again later.", headers={"Retry-After": "1"})
+
 @blp.route("/auth/register")
 class UserRegister(MethodView):
+    @rate_limit("auth", key="ip")
     @blp.arguments(UserRegisterSchema)
     @blp.response(201, description="User created successfully.")
     @blp.alt_response(409, description="A user with that email already exists.")
+    @blp.alt_response(429, description="Too many requests.")
+    @blp.alt_response(503, description="Server is busy.")
     def post(self, user_data: dict) -> dict:
         if UserModel.query.filter(UserModel.email == user_data['email']).first():
             abort(409, message="A user with that email already exists.")
 
+        try:
+            password = hash_password(user_data['password'])
+        except PasswordHashingSaturatedError:
+            _abort_busy()
+
         user = UserModel(
             username=user_data['username'],
             email=user_data['email'],
-            password=sha256.hash(user_data['password'])
+            password=password
         )
 
         try:
@@ -37,7 +50,7 @@ class UserRegister(MethodView):
             abort(500, message="An error occurred while creating the user.")
 
         try:
-            email_tasks.send_user_registration_email.delay(user.email, user.username)
+            email_tasks.queue_registration_email(user.email, user.username)
         except RedisError as e:
             current_app.logger.error(
                 "Failed to enqueue async task for sending registration email.",
@@ -48,19 +61,43 @@ class UserRegister(MethodView):
         
 @blp.route("/auth/login")
 class UserLogin(MethodView):
+    @rate_limit("auth", key="ip")
     @blp.arguments(UserLoginSchema)
     @blp.response(200, description="User logged in successfully.")
     @blp.alt_response(401, description="Invalid credentials.")
+    @blp.alt_response(429, description="Too many requests.")
+    @blp.alt_response(503, description="Server is busy.")
     def post(self, user_data: dict[str, str]) -> dict[str, str]:
         user = UserModel.query.filter(UserModel.email == user_data['email']).first()
 
-        if user and sha256.verify(user_data['password'], user.password):
+        try:
+            valid = user is not None and verify_password(user_data['password'], user.password)
+        except PasswordHashingSaturatedError:
+            _abort_busy()
+
+        if valid:
+            if needs_rehash(user.password):
+                self._rehash(user, user_data['password'])
+
             access_token = create_access_token(identity=str(user.id), fresh=True)
             refresh_token = create_refresh_token(identity=str(user.id))
             return {"access_token": access_token, "refresh_token": refresh_token}
 
         abort(401, message="Invalid credentials.")
 
+    @staticmethod
+    def _rehash(user: UserModel, password: str) -> None:
+        """Upgrade the stored hash to the configured rounds, best effort."""
+        try:
+            user.password = hash_password(password)
+            db.session.commit()
+        except (PasswordHashingSaturatedError, SQLAlchemyError) as e:
+            db.session.rollback()
+            current_app.logger.warning(
+                "Failed to rehash user password.",
+                extra={"error": str(e), "user_id": user.id}
+            )
+
 @blp.route("/auth/logout")
 class UserLogout(MethodView):
     @jwt_required(refresh=True)
@@ -1,25 +1,69 @@
+import io
+import csv
+import json
+import time
 import uuid
 from decimal import Decimal
+from functools import wraps
 from flask.views import MethodView
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_smorest import Blueprint, abort
-from flask import current_app
+from flask import current_app, jsonify, request, Response, stream_with_context
+from marshmallow import ValidationError
 from redis.exceptions import RedisError
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import joinedload, selectinload, raiseload
+from sqlalchemy.exc import SQLAlchemyError
 
 from api.extensions import db
+from api.exceptions import (
+    InvalidCursorError,
+    IdempotencyConflictError,
+    IdempotencyKeyMismatchError
+)
 from api.models import (
+    UserModel,
     OrderModel,
     OrderStatus,
     OrderItemModel,
     OrderEventModel,
-    OrderEventType
+    OrderEventType,
+    OutboxMessageModel
 )
 from api.schemas import (
     OrderCreateSchema, 
     OrderResponseSchema,
-    OrderStatusResponseSchema
+    OrderStatusResponseSchema,
+    OrderBatchCreateSchema,
+    OrderBatchResponseSchema,
+    OrderListQuerySchema,
+    OrderListResponseSchema,
+    OrderExportQuerySchema,
+    OrderStatsQuerySchema,
+    OrderStatsResponseSchema,
+    dump_order,
+    dump_order_status
 )
 from api.tasks import order as order_tasks
+from api.services.outbox import enqueue_task, outbox_row
+from api.services.idempotency import (
+    request_fingerprint,
+    begin_idempotent_request,
+    complete_idempotent_request,
+    release_idempotent_request
+)
+from api.services.rate_limit import rate_limit
+from api.services.order_status import cancel_order, commit_order_event
+from api.services.order_cancellation import stop_order_processing
+from api.services.order_stats import record_orders_created, get_order_stats
+from api.services.order_cache import get_cached_order_status, cache_order_status
+from api.services.order_events import (
+    TERMINAL_EVENT_TYPES,
+    serialize_order_event,
+    subscribe_order_events,
+    acquire_stream_slot
+)
+from api.utils.pagination import encode_cursor, decode_cursor
 from api.metrics.orders import (
     orders_created_total,
     orders_total_amount_sum,
@@ -28,30 +72,133 @@ from api.metrics.orders import (
 
 blp = Blueprint("orders", __name__, description="Order processing endpoints")
 
+FINAL_ORDER_STATUSES = {OrderStatus.COMPLETED, OrderStatus.FAILED, OrderStatus.CANCELLED}
+
+def _calculate_total_amount(items: list[dict]) -> Decimal:
+    total_amount = sum(
+        Decimal(item['quantity']) * Decimal(item['unit_price'])
+        for item in items
+    )
+    return total_amount.quantize(Decimal("0.01"))
+
 @blp.route("/api/orders")
 class OrdersResource(MethodView):
     @jwt_required()
+    @blp.arguments(OrderListQuerySchema, location="query")
+    @blp.response(200, OrderListResponseSchema, description="List orders of the authenticated user.")
+    @blp.alt_response(400, description="Invalid pagination cursor.")
+    def get(self, args):
+        """
+        List the authenticated user's orders, newest first.
+        Uses keyset pagination on (created_at, id): pass `next_cursor` from the previous
+        page as `cursor` to get the next one. Every page costs the same regardless of depth.
+        """
+
+        user = db.session.get(UserModel, get_jwt_identity()) or abort(404)
+        limit = args['limit']
+
+        query = user.orders
+        if "status" in args:
+            query = query.filter(OrderModel.status == OrderStatus(args['status']))
+        if "created_from" in args:
+            query = query.filter(OrderModel.created_at >= args['created_from'])
+        if "created_to" in args:
+            query = query.filter(OrderModel.created_at <= args['created_to'])
+
+        if "cursor" in args:
+            try:
+                cursor_id = decode_cursor(args['cursor'])
+            except InvalidCursorError as e:
+                abort(400, message=str(e))
+
+            cursor_order = (
+                select(OrderModel.created_at, OrderModel.id)
+                .where(OrderModel.id == cursor_id, OrderModel.user_id == user.id)
+            )
+            # An unknown id or another user's order would compare against NULL and
+            # silently return an empty page.
+            if db.session.execute(cursor_order).first() is None:
+                abort(400, message="Invalid pagination cursor.")
+
+            # The cursor only carries the id, its (created_at, id) position is read back
+            # from the stored row so the comparison never depends on datetime formatting.
+            query = query.filter(
+                tuple_(OrderModel.created_at, OrderModel.id) < cursor_order.scalar_subquery()
+            )
+
+        orders = (
+            query
+            .order_by(OrderModel.created_at.desc(), OrderModel.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = encode_cursor(orders[limit - 1].id) if len(orders) > limit else None
+
+        return jsonify({"orders": [dump_order(order) for order in orders[:limit]], "next_cursor": next_cursor})
+
+    @jwt_required()
+    @rate_limit("orders")
     @blp.arguments(OrderCreateSchema)
     @blp.response(201, OrderResponseSchema, description="Create a new order.")
+    @blp.alt_response(400, description="Invalid Idempotency-Key.")
+    @blp.alt_response(409, description="A request with the same Idempotency-Key is in progress.")
+    @blp.alt_response(413, description="Request body too large.")
+    @blp.alt_response(422, description="Idempotency-Key reused for a different request.")
+    @blp.alt_response(429, description="Too many requests.")
     def post(self, data):
-        """Create new order and enqueue async processing task."""
+        """
+        Create new order and enqueue async processing task.
+        With an `Idempotency-Key` header, retries with the same key return the stored
+        response of the first request instead of creating another order.
+        """
 
         user_id = get_jwt_identity()
+        idempotency_key = request.headers.get("Idempotency-Key")
 
-        total_amount = sum(
-            Decimal(item['quantity']) * Decimal(item['unit_price'])
-            for item in data['items']
-        )
-        total_amount = total_amount.quantize(Decimal("0.01"))
+        if idempotency_key is None:
+            return jsonify(dump_order(self._create_order(user_id, data))), 201
+
+        if not 0 < len(idempotency_key) <= 255:
+            abort(400, message="Idempotency-Key must be between 1 and 255 characters.")
+
+        fingerprint = request_fingerprint(data)
+        try:
+            stored = begin_idempotent_request(user_id, idempotency_key, fingerprint)
+        except IdempotencyConflictError as e:
+            abort(409, message=str(e))
+        except IdempotencyKeyMismatchError as e:
+            abort(422, message=str(e))
+
+        if stored is not None:
+            status_code, body = stored
+            return jsonify(body), status_code, {"Idempotent-Replayed": "true"}
+
+        try:
+            order = self._create_order(user_id, data)
+        except BaseException:
+            release_idempotent_request(user_id, idempotency_key)
+            raise
+
+        body = dump_order(order)
+        complete_idempotent_request(user_id, idempotency_key, fingerprint, 201, body)
+
+        return jsonify(body), 201
+
+    @staticmethod
+    def _create_order(user_id, data: dict) -> OrderModel:
+        total_amount = _calculate_total_amount(data['items'])
 
         order = OrderModel(
             uuid=str(uuid.uuid4()),
             user_id=user_id,
             total_amount=total_amount,
-            status=OrderStatus.PENDING
+            status=OrderStatus.PENDING,
+            task_id=str(uuid.uuid4())
         )
         db.session.add(order)
         db.session.flush()
+        record_orders_created([(order.user_id, order.created_at, total_amount)])
 
         for item in data['items']:
             db.session.add(
@@ -74,33 +221,264 @@ class OrdersResource(MethodView):
                 event_type=OrderEventType.ORDER_ENQUEUED,
             )
         )
+        # Published by the outbox relay, committed atomically with the order.
+        enqueue_task(
+            order_tasks.process_order_task,
+            order.id,
+            data.get('error'),
+            priority=order_tasks.order_task_priority(total_amount),
+            task_id=order.task_id
+        )
         db.session.commit()
 
-        try:
-            order_tasks.process_order_task.delay(order.id, data.get('error'))
-        except RedisError as e:
-            current_app.logger.error(
-                "Failed to enqueue async task for order processing.",
-                extra={"error": str(e), "order_id": order.id}
-            )
-
         orders_created_total.inc()
         orders_total_amount_sum.inc(float(total_amount))
         orders_items_total.inc(len(data['items']))
 
         return order
+
+@blp.route("/api/orders/stats")
+class OrderStatsResource(MethodView):
+    @jwt_required()
+    @blp.arguments(OrderStatsQuerySchema, location="query")
+    @blp.response(200, OrderStatsResponseSchema, description="Order statistics of the authenticated user.")
+    def get(self, args):
+        """
+        Order counts, total amounts and status breakdown of the authenticated user,
+        per day the orders were created and overall.
+        Read from rollups kept up to date on every order write, the orders table isn't scanned.
+        """
+
+        return get_order_stats(get_jwt_identity(), args.get('date_from'), args.get('date_to'))
+
+EXPORT_CSV_COLUMNS = ["uuid", "status", "total_amount", "created_at", "items", "events"]
+
+def _export_orders(user_id, batch_size: int):
+    """
+    Yield the user's orders serialized one at a time. Orders are read through a
+    server-side cursor in batches of `batch_size`, with their items and recent events
+    loaded by one IN query each per batch and archived events joined in. Each batch is dropped from the session once
+    written, so memory doesn't grow with the number of orders.
+    """
+    result = db.session.scalars(
+        select(OrderModel)
+        .where(OrderModel.user_id == user_id)
+        .order_by(OrderModel.id)
+        .options(
+            selectinload(OrderModel.items),
+            selectinload(OrderModel.recent_events),
+            joinedload(OrderModel.event_archive),
+            raiseload("*")
+        )
+        .execution_options(yield_per=batch_size)
+    )
+
+    for batch in result.partitions():
+        for order in batch:
+            yield dump_order_status(order)
+        # Items, events and archives go along through the delete-orphan cascade
+        for order in batch:
+            db.session.expunge(order)
+
+def _export_ndjson(orders):
+    for order in orders:
+        yield json.dumps(order) + "\n"
+
+def _export_csv(orders):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        row = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return row
+
+    writer.writerow(EXPORT_CSV_COLUMNS)
+    yield flush()
+
+    for order in orders:
+        writer.writerow([
+            order['uuid'],
+            order['status'],
+            order['total_amount'],
+            order['created_at'],
+            json.dumps(order['items']),
+            json.dumps(order['events'])
+        ])
+        yield flush()
+
+@blp.route("/api/orders/export")
+class OrdersExportResource(MethodView):
+    @jwt_required()
+    @blp.arguments(OrderExportQuerySchema, location="query")
+    @blp.response(200, description="All orders of the authenticated user, as NDJSON or CSV.", content_type="application/x-ndjson")
+    def get(self, args):
+        """
+        Export all orders of the authenticated user with their items and events.
+        `format=ndjson` (default) writes one order JSON per line. `format=csv` writes one
+        row per order, with items and events as JSON arrays. The response is streamed
+        while the orders are read, so exports of any size use the same memory.
+        """
+
+        orders = _export_orders(get_jwt_identity(), current_app.config['ORDER_EXPORT_BATCH_SIZE'])
+
+        if args['format'] == "csv":
+            body, mimetype = _export_csv(orders), "text/csv"
+        else:
+            body, mimetype = _export_ndjson(orders), "application/x-ndjson"
+
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f'attachment; filename="orders.{args["format"]}"'}
+        )
+
+def _batch_max_content_length(view):
+    # Set before the body is read by @blp.arguments, instead of the app-wide MAX_CONTENT_LENGTH.
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        request.max_content_length = current_app.config['ORDERS_BATCH_MAX_CONTENT_LENGTH']
+        return view(*args, **kwargs)
+    return wrapper
+
+@blp.route("/api/orders/batch")
+class OrdersBatchResource(MethodView):
+    @jwt_required()
+    @rate_limit("orders")
+    @_batch_max_content_length
+    @blp.arguments(OrderBatchCreateSchema)
+    @blp.response(200, OrderBatchResponseSchema, description="Create many orders at once.")
+    @blp.alt_response(413, description="Request body too large.")
+    @blp.alt_response(429, description="Too many requests.")
+    def post(self, data):
+        """
+        Create a batch of orders and enqueue their processing tasks.
+        Every order is validated on its own, invalid orders are reported as rejected
+        without failing the rest of the batch. Valid orders, their items, events and
+        outbox messages are written with bulk inserts in a single transaction.
+        """
+
+        user_id = get_jwt_identity()
+        create_schema = OrderCreateSchema()
+
+        results = []
+        accepted = []
+        for index, raw_order in enumerate(data['orders']):
+            try:
+                order_data = create_schema.load(raw_order)
+            except ValidationError as e:
+                results.append({"index": index, "result": "rejected", "errors": e.messages})
+                continue
+
+            results.append({"index": index, "result": "created"})
+            accepted.append((results[-1], order_data))
+
+        if accepted:
+            try:
+                created_orders = self._bulk_insert_orders(user_id, accepted)
+            except SQLAlchemyError:
+                db.session.rollback()
+                abort(500, message="An error occurred while creating the orders.")
+
+            orders_created_total.inc(len(created_orders))
+            orders_total_amount_sum.inc(float(sum(order.total_amount for order, _ in created_orders)))
+            orders_items_total.inc(sum(len(order_data['items']) for _, order_data in accepted))
+
+        return {
+            "created": len(accepted),
+            "rejected": len(results) - len(accepted),
+            "results": results
+        }
+
+    @staticmethod
+    def _bulk_insert_orders(user_id, accepted: list[tuple[dict, dict]]) -> list[tuple[OrderModel, dict]]:
+        order_rows = [
+            {
+                "uuid": str(uuid.uuid4()),
+                "user_id": user_id,
+                "total_amount": _calculate_total_amount(order_data['items']),
+                "status": OrderStatus.PENDING,
+                "task_id": str(uuid.uuid4())
+            }
+            for _, order_data in accepted
+        ]
+
+        inserted = db.session.execute(
+            insert(OrderModel).returning(
+                OrderModel.id,
+                OrderModel.created_at,
+                sort_by_parameter_order=True
+            ),
+            order_rows
+        ).all()
+
+        item_rows = []
+        event_rows = []
+        outbox_rows = []
+        created_orders = []
+        for (result, order_data), order_row, (order_id, created_at) in zip(accepted, order_rows, inserted):
+            item_rows.extend(
+                {
+                    "order_id": order_id,
+                    "product_name": item['product_name'],
+                    "quantity": item['quantity'],
+                    "unit_price": item['unit_price']
+                }
+                for item in order_data['items']
+            )
+            event_rows.append({"order_id": order_id, "event_type": OrderEventType.ORDER_CREATED})
+            event_rows.append({"order_id": order_id, "event_type": OrderEventType.ORDER_ENQUEUED})
+            outbox_rows.append(outbox_row(
+                order_tasks.process_order_task,
+                order_id,
+                order_data.get('error'),
+                priority=order_tasks.order_task_priority(order_row['total_amount']),
+                task_id=order_row['task_id']
+            ))
+
+            # Transient instance, used only to serialize the result.
+            order = OrderModel(id=order_id, created_at=created_at, **order_row)
+            result['order'] = order
+            created_orders.append((order, order_data))
+
+        record_orders_created([
+            (user_id, order.created_at, order.total_amount) for order, _ in created_orders
+        ])
+        db.session.execute(insert(OrderItemModel), item_rows)
+        db.session.execute(insert(OrderEventModel), event_rows)
+        db.session.execute(insert(OutboxMessageModel), outbox_rows)
+        db.session.commit()
+
+        return created_orders
     
 @blp.route("/api/orders/<string:uuid>")
 class OrderStatusResource(MethodView):
     @jwt_required()
     @blp.response(200, OrderStatusResponseSchema, description="Get order status and details.")
     def get(self, uuid):
-        """Get order status and details"""
+        """
+        Get order status and details.
+        Responses are cached in Redis and invalidated whenever the order changes.
+        """
 
         user_id = get_jwt_identity()
 
+        payload, generation = get_cached_order_status(uuid, user_id)
+        if payload is not None:
+            return jsonify(payload)
+
+        # Items and events are loaded up front with one SELECT ... IN query each,
+        # archived events are joined in. Any other relationship access during serialization raises instead of
+        # silently adding queries to this heavily polled endpoint.
         order = (
             OrderModel.query
+            .options(
+                selectinload(OrderModel.items),
+                selectinload(OrderModel.recent_events),
+                joinedload(OrderModel.event_archive),
+                raiseload("*")
+            )
             .filter_by(uuid=uuid, user_id=user_id)
             .first()
         )
@@ -108,4 +486,150 @@ class OrderStatusResource(MethodView):
         if not order:
             abort(404, message="Order not found")
 
-        return order
\ No newline at end of file
+        payload = dump_order_status(order)
+        cache_order_status(uuid, user_id, payload, generation)
+
+        return jsonify(payload)
+
+@blp.route("/api/orders/<string:uuid>/cancel")
+class OrderCancelResource(MethodView):
+    @jwt_required()
+    @blp.response(200, description="Order cancelled.")
+    @blp.alt_response(404, description="Order not found.")
+    @blp.alt_response(409, description="Order can no longer be cancelled.")
+    def post(self, uuid):
+        """
+        Cancel a pending or processing order.
+        The status changes with one conditional UPDATE, so a worker can't complete the
+        order afterwards. A running task stops at its next cancellation check (before the
+        business logic and before a retry), a task that hasn't started yet is revoked.
+        """
+
+        user_id = get_jwt_identity()
+
+        try:
+            cancelled = cancel_order(uuid, user_id)
+            if cancelled is None:
+                db.session.rollback()
+                if not db.session.query(OrderModel.id).filter_by(uuid=uuid, user_id=user_id).first():
+                    abort(404, message="Order not found")
+                abort(409, message="Order can no longer be cancelled.")
+
+            order_id, task_id = cancelled
+            commit_order_event(order_id, uuid, OrderEventType.ORDER_CANCELLED)
+        except SQLAlchemyError:
+            db.session.rollback()
+            abort(500, message="An error occurred while cancelling the order.")
+
+        stop_order_processing(order_id, task_id)
+
+        return {"message": "Order cancelled."}
+
+def _format_sse(event: dict) -> str:
+    return f"id: {event['id']}\nevent: {event['event_type']}\ndata: {json.dumps(event)}\n\n"
+
+def _stream_order_events(pubsub, history: list[dict], finished: bool, last_event_id: int, timeout: float, heartbeat: float):
+    try:
+        for event in history:
+            last_event_id = event['id']
+            yield _format_sse(event)
+
+        if finished:
+            return
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                message = pubsub.get_message(timeout=heartbeat)
+            except RedisError as e:
+                # End the stream, the client reconnects with Last-Event-ID.
+                current_app.logger.error("Order event stream interrupted.", extra={"error": str(e)})
+                return
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            event = json.loads(message['data'])
+            # Already sent from history, published between subscribing and reading it.
+            if event['id'] <= last_event_id:
+                continue
+
+            last_event_id = event['id']
+            yield _format_sse(event)
+
+            if event['event_type'] in TERMINAL_EVENT_TYPES:
+                return
+    finally:
+        pubsub.close()
+
+@blp.route("/api/orders/<string:uuid>/events/stream")
+class OrderEventsStreamResource(MethodView):
+    @jwt_required()
+    @blp.response(200, description="Server-Sent Events stream of order events.", content_type="text/event-stream")
+    @blp.alt_response(400, description="Invalid Last-Event-ID.")
+    @blp.alt_response(404, description="Order not found.")
+    @blp.alt_response(503, description="Event stream unavailable.")
+    def get(self, uuid):
+        """
+        Stream order events as Server-Sent Events.
+        Sends the order's event history first and then every new event as it is published
+        by the worker. On reconnect, events up to `Last-Event-ID` (header, or `last_event_id`
+        query parameter) are skipped. The stream ends after a final event or after
+        ORDER_EVENTS_STREAM_TIMEOUT seconds, clients are expected to reconnect.
+        """
+
+        user_id = get_jwt_identity()
+
+        try:
+            last_event_id = int(request.headers.get("Last-Event-ID", request.args.get("last_event_id", 0)))
+        except ValueError:
+            abort(400, message="Invalid Last-Event-ID.")
+
+        order = OrderModel.query.filter_by(uuid=uuid, user_id=user_id).first()
+        if not order:
+            abort(404, message="Order not found")
+
+        slots = acquire_stream_slot()
+        if slots is None:
+            abort(503, message="Too many open event streams.", headers={"Retry-After": "5"})
+
+        try:
+            # Subscribe before reading the history, so no event can fall between the two.
+            try:
+                pubsub = subscribe_order_events(uuid)
+            except RedisError as e:
+                current_app.logger.error("Failed to subscribe to order events.", extra={"error": str(e)})
+                abort(503, message="Event stream unavailable.")
+
+            # The order may have finished before the subscription, read its status again.
+            db.session.refresh(order)
+
+            # Includes archived events, the ids of events are kept when they're archived.
+            history = [
+                serialize_order_event(event)
+                for event in sorted(order.events, key=lambda event: event.id)
+                if event.id > last_event_id
+            ]
+            finished = order.status in FINAL_ORDER_STATUSES
+
+            # Give the connection back to the pool, the stream itself only talks to Redis.
+            db.session.close()
+
+            response = Response(
+                stream_with_context(_stream_order_events(
+                    pubsub,
+                    history,
+                    finished,
+                    last_event_id,
+                    timeout=current_app.config['ORDER_EVENTS_STREAM_TIMEOUT'],
+                    heartbeat=current_app.config['ORDER_EVENTS_STREAM_HEARTBEAT']
+                )),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+        except BaseException:
+            slots.release()
+            raise
+
+        response.call_on_close(slots.release)
+        return response
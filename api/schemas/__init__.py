@@ -1,4 +1,17 @@
 from api.schemas.user import UserRegisterSchema, UserResponseSchema, UserLoginSchema
-from api.schemas.order import OrderCreateSchema, OrderResponseSchema, OrderStatusResponseSchema
+from api.schemas.order import (
+    OrderCreateSchema,
+    OrderResponseSchema,
+    OrderStatusResponseSchema,
+    OrderBatchCreateSchema,
+    OrderBatchResponseSchema,
+    OrderListQuerySchema,
+    OrderListResponseSchema,
+    OrderExportQuerySchema,
+    OrderStatsQuerySchema,
+    OrderStatsResponseSchema,
+    dump_order,
+    dump_order_status
+)
 from api.schemas.order_item import OrderItemSchema
-from api.schemas.order_event import OrderEventSchema
\ No newline at end of file
+from api.schemas.order_event import OrderEventSchema
@@ -0,0 +1,289 @@
+"""
+Dump and load functions generated from marshmallow schemas, for payloads handled on
+every request. The generated functions read and format the values the way
+`Schema().dump()` and `Schema().load()` do, without marshmallow's per-field dispatch,
+so the schema stays the single definition of the payload (and of its OpenAPI docs).
+
+Only what the hot schemas use is supported: String, Integer, Decimal (as_string, no
+places), DateTime (ISO format), Dict without key/value fields, Nested and List of
+Nested. Anything else raises TypeError when the schema is compiled, not when it's used.
+Dumped objects must have every attribute, missing ones raise AttributeError.
+"""
+import decimal
+import functools
+from typing import Any, Callable
+from marshmallow import Schema, fields, validate, RAISE, ValidationError
+from marshmallow.utils import missing
+
+def _text(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return str(value)
+
+def _decimal(value) -> str:
+    return format(decimal.Decimal(str(value)), "f")
+
+NAMESPACE = {"_text": _text, "_decimal": _decimal, "Decimal": decimal.Decimal}
+
+class _Compiler:
+    def __init__(self):
+        self.functions: dict[type, str] = {}
+        self.sources: list[str] = []
+
+    def schema(self, schema: Schema) -> str:
+        """
+        Generate the dump function of `schema` (and of its nested schemas), return its name.
+        """
+        cls = type(schema)
+        if cls in self.functions:
+            return self.functions[cls]
+        if any(schema._hooks.values()) or schema.many or schema.only is not None or schema.exclude:
+            raise TypeError(f"{cls.__name__}: hooks, many, only and exclude can't be compiled.")
+
+        name = f"dump_{cls.__name__}_{len(self.functions)}"
+        self.functions[cls] = name
+
+        lines = [f"def {name}(obj):"]
+        items = []
+        for index, (field_name, field) in enumerate(schema.dump_fields.items()):
+            attribute = field.attribute or field_name
+            if "." in attribute:
+                raise TypeError(f"{cls.__name__}.{field_name}: dotted attributes can't be compiled.")
+
+            lines.append(f"    v{index} = obj.{attribute}")
+            key = field.data_key if field.data_key is not None else field_name
+            items.append(f"        {key!r}: {self.value(field, f'v{index}', f'{cls.__name__}.{field_name}')},")
+
+        lines += ["    return {", *items, "    }"]
+        self.sources.append("\n".join(lines))
+        return name
+
+    def value(self, field: fields.Field, var: str, where: str) -> str:
+        """
+        Expression formatting `var` like `field` does. None stays None, like in marshmallow.
+        """
+        # Exact types first, subclasses change how values are formatted.
+        if type(field) is fields.String:
+            expression = f"{var} if {var}.__class__ is str else _text({var})"
+        elif type(field) is fields.Integer and not field.as_string:
+            expression = f"int({var})"
+        elif type(field) is fields.Decimal and field.as_string and field.places is None:
+            expression = f"format({var}, 'f') if {var}.__class__ is Decimal else _decimal({var})"
+        elif type(field) is fields.DateTime and field.format in (None, "iso", "iso8601"):
+            expression = f"{var}.isoformat()"
+        elif type(field) is fields.Dict and field.key_field is None and field.value_field is None:
+            expression = f"dict({var})"
+        elif type(field) is fields.Nested and not field.many and field.only is None and not field.exclude:
+            expression = f"{self.schema(field.schema)}({var})"
+        elif type(field) is fields.List and type(field.inner) is fields.Nested and not field.inner.many:
+            function = self.schema(field.inner.schema)
+            expression = f"[{function}(each) for each in {var}]"
+        else:
+            raise TypeError(f"{where}: {type(field).__name__} can't be compiled.")
+
+        return f"None if {var} is None else ({expression})"
+
+def compile_dump(schema_cls: type[Schema]) -> Callable[[Any], dict]:
+    """
+    Return a function dumping one object like `schema_cls().dump(obj)`.
+    """
+    compiler = _Compiler()
+    name = compiler.schema(schema_cls())
+
+    namespace = dict(NAMESPACE)
+    exec(compile("\n\n".join(compiler.sources), f"<compiled {schema_cls.__name__}>", "exec"), namespace)
+    return namespace[name]
+
+# Returned by compiled loaders for input they can't vouch for, marshmallow loads it instead.
+FALLBACK = object()
+
+DECIMAL_INPUT_TYPES = (str, int, float)
+
+def _load_decimal(value):
+    try:
+        num = decimal.Decimal(str(value))
+    except (decimal.InvalidOperation, ValueError):
+        return FALLBACK
+    return num if num.is_finite() else FALLBACK
+
+def _valid(validators, value) -> bool:
+    try:
+        return all(validator(value) is not False for validator in validators)
+    except ValidationError:
+        return False
+
+def _list_errors(validators, value) -> list:
+    messages = []
+    for validator in validators:
+        try:
+            validator(value)
+        except ValidationError as e:
+            messages += e.messages
+    return messages
+
+LOAD_NAMESPACE = {
+    "FALLBACK": FALLBACK,
+    "DECIMAL_INPUT_TYPES": DECIMAL_INPUT_TYPES,
+    "_load_decimal": _load_decimal,
+    "_valid": _valid,
+    "_list_errors": _list_errors,
+    "ValidationError": ValidationError,
+}
+
+class _LoadCompiler:
+    def __init__(self):
+        self.functions: dict[tuple[type, bool], str] = {}
+        self.sources: list[str] = []
+        self.constants: dict[str, Any] = {}
+
+    def constant(self, value) -> str:
+        name = f"C{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def schema(self, schema: Schema, top: bool = False) -> str:
+        """
+        Generate the load function of `schema` (and of its nested schemas), return its name.
+        Only the `top` one raises ValidationError, nested ones return FALLBACK instead.
+        """
+        cls = type(schema)
+        if (cls, top) in self.functions:
+            return self.functions[(cls, top)]
+        if (
+            any(schema._hooks.values()) or schema.many or schema.only is not None
+            or schema.exclude or schema.partial or schema.unknown != RAISE
+        ):
+            raise TypeError(f"{cls.__name__}: hooks, many, only, exclude, partial and unknown can't be compiled.")
+
+        name = f"load_{cls.__name__}_{len(self.functions)}"
+        self.functions[(cls, top)] = name
+
+        keys = frozenset(
+            field.data_key if field.data_key is not None else field_name
+            for field_name, field in schema.load_fields.items()
+        )
+        lines = [
+            f"def {name}(data):",
+            f"    if data.__class__ is not dict or not data.keys() <= {self.constant(keys)}:",
+            "        return FALLBACK",
+            "    result = {}",
+            "    errors = {}",
+        ]
+        for field_name, field in schema.load_fields.items():
+            where = f"{cls.__name__}.{field_name}"
+            key = field.data_key if field.data_key is not None else field_name
+            if field.load_default is not missing:
+                raise TypeError(f"{where}: load_default can't be compiled.")
+
+            lines.append(f"    if {key!r} in data:")
+            lines.append(f"        value = data[{key!r}]")
+            lines.append("        if value is None:")
+            if field.allow_none:
+                lines.append("            loaded = None")
+            else:
+                lines.append("            return FALLBACK")
+            lines.append("        else:")
+            lines += ["            " + line for line in self.value(field, key, where, top)]
+            lines.append(f"        result[{(field.attribute or field_name)!r}] = loaded")
+            if field.required:
+                lines += ["    else:", "        return FALLBACK"]
+
+        lines += ["    if errors:", "        raise ValidationError(errors)", "    return result"]
+        self.sources.append("\n".join(lines))
+        return name
+
+    def value(self, field: fields.Field, key: str, where: str, top: bool) -> list[str]:
+        """
+        Statements loading `value` into `loaded` like `field` does, or returning FALLBACK.
+        """
+        if type(field) is fields.String:
+            lines = ["if value.__class__ is not str:", "    return FALLBACK", "loaded = value"]
+        elif type(field) is fields.Integer:
+            lines = ["if value.__class__ is not int:", "    return FALLBACK", "loaded = value"]
+        elif type(field) is fields.Decimal and field.places is None and not field.allow_nan:
+            lines = [
+                "if value.__class__ not in DECIMAL_INPUT_TYPES:",
+                "    return FALLBACK",
+                "loaded = _load_decimal(value)",
+                "if loaded is FALLBACK:",
+                "    return FALLBACK",
+            ]
+        elif type(field) is fields.Nested and not field.many and field.only is None and not field.exclude:
+            if field.unknown is not None:
+                raise TypeError(f"{where}: unknown can't be compiled.")
+            lines = [f"loaded = {self.schema(field.schema)}(value)", "if loaded is FALLBACK:", "    return FALLBACK"]
+        elif type(field) is fields.List and type(field.inner) is fields.Nested and not field.inner.many:
+            if field.inner.unknown is not None:
+                raise TypeError(f"{where}: unknown can't be compiled.")
+            if not all(isinstance(validator, validate.Length) for validator in field.validators):
+                raise TypeError(f"{where}: only Length validators of lists can be compiled.")
+            # A list longer than the Length max is rejected before any element is loaded,
+            # with the messages of the Length validators, even when some elements are
+            # invalid too (marshmallow would report those instead). Otherwise marshmallow
+            # reports invalid elements rather than the length of the list, so the length is
+            # only checked once every element loaded. An invalid length is raised by the top
+            # schema, after all its other fields loaded: it's then the only error, as
+            # marshmallow would report it.
+            validators = self.constant(tuple(field.validators))
+            reject = f"    errors[{key!r}] = messages" if top else "    return FALLBACK"
+            load = [
+                "loaded = []",
+                "for each in value:",
+                f"    each = {self.schema(field.inner.schema)}(each)",
+                "    if each is FALLBACK:",
+                "        return FALLBACK",
+                "    loaded.append(each)",
+                f"messages = _list_errors({validators}, loaded)",
+                "if messages:",
+                reject,
+            ]
+            longest = min((v.max for v in field.validators if v.max is not None), default=None)
+            if longest is not None:
+                load = [
+                    f"if len(value) > {longest}:",
+                    f"    messages = _list_errors({validators}, value)",
+                    reject,
+                    "    loaded = None",
+                    "else:",
+                    *["    " + line for line in load],
+                ]
+            return ["if value.__class__ is not list:", "    return FALLBACK", *load]
+        else:
+            raise TypeError(f"{where}: {type(field).__name__} can't be compiled.")
+
+        if field.validators:
+            lines += [f"if not _valid({self.constant(tuple(field.validators))}, loaded):", "    return FALLBACK"]
+        return lines
+
+def compile_load(schema_cls: type[Schema]) -> Callable[[Any], Any]:
+    """
+    Return a function loading one payload like `schema_cls().load(data)`, or returning
+    FALLBACK for anything that isn't plainly valid (malformed payloads are rare, and
+    marshmallow then reports the errors exactly as usual). Lists failing their Length
+    validator raise ValidationError when that's the only error of the payload.
+    """
+    compiler = _LoadCompiler()
+    name = compiler.schema(schema_cls(), top=True)
+
+    namespace = {**LOAD_NAMESPACE, **compiler.constants}
+    exec(compile("\n\n".join(compiler.sources), f"<compiled {schema_cls.__name__}>", "exec"), namespace)
+    return namespace[name]
+
+@functools.cache
+def _compiled_load(schema_cls: type[Schema]) -> Callable[[Any], Any]:
+    return compile_load(schema_cls)
+
+class CompiledLoadSchema(Schema):
+    """
+    Schema whose load() of one payload goes through compile_load() first, compiled on
+    the first use. Errors keep marshmallow's format, including through flask-smorest.
+    """
+    def load(self, data, *, many=None, partial=None, unknown=None):
+        if (
+            not many and not self.many and not partial and not self.partial
+            and unknown in (None, RAISE) and self.only is None and not self.exclude
+        ):
+            loaded = _compiled_load(type(self))(data)
+            if loaded is not FALLBACK:
+                return loaded
+        return super().load(data, many=many, partial=partial, unknown=unknown)
@@ -1,15 +1,25 @@
-from marshmallow import Schema, fields
-from marshmallow.validate import Length
+from marshmallow import Schema, fields, validates_schema, ValidationError
+from marshmallow.validate import Length, OneOf, Range
+
+from api.models.order import OrderStatus
 
 from api.schemas.order_item import OrderItemSchema
 from api.schemas.order_event import OrderEventSchema
+from api.schemas.compiled import compile_dump, CompiledLoadSchema
+
+ORDERS_BATCH_MAX_SIZE = 500
+ORDER_MAX_ITEMS = 100
+# Items of all the orders of a batch, ORDERS_BATCH_MAX_CONTENT_LENGTH (config) must fit them
+ORDERS_BATCH_MAX_ITEMS = 10_000
+ORDERS_PAGE_MAX_SIZE = 100
 
-class OrderCreateSchema(Schema):
+class OrderCreateSchema(CompiledLoadSchema):
+    # Loaded by a function compiled from the schema, see api.schemas.compiled.
     error = fields.String(required=False, allow_none=True) # new field to simulate errors
     items = fields.List(
         fields.Nested(OrderItemSchema),
         required=True,
-        validate=Length(min=1)
+        validate=Length(min=1, max=ORDER_MAX_ITEMS)
     )
 
 class OrderResponseSchema(Schema):
@@ -20,4 +30,74 @@ class OrderResponseSchema(Schema):
 
 class OrderStatusResponseSchema(OrderResponseSchema):
     items = fields.List(fields.Nested(OrderItemSchema), dump_only=True)
-    events = fields.List(fields.Nested(OrderEventSchema), dump_only=True)
\ No newline at end of file
+    events = fields.List(fields.Nested(OrderEventSchema), dump_only=True)
+
+class OrderBatchCreateSchema(Schema):
+    # Orders are validated one by one in the resource so that a single
+    # malformed order is reported in its result instead of failing the batch.
+    orders = fields.List(
+        fields.Dict(),
+        required=True,
+        validate=Length(min=1, max=ORDERS_BATCH_MAX_SIZE)
+    )
+
+    @validates_schema
+    def validate_item_count(self, data, **kwargs):
+        items = sum(len(order['items']) for order in data.get('orders', ()) if isinstance(order.get('items'), list))
+        if items > ORDERS_BATCH_MAX_ITEMS:
+            raise ValidationError(f"A batch holds at most {ORDERS_BATCH_MAX_ITEMS} items in total.", "orders")
+
+class OrderBatchResultSchema(Schema):
+    index = fields.Integer(dump_only=True)
+    result = fields.String(dump_only=True, validate=OneOf(["created", "rejected"]))
+    order = fields.Nested(OrderResponseSchema, dump_only=True)
+    errors = fields.Dict(dump_only=True)
+
+class OrderBatchResponseSchema(Schema):
+    created = fields.Integer(dump_only=True)
+    rejected = fields.Integer(dump_only=True)
+    results = fields.List(fields.Nested(OrderBatchResultSchema), dump_only=True)
+
+class OrderListQuerySchema(Schema):
+    limit = fields.Integer(load_default=20, validate=Range(min=1, max=ORDERS_PAGE_MAX_SIZE))
+    cursor = fields.String(required=False)
+    status = fields.String(required=False, validate=OneOf([s.value for s in OrderStatus]))
+    created_from = fields.DateTime(required=False)
+    created_to = fields.DateTime(required=False)
+
+    @validates_schema
+    def validate_date_range(self, data, **kwargs):
+        if "created_from" in data and "created_to" in data and data['created_from'] > data['created_to']:
+            raise ValidationError("created_from must not be later than created_to.", "created_from")
+
+class OrderListResponseSchema(Schema):
+    orders = fields.List(fields.Nested(OrderResponseSchema), dump_only=True)
+    next_cursor = fields.String(dump_only=True, allow_none=True)
+
+class OrderExportQuerySchema(Schema):
+    format = fields.String(load_default="ndjson", validate=OneOf(["ndjson", "csv"]))
+
+class OrderStatsQuerySchema(Schema):
+    date_from = fields.Date(required=False)
+    date_to = fields.Date(required=False)
+
+    @validates_schema
+    def validate_date_range(self, data, **kwargs):
+        if "date_from" in data and "date_to" in data and data['date_from'] > data['date_to']:
+            raise ValidationError("date_from must not be later than date_to.", "date_from")
+
+class OrderStatsSchema(Schema):
+    order_count = fields.Integer(dump_only=True)
+    total_amount = fields.Decimal(as_string=True, dump_only=True)
+    by_status = fields.Dict(keys=fields.String(), values=fields.Integer(), dump_only=True)
+
+class OrderDailyStatsSchema(OrderStatsSchema):
+    day = fields.Date(dump_only=True)
+
+class OrderStatsResponseSchema(Schema):
+    totals = fields.Nested(OrderStatsSchema, dump_only=True)
+    days = fields.List(fields.Nested(OrderDailyStatsSchema), dump_only=True)
+
+# Same output as .dump() of the schemas, for the responses serialized on every request.
+dump_order = compile_dump(OrderResponseSchema)
+dump_order_status = compile_dump(OrderStatusResponseSchema)
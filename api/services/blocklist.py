@@ -1,7 +1,120 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from flask import current_app
+from redis.exceptions import RedisError
+
 from api.infra.redis import get_redis
+from api.metrics.auth import blocklist_cache_hits_total, blocklist_cache_misses_total
+
+BLOCKLIST_CHANNEL = "blocklist:revoked"
+
+class _LocalBlocklistCache:
+    """
+    Bounded per-process LRU of blocklist lookups.
+    Revoked tokens stay revoked, so positive entries only leave through LRU eviction.
+    Negative entries expire after `negative_ttl` seconds, which bounds how long a
+    revocation can go unnoticed if its pub/sub message is lost.
+    """
+
+    def __init__(self, maxsize: int, negative_ttl: float):
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, float | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, jti: str) -> bool | None:
+        with self._lock:
+            if jti not in self._entries:
+                return None
+
+            expires_at = self._entries[jti]
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[jti]
+                return None
+
+            self._entries.move_to_end(jti)
+            return expires_at is None
+
+    def set(self, jti: str, blocked: bool) -> None:
+        expires_at = None if blocked else time.monotonic() + self.negative_ttl
+        with self._lock:
+            self._entries[jti] = expires_at
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+_cache = _LocalBlocklistCache(maxsize=10000, negative_ttl=5.0)
+_subscribe = False
+_subscriber_pid = None
+_subscriber_lock = threading.Lock()
+
+def init_blocklist(app) -> None:
+    global _subscribe
+
+    _cache.maxsize = app.config['BLOCKLIST_CACHE_MAXSIZE']
+    _cache.negative_ttl = app.config['BLOCKLIST_CACHE_TTL']
+    _subscribe = app.config['BLOCKLIST_PUBSUB_ENABLED']
+
+def clear_blocklist_cache() -> None:
+    _cache.clear()
+
+def _listen_for_revocations(logger) -> None:
+    while True:
+        try:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(BLOCKLIST_CHANNEL)
+            for message in pubsub.listen():
+                _cache.set(message['data'].decode(), True)
+        except RedisError as e:
+            logger.warning("Blocklist subscription lost, reconnecting.", extra={"error": str(e)})
+            # Revocations published while disconnected were missed, forget negative results.
+            _cache.clear()
+            time.sleep(1)
+
+def _ensure_subscriber() -> None:
+    """
+    Start the revocation listener once per process. Checked lazily on lookups so that
+    forked workers (e.g. from a preloading WSGI server) start their own thread.
+    """
+    global _subscriber_pid
+
+    if not _subscribe or _subscriber_pid == os.getpid():
+        return
+
+    with _subscriber_lock:
+        if _subscriber_pid == os.getpid():
+            return
+        _subscriber_pid = os.getpid()
+        _cache.clear()
+        threading.Thread(
+            target=_listen_for_revocations,
+            args=(current_app.logger,),
+            name="blocklist-subscriber",
+            daemon=True
+        ).start()
 
 def add_jti_to_blocklist(jti: str, exp: int):
-    get_redis().setex(f"blocklist:{jti}", exp, "true")
+    pipe = get_redis().pipeline()
+    pipe.setex(f"blocklist:{jti}", exp, "true")
+    pipe.publish(BLOCKLIST_CHANNEL, jti)
+    pipe.execute()
+    _cache.set(jti, True)
 
 def is_jti_blocked(jti: str) -> bool:
-    return get_redis().exists(f"blocklist:{jti}") == 1
\ No newline at end of file
+    _ensure_subscriber()
+
+    blocked = _cache.get(jti)
+    if blocked is not None:
+        blocklist_cache_hits_total.inc()
+        return blocked
+
+    blocklist_cache_misses_total.inc()
+    blocked = get_redis().exists(f"blocklist:{jti}") == 1
+    _cache.set(jti, blocked)
+    return blocked
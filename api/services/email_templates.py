@@ -0,0 +1,58 @@
+import os
+import tempfile
+import functools
+import jinja2
+from typing import Any
+
+# Templates are resolved through the `api` package, independent of the working directory.
+# Compiled templates are kept in an on-disk bytecode cache shared by all workers, so a new
+# worker only has to load bytecode instead of parsing and compiling every template.
+
+# Set from the app config by init_email_templates().
+_cache_dir = os.path.join(tempfile.gettempdir(), "orderprocessing-jinja-cache")
+_auto_reload = False
+
+@functools.cache
+def get_template_env() -> jinja2.Environment:
+    os.makedirs(_cache_dir, exist_ok=True)
+    return jinja2.Environment(
+        loader=jinja2.PackageLoader("api", "templates"),
+        bytecode_cache=jinja2.FileSystemBytecodeCache(_cache_dir),
+        auto_reload=_auto_reload,
+        cache_size=-1,
+    )
+
+def precompile_email_templates() -> int:
+    """
+    Compile every email template into the bytecode cache and the in-memory template cache.
+    """
+    env = get_template_env()
+    names = env.list_templates(filter_func=lambda name: name.startswith("email/"))
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+def _render(template_filename: str, context: tuple) -> str:
+    return get_template_env().get_template(template_filename).render(**dict(context))
+
+_render_memoized = functools.lru_cache(maxsize=1024)(_render)
+
+def init_email_templates(app) -> None:
+    global _cache_dir, _auto_reload, _render_memoized
+
+    _cache_dir = app.config['EMAIL_TEMPLATE_CACHE_DIR']
+    _auto_reload = app.config['EMAIL_TEMPLATE_AUTO_RELOAD']
+    _render_memoized = functools.lru_cache(maxsize=app.config['EMAIL_TEMPLATE_RENDER_CACHE_SIZE'])(_render)
+    get_template_env.cache_clear()
+
+def render_template(template_filename: str, **context: Any) -> str:
+    """
+    Render a template, memoizing the output for identical (hashable) contexts.
+    """
+    if not _auto_reload:
+        try:
+            return _render_memoized(template_filename, tuple(sorted(context.items())))
+        except TypeError:
+            pass  # unhashable context values
+
+    return get_template_env().get_template(template_filename).render(**context)
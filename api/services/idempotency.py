@@ -0,0 +1,77 @@
+import json
+import time
+import hashlib
+from flask import current_app
+from redis.exceptions import RedisError
+
+from api.infra.redis import get_redis
+from api.exceptions import IdempotencyConflictError, IdempotencyKeyMismatchError
+
+# A key holds either an in-progress marker (the lock, short TTL) or the stored response
+# (IDEMPOTENCY_TTL). Both carry a fingerprint of the request body, so a key can't be
+# reused for a different request.
+
+def _key(user_id: str, idempotency_key: str) -> str:
+    return f"idempotency:{user_id}:{idempotency_key}"
+
+def request_fingerprint(data: dict) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+def begin_idempotent_request(user_id: str, idempotency_key: str, fingerprint: str) -> tuple[int, dict] | None:
+    """
+    Claim the key for a new request, or return the stored (status code, body) of a
+    completed one. Waits up to IDEMPOTENCY_WAIT seconds for a concurrent request with
+    the same key to finish, then raises IdempotencyConflictError.
+    """
+    key = _key(user_id, idempotency_key)
+    marker = json.dumps({"fingerprint": fingerprint})
+    deadline = time.monotonic() + current_app.config['IDEMPOTENCY_WAIT']
+
+    try:
+        while True:
+            if get_redis().set(key, marker, nx=True, ex=current_app.config['IDEMPOTENCY_LOCK_TTL']):
+                return None
+
+            stored = get_redis().get(key)
+            if stored is None:
+                continue  # expired or released in the meantime, try to claim it again
+
+            entry = json.loads(stored)
+            if entry['fingerprint'] != fingerprint:
+                raise IdempotencyKeyMismatchError("Idempotency-Key was already used for a different request.")
+            if "status_code" in entry:
+                return entry['status_code'], entry['body']
+
+            if time.monotonic() >= deadline:
+                raise IdempotencyConflictError("A request with this Idempotency-Key is still in progress.")
+            time.sleep(0.05)
+    except RedisError as e:
+        # Fail open: creating the order matters more than deduplicating a retry.
+        current_app.logger.error("Idempotency store unavailable.", extra={"error": str(e)})
+        return None
+
+def complete_idempotent_request(
+    user_id: str,
+    idempotency_key: str,
+    fingerprint: str,
+    status_code: int,
+    body: dict,
+) -> None:
+    entry = {"fingerprint": fingerprint, "status_code": status_code, "body": body}
+    try:
+        get_redis().set(
+            _key(user_id, idempotency_key),
+            json.dumps(entry),
+            ex=current_app.config['IDEMPOTENCY_TTL']
+        )
+    except RedisError as e:
+        current_app.logger.error("Failed to store idempotent response.", extra={"error": str(e)})
+
+def release_idempotent_request(user_id: str, idempotency_key: str) -> None:
+    """
+    Drop the in-progress marker of a failed request so that it can be retried.
+    """
+    try:
+        get_redis().delete(_key(user_id, idempotency_key))
+    except RedisError as e:
+        current_app.logger.error("Failed to release idempotency key.", extra={"error": str(e)})
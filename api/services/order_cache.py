@@ -0,0 +1,75 @@
+import json
+from flask import current_app
+from redis.exceptions import RedisError
+
+from api.infra.redis import get_redis
+from api.metrics.orders import (
+    order_status_cache_hits_total,
+    order_status_cache_misses_total,
+    order_status_cache_invalidations_total
+)
+
+# Every cached payload is stored together with the generation of its order.
+# Invalidation bumps the generation, so a reader that loaded the order from the
+# database before a concurrent status change can never overwrite the cache with
+# a stale payload that would be served as fresh.
+
+def _payload_key(uuid: str) -> str:
+    return f"order_status:{uuid}"
+
+def _generation_key(uuid: str) -> str:
+    return f"order_status_gen:{uuid}"
+
+def get_cached_order_status(uuid: str, user_id: int) -> tuple[dict | None, int]:
+    """
+    Return the cached status payload (or None) and the current generation of the order.
+    The generation has to be passed back to `cache_order_status` after a miss.
+    """
+    try:
+        cached, generation = get_redis().mget(_payload_key(uuid), _generation_key(uuid))
+    except RedisError as e:
+        current_app.logger.warning("Order status cache unavailable.", extra={"error": str(e)})
+        order_status_cache_misses_total.inc()
+        return None, 0
+
+    generation = int(generation or 0)
+
+    if cached is not None:
+        entry = json.loads(cached)
+        if entry['generation'] == generation and entry['user_id'] == int(user_id):
+            order_status_cache_hits_total.inc()
+            return entry['payload'], generation
+
+    order_status_cache_misses_total.inc()
+    return None, generation
+
+def cache_order_status(uuid: str, user_id: int, payload: dict, generation: int) -> None:
+    entry = {"user_id": int(user_id), "generation": generation, "payload": payload}
+    try:
+        get_redis().set(
+            _payload_key(uuid),
+            json.dumps(entry),
+            ex=current_app.config['ORDER_STATUS_CACHE_TTL']
+        )
+    except RedisError as e:
+        current_app.logger.warning("Order status cache unavailable.", extra={"error": str(e)})
+
+def invalidate_order_status(uuid: str) -> None:
+    """
+    Invalidate the cached status of an order. Call after the change is committed.
+    """
+    try:
+        pipe = get_redis().pipeline()
+        pipe.incr(_generation_key(uuid))
+        # Outlives any payload cached with the previous generation.
+        pipe.expire(_generation_key(uuid), current_app.config['ORDER_STATUS_CACHE_TTL'] * 2)
+        pipe.delete(_payload_key(uuid))
+        pipe.execute()
+    except RedisError as e:
+        current_app.logger.error(
+            "Failed to invalidate cached order status.",
+            extra={"error": str(e), "order_uuid": uuid}
+        )
+        return
+
+    order_status_cache_invalidations_total.inc()
@@ -0,0 +1,47 @@
+from flask import current_app
+from kombu.exceptions import OperationalError
+from redis.exceptions import RedisError
+
+from api.celery_app import celery
+from api.infra.redis import get_redis
+
+# The order status in the database is what decides: a cancelled order can't be
+# completed or failed by a worker. The Redis flag and the revoke only save the work
+# that would be thrown away, so both are best effort.
+
+def _key(order_id: int) -> str:
+    return f"order_cancelled:{order_id}"
+
+def stop_order_processing(order_id: int, task_id: str | None) -> None:
+    """
+    Flag the order as cancelled for a running task and revoke its task, which drops the
+    message on workers that haven't started it, including retries waiting for a countdown.
+    """
+    try:
+        get_redis().set(_key(order_id), 1, ex=current_app.config['ORDER_CANCELLATION_FLAG_TTL'])
+    except RedisError as e:
+        current_app.logger.error(
+            "Failed to flag cancelled order.",
+            extra={"error": str(e), "order_id": order_id}
+        )
+
+    if task_id is None:
+        return
+
+    try:
+        celery.control.revoke(task_id)
+    except OperationalError as e:
+        current_app.logger.error(
+            "Failed to revoke order task.",
+            extra={"error": str(e), "order_id": order_id, "task_id": task_id}
+        )
+
+def is_order_cancelled(order_id: int) -> bool:
+    try:
+        return get_redis().exists(_key(order_id)) == 1
+    except RedisError as e:
+        current_app.logger.error(
+            "Failed to check order cancellation.",
+            extra={"error": str(e), "order_id": order_id}
+        )
+        return False
@@ -0,0 +1,119 @@
+import re
+from datetime import date, datetime, timezone
+from sqlalchemy import text
+
+from api.extensions import db
+
+# order_events is range partitioned by month on created_at (Postgres only, see the
+# a9e4c7d2f135 migration), with one order_events_YYYY_MM table per month. New months
+# are created ahead of time, and months past the retention are folded into
+# order_event_archive and dropped whole: old events never go through DELETE and
+# VACUUM, and the indexes of the live partitions stay small.
+
+PARTITION_NAME = re.compile(r"^order_events_(\d{4})_(\d{2})$")
+
+def current_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"order_events_{month:%Y_%m}"
+
+def partition_month(name: str) -> date | None:
+    match = PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match[1]), int(match[2]), 1)
+
+def list_partitions() -> list[date]:
+    """
+    Months that have a partition, oldest first. The default partition isn't listed.
+    """
+    names = db.session.scalars(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'order_events'"
+    )).all()
+    return sorted(month for month in map(partition_month, names) if month is not None)
+
+def _stranded_months() -> set[date]:
+    # Events written while their month had no partition yet.
+    return set(db.session.scalars(text(
+        "SELECT DISTINCT date_trunc('month', created_at)::date FROM order_events_default"
+    )).all())
+
+def create_partitions(months_ahead: int) -> list[str]:
+    """
+    Create the partitions of the current month and the `months_ahead` next ones that
+    don't exist yet, plus those of months whose events landed in the default partition.
+    Postgres refuses a partition for rows sitting in the default one, so the default
+    partition is detached while they're moved over, all in one transaction. Returns the
+    names of the created partitions.
+    """
+    current = current_month()
+    stranded = _stranded_months()
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)} | stranded
+    months = sorted(months - set(list_partitions()))
+
+    if stranded:
+        db.session.execute(text("ALTER TABLE order_events DETACH PARTITION order_events_default"))
+
+    created = []
+    for month in months:
+        name = partition_name(month)
+        bounds = f"created_at >= '{month}' AND created_at < '{add_months(month, 1)}'"
+        db.session.execute(text(
+            f"CREATE TABLE {name} PARTITION OF order_events "
+            f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+        ))
+        if month in stranded:
+            db.session.execute(text(
+                f"INSERT INTO {name} (id, order_id, event_type, payload, created_at) "
+                f"SELECT id, order_id, event_type, payload, created_at FROM order_events_default WHERE {bounds}"
+            ))
+            db.session.execute(text(f"DELETE FROM order_events_default WHERE {bounds}"))
+        created.append(name)
+
+    if stranded:
+        db.session.execute(text("ALTER TABLE order_events ATTACH PARTITION order_events_default DEFAULT"))
+
+    db.session.commit()
+    return created
+
+def archive_partition(month: date) -> int:
+    """
+    Move the events of one month into order_event_archive and drop its partition, in
+    one transaction: readers see the events either in the partition or in the archive.
+    Events are appended to the archived ones of the same order. Returns the number of
+    orders whose events were archived.
+    """
+    name = partition_name(month)
+    archived = db.session.execute(text(
+        "INSERT INTO order_event_archive (order_id, events) "
+        "SELECT order_id, json_agg(json_build_object("
+        "'id', id, 'event_type', event_type, 'payload', payload, 'created_at', created_at"
+        f") ORDER BY created_at, id) FROM {name} GROUP BY order_id "
+        "ON CONFLICT (order_id) DO UPDATE SET "
+        "events = (order_event_archive.events::jsonb || excluded.events::jsonb)::json, "
+        "archived_at = now()"
+    )).rowcount
+    db.session.execute(text(f"DROP TABLE {name}"))
+
+    db.session.commit()
+    return archived
+
+def archive_partitions(retention_months: int) -> list[tuple[str, int]]:
+    """
+    Archive, oldest first, every partition older than the current month and the
+    `retention_months` before it. Returns (partition name, orders archived) pairs.
+    """
+    cutoff = add_months(current_month(), -retention_months)
+    return [
+        (partition_name(month), archive_partition(month))
+        for month in list_partitions()
+        if month < cutoff
+    ]
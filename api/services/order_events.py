@@ -0,0 +1,56 @@
+import json
+import threading
+from flask import current_app
+from redis.client import PubSub
+from redis.exceptions import RedisError
+
+from api.infra.redis import get_redis
+from api.models import OrderEventModel, OrderEventType
+from api.schemas import OrderEventSchema
+
+# Events after which nothing else happens to an order, streams end on them.
+TERMINAL_EVENT_TYPES = {
+    OrderEventType.ORDER_COMPLETED.value,
+    OrderEventType.PROCESSING_FAILED.value,
+    OrderEventType.ORDER_CANCELLED.value,
+}
+
+# An open stream holds a server thread until it ends, so each process serves at most
+# ORDER_EVENTS_MAX_STREAMS of them and keeps its other threads for regular requests.
+_stream_slots = threading.BoundedSemaphore(2)
+
+def init_order_events(app) -> None:
+    global _stream_slots
+
+    _stream_slots = threading.BoundedSemaphore(app.config['ORDER_EVENTS_MAX_STREAMS'])
+
+def acquire_stream_slot() -> threading.BoundedSemaphore | None:
+    """
+    Take a stream slot of this process, return the semaphore to release it on, or None
+    when every slot is taken.
+    """
+    slots = _stream_slots
+    return slots if slots.acquire(blocking=False) else None
+
+def _channel(uuid: str) -> str:
+    return f"order_events:{uuid}"
+
+def serialize_order_event(event: OrderEventModel) -> dict:
+    return {"id": event.id, **OrderEventSchema().dump(event)}
+
+def publish_order_event(uuid: str, event: OrderEventModel) -> None:
+    """
+    Publish a committed order event to its live stream subscribers.
+    """
+    try:
+        get_redis().publish(_channel(uuid), json.dumps(serialize_order_event(event)))
+    except RedisError as e:
+        current_app.logger.error(
+            "Failed to publish order event.",
+            extra={"error": str(e), "order_uuid": uuid, "event_id": event.id}
+        )
+
+def subscribe_order_events(uuid: str) -> PubSub:
+    pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(_channel(uuid))
+    return pubsub
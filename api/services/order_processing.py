@@ -0,0 +1,132 @@
+import os
+import asyncio
+import threading
+from typing import Protocol
+from flask import current_app
+
+from api.exceptions import BusinessLogicError, TemporaryInfrastructureError
+
+class Downstream(Protocol):
+    """
+    Downstream services called while processing an order. Implementations are async
+    and signal failures with BusinessLogicError or TemporaryInfrastructureError.
+    """
+
+    async def reserve_inventory(self, order_id: int, error: str | None) -> None: ...
+    async def charge_payment(self, order_id: int, error: str | None) -> None: ...
+    async def create_shipment(self, order_id: int, error: str | None) -> None: ...
+
+class SimulatedDownstream:
+    """
+    Stand-in for the real payment, inventory and shipping services.
+    Spends `latency` seconds in total across the three calls and fails on demand:
+    1. error="business": BusinessLogicError (e.g. payment declined).
+    2. error="infrastructure": TemporaryInfrastructureError (e.g. network issue).
+    """
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def reserve_inventory(self, order_id: int, error: str | None) -> None:
+        await asyncio.sleep(self.latency / 3)
+        if error == "infrastructure":
+            raise TemporaryInfrastructureError("Simulated temporary infrastructure error.")
+
+    async def charge_payment(self, order_id: int, error: str | None) -> None:
+        await asyncio.sleep(self.latency / 3)
+        if error == "business":
+            raise BusinessLogicError("Simulated business logic error.")
+
+    async def create_shipment(self, order_id: int, error: str | None) -> None:
+        await asyncio.sleep(self.latency / 3)
+
+class OrderProcessingEngine:
+    """
+    Runs order business logic as coroutines, at most `concurrency` orders at a time.
+
+    `process_many` processes a set of orders concurrently on the caller's event loop, for
+    a consumer of its own. `run` and `run_many` are the blocking entry points for Celery
+    worker threads: all threads of the process share one event loop running in a
+    background thread. `run` waits for a single order, so with it the orders in flight
+    per process are capped by the worker's thread count as well as by `concurrency`.
+    `run_many` waits for a whole batch, so one thread (or prefork process) keeps up to
+    `concurrency` orders in flight.
+    """
+
+    def __init__(self, downstream: Downstream, concurrency: int):
+        self.downstream = downstream
+        self.concurrency = concurrency
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._lock = threading.Lock()
+
+    async def _process(self, order_id: int, error: str | None, semaphore: asyncio.Semaphore) -> None:
+        async with semaphore:
+            await self.downstream.reserve_inventory(order_id, error)
+            await self.downstream.charge_payment(order_id, error)
+            await self.downstream.create_shipment(order_id, error)
+
+    async def _process_all(
+        self,
+        orders: list[tuple[int, str | None]],
+        semaphore: asyncio.Semaphore
+    ) -> list[BaseException | None]:
+        return await asyncio.gather(
+            *(self._process(order_id, error, semaphore) for order_id, error in orders),
+            return_exceptions=True
+        )
+
+    async def process_many(self, orders: list[tuple[int, str | None]]) -> list[BaseException | None]:
+        """
+        Process (order_id, error) pairs concurrently, returns the exception raised
+        for each order or None if it succeeded.
+        """
+        return await self._process_all(orders, asyncio.Semaphore(self.concurrency))
+
+    def run(self, order_id: int, error: str | None) -> None:
+        loop = self._ensure_loop()
+        asyncio.run_coroutine_threadsafe(
+            self._process(order_id, error, self._semaphore),
+            loop
+        ).result()
+
+    def run_many(self, orders: list[tuple[int, str | None]]) -> list[BaseException | None]:
+        """
+        Blocking `process_many` on the shared event loop, counted against the same
+        `concurrency` limit as the orders of `run`.
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(
+            self._process_all(orders, self._semaphore),
+            loop
+        ).result()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._semaphore = asyncio.Semaphore(self.concurrency)
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="order-processing-loop",
+                    daemon=True
+                ).start()
+            return self._loop
+
+_engine: OrderProcessingEngine | None = None
+_engine_pid = None
+
+def get_processing_engine() -> OrderProcessingEngine:
+    """
+    Process-wide engine configured from the app config, recreated after a fork.
+    """
+    global _engine, _engine_pid
+
+    if _engine is None or _engine_pid != os.getpid():
+        _engine = OrderProcessingEngine(
+            SimulatedDownstream(current_app.config['ORDER_PROCESSING_SIMULATED_LATENCY']),
+            concurrency=current_app.config['ORDER_PROCESSING_CONCURRENCY']
+        )
+        _engine_pid = os.getpid()
+
+    return _engine
@@ -0,0 +1,160 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from sqlalchemy import select, delete
+from sqlalchemy.dialects import postgresql, sqlite
+
+from api.extensions import db
+from api.models import OrderModel, OrderDailyStatsModel, OrderStatus, UserModel
+
+# Rollups are keyed by the day the order was created (UTC), so a status change moves
+# the order between status rows of that same day. Changes are written as upserts that
+# add deltas, in the transaction of the order write itself.
+
+StatsKey = tuple[int, date, OrderStatus]
+
+def _day(created_at: datetime) -> date:
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+def _apply(deltas: dict[StatsKey, list]) -> None:
+    if not deltas:
+        return
+
+    dialect = postgresql if db.session.get_bind().dialect.name == "postgresql" else sqlite
+    table = OrderDailyStatsModel.__table__
+    # Same row order in every transaction, so concurrent upserts can't deadlock.
+    keys = sorted(deltas, key=lambda key: (key[0], key[1], key[2].value))
+    stmt = dialect.insert(table).values([
+        {
+            "user_id": user_id,
+            "day": day,
+            "status": status,
+            "order_count": deltas[(user_id, day, status)][0],
+            "total_amount": deltas[(user_id, day, status)][1]
+        }
+        for user_id, day, status in keys
+    ])
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.day, table.c.status],
+        set_={
+            "order_count": table.c.order_count + stmt.excluded.order_count,
+            "total_amount": table.c.total_amount + stmt.excluded.total_amount,
+        }
+    ))
+
+def _add(deltas: dict[StatsKey, list], key: StatsKey, count: int, amount: Decimal) -> None:
+    entry = deltas[key]
+    entry[0] += count
+    entry[1] += amount
+
+def record_orders_created(orders: list[tuple[int, datetime, Decimal]]) -> None:
+    """
+    Count new PENDING orders, given as (user_id, created_at, total_amount).
+    """
+    deltas = defaultdict(lambda: [0, Decimal(0)])
+    for user_id, created_at, total_amount in orders:
+        _add(deltas, (user_id, _day(created_at), OrderStatus.PENDING), 1, total_amount)
+    _apply(deltas)
+
+def record_status_change(
+    user_id: int,
+    created_at: datetime,
+    total_amount: Decimal,
+    old: OrderStatus,
+    new: OrderStatus,
+) -> None:
+    day = _day(created_at)
+    deltas = defaultdict(lambda: [0, Decimal(0)])
+    _add(deltas, (user_id, day, old), -1, -total_amount)
+    _add(deltas, (user_id, day, new), 1, total_amount)
+    _apply(deltas)
+
+def get_order_stats(user_id, date_from: date | None = None, date_to: date | None = None) -> dict:
+    """
+    Per-day and overall order counts, amounts and status breakdown of one user,
+    read from the rollup table only.
+    """
+    query = select(OrderDailyStatsModel).where(OrderDailyStatsModel.user_id == user_id)
+    if date_from is not None:
+        query = query.where(OrderDailyStatsModel.day >= date_from)
+    if date_to is not None:
+        query = query.where(OrderDailyStatsModel.day <= date_to)
+
+    def empty() -> dict:
+        return {"order_count": 0, "total_amount": Decimal("0.00"), "by_status": {}}
+
+    days = defaultdict(empty)
+    totals = empty()
+    for row in db.session.scalars(query.order_by(OrderDailyStatsModel.day)):
+        if row.order_count == 0:
+            continue
+        for bucket in (days[row.day], totals):
+            bucket['order_count'] += row.order_count
+            bucket['total_amount'] += row.total_amount
+            bucket['by_status'][row.status.value] = bucket['by_status'].get(row.status.value, 0) + row.order_count
+
+    return {
+        "totals": totals,
+        "days": [{"day": day, **stats} for day, stats in days.items()],
+    }
+
+def rebuild_order_stats(batch_size: int) -> int:
+    """
+    Recompute the rollups from the orders table, one user per short transaction, so
+    order writes only ever wait on the user being rebuilt. Orders are read in keyset
+    batches of `batch_size` so memory stays flat. Returns the number of orders counted.
+    """
+    counted = 0
+    last_user_id = 0
+    while True:
+        # Locked until the user's rollups are rebuilt: creating an order checks its
+        # foreign key with a KEY SHARE lock on the user row, so new orders wait.
+        user_id = db.session.scalar(
+            select(UserModel.id)
+            .where(UserModel.id > last_user_id)
+            .order_by(UserModel.id)
+            .limit(1)
+            .with_for_update()
+        )
+        if user_id is None:
+            break
+
+        counted += _rebuild_user_stats(user_id, batch_size)
+        db.session.commit()
+        last_user_id = user_id
+
+    db.session.commit()
+    return counted
+
+def _rebuild_user_stats(user_id: int, batch_size: int) -> int:
+    # Locking the orders waits for status changes in flight and holds back new ones, so
+    # no rollup write of the user lands between reading the orders and replacing the rows.
+    deltas = defaultdict(lambda: [0, Decimal(0)])
+    counted = 0
+    last_id = 0
+    while True:
+        batch = db.session.execute(
+            select(
+                OrderModel.id,
+                OrderModel.created_at,
+                OrderModel.status,
+                OrderModel.total_amount
+            )
+            .where(OrderModel.user_id == user_id, OrderModel.id > last_id)
+            .order_by(OrderModel.id)
+            .limit(batch_size)
+            .with_for_update()
+        ).all()
+        if not batch:
+            break
+
+        for row in batch:
+            _add(deltas, (user_id, _day(row.created_at), row.status), 1, row.total_amount)
+        counted += len(batch)
+        last_id = batch[-1].id
+
+    db.session.execute(delete(OrderDailyStatsModel).where(OrderDailyStatsModel.user_id == user_id))
+    _apply(deltas)
+    return counted
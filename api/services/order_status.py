@@ -0,0 +1,96 @@
+from sqlalchemy import update
+
+from api.extensions import db
+from api.exceptions import InvalidOrderTransitionError
+from api.models import OrderModel, OrderEventModel, OrderEventType, OrderStatus, ORDER_STATUS_TRANSITIONS
+from api.services.order_cache import invalidate_order_status
+from api.services.order_events import publish_order_event
+from api.services.order_stats import record_status_change
+
+# In table order, so PENDING is tried before PROCESSING
+CANCELLABLE_STATUSES = tuple(
+    status for status, allowed in ORDER_STATUS_TRANSITIONS.items() if OrderStatus.CANCELLED in allowed
+)
+
+def can_transition(current: OrderStatus, new: OrderStatus) -> bool:
+    return new in ORDER_STATUS_TRANSITIONS[current]
+
+def transition_order_status(
+    order_id: int,
+    expected: OrderStatus,
+    new: OrderStatus,
+    values: dict | None = None,
+) -> str | None:
+    """
+    Move the order from `expected` to `new` status with a single conditional
+    UPDATE ... WHERE status = :expected, in the current transaction. `values` are
+    other columns written by the same UPDATE.
+    Returns the order's uuid, or None when the order isn't in `expected` status
+    (e.g. a duplicate task delivery already moved it on). Raises
+    InvalidOrderTransitionError for changes the transition table doesn't allow.
+    """
+    if not can_transition(expected, new):
+        raise InvalidOrderTransitionError(f"Order can't go from {expected.value} to {new.value}.")
+
+    row = _conditional_update((OrderModel.id == order_id,), expected, new, values)
+    return None if row is None else row.uuid
+
+def cancel_order(uuid: str, user_id) -> tuple[int, str | None] | None:
+    """
+    Cancel the user's order if its status still allows it, with a conditional UPDATE
+    per cancellable status (at most two) in the current transaction.
+    Returns (order id, task id), or None when there is no such order or it can no
+    longer be cancelled.
+    """
+    for expected in CANCELLABLE_STATUSES:
+        row = _conditional_update(
+            (OrderModel.uuid == uuid, OrderModel.user_id == user_id),
+            expected,
+            OrderStatus.CANCELLED
+        )
+        if row is not None:
+            return row.id, row.task_id
+    return None
+
+def _conditional_update(criteria: tuple, expected: OrderStatus, new: OrderStatus, values: dict | None = None):
+    row = db.session.execute(
+        update(OrderModel)
+        .where(*criteria, OrderModel.status == expected)
+        .values(status=new, updated_at=db.func.now(), **(values or {}))
+        .returning(
+            OrderModel.id,
+            OrderModel.uuid,
+            OrderModel.user_id,
+            OrderModel.task_id,
+            OrderModel.total_amount,
+            OrderModel.created_at
+        )
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+
+    if row is not None:
+        record_status_change(row.user_id, row.created_at, row.total_amount, expected, new)
+    return row
+
+def commit_order_event(
+    order_id: int,
+    order_uuid: str,
+    event_type: OrderEventType,
+    payload: dict | None = None,
+) -> OrderEventModel:
+    """
+    Commit a new order event along with the status change of the current transaction,
+    then drop the cached status and notify live event streams.
+    """
+    event = OrderEventModel(
+        order_id=order_id,
+        event_type=event_type,
+        payload=payload,
+    )
+    db.session.add(event)
+    db.session.commit()
+
+    invalidate_order_status(order_uuid)
+    publish_order_event(order_uuid, event)
+
+    return event
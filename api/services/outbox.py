@@ -0,0 +1,83 @@
+import time
+from datetime import datetime, timezone
+from celery import Task
+
+from api.extensions import db
+from api.celery_app import celery
+from api.models import OutboxMessageModel
+from api.metrics.outbox import (
+    outbox_lag_seconds,
+    outbox_messages_relayed_total,
+    outbox_relay_batch_duration_seconds
+)
+
+def enqueue_task(task: Task, *args, priority: int | None = None, task_id: str | None = None) -> None:
+    """
+    Stage a Celery task in the current transaction.
+    It is published by the outbox relay once the transaction is committed, with
+    `task_id` as its id when given (so it can be revoked before it is published).
+    """
+    db.session.add(OutboxMessageModel(task_name=task.name, args=list(args), priority=priority, task_id=task_id))
+
+def outbox_row(task: Task, *args, priority: int | None = None, task_id: str | None = None) -> dict:
+    """
+    Outbox row for bulk inserts, see `enqueue_task`.
+    """
+    return {"task_name": task.name, "args": list(args), "priority": priority, "task_id": task_id}
+
+def relay_outbox_batch(batch_size: int) -> int:
+    """
+    Publish up to `batch_size` outbox messages over one broker connection and delete them.
+    Delivery is at-least-once: a crash between publishing and committing republishes the batch.
+    """
+    start = time.perf_counter()
+
+    # SKIP LOCKED lets several relays drain the outbox without publishing the same rows.
+    messages = (
+        OutboxMessageModel.query
+        .order_by(OutboxMessageModel.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    if messages:
+        with celery.producer_or_acquire() as producer:
+            for message in messages:
+                celery.send_task(
+                    message.task_name,
+                    args=message.args,
+                    priority=message.priority,
+                    task_id=message.task_id,
+                    producer=producer
+                )
+
+        (
+            OutboxMessageModel.query
+            .filter(OutboxMessageModel.id.in_([message.id for message in messages]))
+            .delete(synchronize_session=False)
+        )
+    db.session.commit()
+
+    outbox_messages_relayed_total.inc(len(messages))
+    outbox_relay_batch_duration_seconds.observe(time.perf_counter() - start)
+    _update_lag()
+
+    return len(messages)
+
+def _update_lag() -> None:
+    oldest = (
+        db.session.query(OutboxMessageModel.created_at)
+        .order_by(OutboxMessageModel.id)
+        .limit(1)
+        .scalar()
+    )
+    db.session.commit()
+
+    if oldest is None:
+        outbox_lag_seconds.set(0)
+        return
+
+    if oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    outbox_lag_seconds.set(max((datetime.now(timezone.utc) - oldest).total_seconds(), 0))
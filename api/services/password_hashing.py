@@ -0,0 +1,103 @@
+import os
+import time
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from passlib.hash import pbkdf2_sha256 as sha256
+
+from api.exceptions import PasswordHashingSaturatedError
+from api.metrics.auth import (
+    password_hash_queue_wait_seconds,
+    password_hash_duration_seconds,
+    password_hash_rejected_total
+)
+
+# pbkdf2 costs hundreds of milliseconds of CPU and holds the GIL, so it runs in a
+# dedicated process pool. At most PASSWORD_HASH_MAX_QUEUE jobs (queued or running)
+# are accepted, beyond that callers get PasswordHashingSaturatedError right away
+# instead of piling up behind a login storm. A pool broken by a dead worker (e.g. OOM
+# killed) is replaced and the job retried once. Workers are started from a forkserver:
+# the pool is created inside threaded gunicorn and Celery workers, and a plain fork
+# could copy a lock held by another thread into a child that then hangs on it.
+
+def _hash(password: str, rounds: int) -> tuple[str, float, float]:
+    started = time.time()
+    hashed = sha256.using(rounds=rounds).hash(password)
+    return hashed, started, time.time() - started
+
+def _verify(password: str, hashed: str) -> tuple[bool, float, float]:
+    started = time.time()
+    valid = sha256.verify(password, hashed)
+    return valid, started, time.time() - started
+
+class _InlineExecutor(Executor):
+    """
+    Runs jobs in the calling thread (PASSWORD_HASH_WORKERS=0, e.g. in tests).
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+_executor: Executor | None = None
+_executor_pid = None
+_slots: threading.BoundedSemaphore | None = None
+_lock = threading.Lock()
+
+def _get_executor() -> tuple[Executor, threading.BoundedSemaphore]:
+    global _executor, _executor_pid, _slots
+
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            if _slots is None or _executor_pid != os.getpid():
+                _slots = threading.BoundedSemaphore(current_app.config['PASSWORD_HASH_MAX_QUEUE'])
+            workers = current_app.config['PASSWORD_HASH_WORKERS']
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("forkserver")
+            ) if workers else _InlineExecutor()
+            _executor_pid = os.getpid()
+        return _executor, _slots
+
+def _reset_executor(broken: Executor) -> None:
+    global _executor
+
+    with _lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False)
+
+def _run(operation: str, fn, *args):
+    executor, slots = _get_executor()
+
+    if not slots.acquire(blocking=False):
+        password_hash_rejected_total.labels(operation=operation).inc()
+        raise PasswordHashingSaturatedError("Password hashing pool is saturated.")
+
+    try:
+        submitted = time.time()
+        try:
+            result, started, duration = executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            current_app.logger.warning("Password hashing pool broken, restarting it.", extra={"operation": operation})
+            _reset_executor(executor)
+            executor, _ = _get_executor()
+            result, started, duration = executor.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+    password_hash_queue_wait_seconds.labels(operation=operation).observe(max(started - submitted, 0))
+    password_hash_duration_seconds.labels(operation=operation).observe(duration)
+    return result
+
+def hash_password(password: str) -> str:
+    return _run("hash", _hash, password, current_app.config['PASSWORD_HASH_ROUNDS'])
+
+def verify_password(password: str, hashed: str) -> bool:
+    return _run("verify", _verify, password, hashed)
+
+def needs_rehash(hashed: str) -> bool:
+    return sha256.from_string(hashed).rounds != current_app.config['PASSWORD_HASH_ROUNDS']
@@ -0,0 +1,111 @@
+import math
+from functools import wraps
+from flask import current_app, request
+from flask_jwt_extended import get_jwt_identity
+from flask_smorest import abort
+from redis.exceptions import RedisError
+
+from api.infra.redis import get_redis
+from api.exceptions import RateLimitExceededError
+from api.metrics.rate_limit import rate_limit_allowed_total, rate_limit_rejected_total
+
+# Token buckets of one request: the client's own bucket and the scope-wide (global) one.
+# A token is taken from every bucket only when all of them have one, so a rejected
+# request doesn't drain the client's budget. Time comes from Redis, so web workers with
+# drifting clocks share the same view of the buckets.
+# ARGV: capacity and refill rate (tokens per millisecond) of each bucket, in KEYS order.
+# Returns {allowed, retry after in milliseconds, 1-based index of the exhausted bucket}.
+TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local tokens = {}
+local retry_after = 0
+local exhausted = 0
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    available = math.min(capacity, available + math.max(0, now - ts) * rate)
+    if available < 1 then
+        local wait = math.ceil((1 - available) / rate)
+        if wait > retry_after then
+            retry_after = wait
+            exhausted = i
+        end
+    end
+    tokens[i] = available
+end
+
+if exhausted > 0 then
+    return {0, retry_after, exhausted}
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', tokens[i] - 1, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate) + 1000)
+end
+return {1, 0, 0}
+"""
+
+BUCKETS = ("client", "global")
+
+_script = None
+
+def _token_bucket():
+    global _script
+    if _script is None:
+        _script = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+    return _script
+
+def consume_token(scope: str, client_key: str) -> None:
+    """
+    Take one token from the client's and the scope-wide bucket in a single Lua call.
+    Raises RateLimitExceededError with the seconds to wait when either bucket is empty.
+    """
+    limits = current_app.config['RATE_LIMITS'][scope]
+    keys = [f"rate_limit:{scope}:{client_key}", f"rate_limit:{scope}:global"]
+    args = [
+        limits['capacity'], limits['rate'] / 1000,
+        limits['global_capacity'], limits['global_rate'] / 1000,
+    ]
+
+    allowed, retry_after_ms, exhausted = _token_bucket()(keys=keys, args=args, client=get_redis())
+    if not allowed:
+        rate_limit_rejected_total.labels(scope=scope, bucket=BUCKETS[exhausted - 1]).inc()
+        raise RateLimitExceededError(max(1, math.ceil(retry_after_ms / 1000)))
+
+    rate_limit_allowed_total.labels(scope=scope).inc()
+
+def _client_key(key: str) -> str:
+    if key == "identity":
+        return f"user:{get_jwt_identity()}"
+    return f"ip:{request.remote_addr}"
+
+def rate_limit(scope: str, key: str = "identity"):
+    """
+    Reject the request with 429 before the view runs when the client is over the limit
+    of `scope` (a key of RATE_LIMITS). `key` is "identity" for JWT protected views
+    (place it under @jwt_required()) or "ip" for anonymous ones.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if current_app.config['RATE_LIMIT_ENABLED']:
+                try:
+                    consume_token(scope, _client_key(key))
+                except RateLimitExceededError as e:
+                    abort(429, message="Too many requests.", headers={"Retry-After": str(e.args[0])})
+                except RedisError as e:
+                    # Fail open: an unavailable limiter shouldn't take the API down with it.
+                    current_app.logger.error(
+                        "Rate limiter unavailable.",
+                        extra={"error": str(e), "scope": scope}
+                    )
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,32 +1,106 @@
 import os
+import json
+import threading
 import requests
-import jinja2
-from typing import Any
+from celery.exceptions import Retry
+from celery.signals import worker_init
 from flask import current_app
+from requests.adapters import HTTPAdapter
 
 from api.exceptions import EmailTemporaryError, EmailPermanentError
 from api.celery_app import celery
+from api.infra.redis import get_redis
+from api.services.email_templates import render_template, precompile_email_templates
 
 DOMAIN = os.getenv("MAILGUN_DOMAIN")
+API_URL = os.getenv("MAILGUN_API_URL", "https://api.mailgun.net/v3")
 
-template_loader = jinja2.FileSystemLoader("api/templates")
-template_env = jinja2.Environment(loader=template_loader)
+REGISTRATION_QUEUE_KEY = "email:registration:pending"
+REGISTRATION_FLUSH_KEY = "email:registration:flush_scheduled"
+# Emails taken by a batch task stay in its own list (PROCESSING_PREFIX + task id) until
+# the batch is done or handed over to a retry. The sorted set holds those lists scored by
+# the time they were taken, lists older than EMAIL_BATCH_ACK_TIMEOUT belong to a worker
+# that died mid-batch and are put back in the queue.
+REGISTRATION_PROCESSING_KEY = "email:registration:processing"
+REGISTRATION_PROCESSING_PREFIX = "email:registration:processing:"
 
-def render_template(template_filename: str, **context: Any) -> str:
-    return template_env.get_template(template_filename).render(**context)
+# KEYS: queue, processing list of the task, processing set. ARGV: max emails.
+TAKE_EMAILS_SCRIPT = """
+local messages = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #messages > 0 then
+    redis.call('LTRIM', KEYS[1], #messages, -1)
+    redis.call('RPUSH', KEYS[2], unpack(messages))
+    redis.call('ZADD', KEYS[3], redis.call('TIME')[1], KEYS[2])
+end
+return messages
+"""
+
+# KEYS: queue, processing set. ARGV: timeout in seconds. Returns the number of emails put back.
+REQUEUE_EMAILS_SCRIPT = """
+local deadline = tonumber(redis.call('TIME')[1]) - tonumber(ARGV[1])
+local requeued = 0
+for _, key in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', deadline)) do
+    local messages = redis.call('LRANGE', key, 0, -1)
+    if #messages > 0 then
+        redis.call('RPUSH', KEYS[1], unpack(messages))
+        requeued = requeued + #messages
+    end
+    redis.call('DEL', key)
+    redis.call('ZREM', KEYS[2], key)
+end
+return requeued
+"""
+
+_session: requests.Session | None = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+@worker_init.connect
+def _precompile_templates(**kwargs) -> None:
+    # Before the pool starts, so every worker begins with compiled templates.
+    precompile_email_templates()
+
+def get_mailgun_session() -> requests.Session:
+    """
+    Process-wide session, keeps connections (and TLS sessions) to Mailgun alive between emails.
+    """
+    global _session, _session_pid
+
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=current_app.config['EMAIL_HTTP_POOL_SIZE'])
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session_pid = os.getpid()
+        return _session
+
+def send_mailgun_message(
+    to: str | list[str],
+    subject: str,
+    body: str,
+    html: str,
+    recipient_variables: dict[str, dict] | None = None,
+) -> None:
+    """
+    Send one message. With `recipient_variables` Mailgun sends a separate copy to every
+    address in `to`, substituting %recipient.<name>% placeholders in the body.
+    """
+    data = {
+        "from": f"OrderProcessing Team <postmaster@{DOMAIN}>",
+        "to": to if isinstance(to, list) else [to],
+        "subject": subject,
+        "text": body,
+        "html": html,
+    }
+    if recipient_variables is not None:
+        data['recipient-variables'] = json.dumps(recipient_variables)
 
-def send_mailgun_message(to: str, subject: str, body: str, html: str) -> None:
     try:
-        response = requests.post(
-            f"https://api.mailgun.net/v3/{DOMAIN}/messages",
+        response = get_mailgun_session().post(
+            f"{API_URL}/{DOMAIN}/messages",
             auth=("api", os.getenv("MAILGUN_API_KEY")),
-            data={
-                "from": f"OrderProcessing Team <postmaster@{DOMAIN}>",
-                "to": [to],
-                "subject": subject,
-                "text": body,
-                "html": html,
-            },
+            data=data,
             timeout=(5, 10),
         )
     except requests.RequestException as e:
@@ -46,6 +120,68 @@ def send_mailgun_message(to: str, subject: str, body: str, html: str) -> None:
         f"Permanent Mailgun error {response.status_code}: {detail}"
     )
 
+def queue_registration_email(email: str, username: str) -> None:
+    """
+    Queue a registration email for the next batch. The first message of a window
+    schedules the batch task, EMAIL_BATCH_WINDOW seconds later.
+    """
+    window = current_app.config['EMAIL_BATCH_WINDOW']
+
+    pipe = get_redis().pipeline()
+    pipe.rpush(REGISTRATION_QUEUE_KEY, json.dumps({"email": email, "username": username}))
+    pipe.set(REGISTRATION_FLUSH_KEY, 1, nx=True, ex=max(int(window * 10), 60))
+    _, scheduled = pipe.execute()
+
+    if scheduled:
+        try:
+            send_registration_email_batch.apply_async(countdown=window)
+        except Exception:
+            # Otherwise no batch is scheduled until the flush key expires.
+            get_redis().delete(REGISTRATION_FLUSH_KEY)
+            raise
+
+def _take_registration_emails(count: int, task_id: str) -> list[dict]:
+    """
+    Move up to `count` queued emails to the processing list of `task_id`, they stay
+    there until _ack_registration_emails().
+    """
+    # Cleared first: a message queued from now on schedules a new batch.
+    get_redis().delete(REGISTRATION_FLUSH_KEY)
+    messages = get_redis().register_script(TAKE_EMAILS_SCRIPT)(
+        keys=[REGISTRATION_QUEUE_KEY, REGISTRATION_PROCESSING_PREFIX + task_id, REGISTRATION_PROCESSING_KEY],
+        args=[count],
+    )
+    return [json.loads(message) for message in messages]
+
+def _ack_registration_emails(task_id: str) -> None:
+    pipe = get_redis().pipeline()
+    pipe.delete(REGISTRATION_PROCESSING_PREFIX + task_id)
+    pipe.zrem(REGISTRATION_PROCESSING_KEY, REGISTRATION_PROCESSING_PREFIX + task_id)
+    pipe.execute()
+
+def _requeue_stale_registration_emails(timeout: int) -> int:
+    return get_redis().register_script(REQUEUE_EMAILS_SCRIPT)(
+        keys=[REGISTRATION_QUEUE_KEY, REGISTRATION_PROCESSING_KEY],
+        args=[timeout],
+    )
+
+def _send_registration_email(message: dict) -> None:
+    send_mailgun_message(
+        to=message['email'],
+        subject="Successfully signed up",
+        body=f"Hi {message['username']}, you have successfully signed up for our service!",
+        html=render_template("email/registration.html", username=message['username']),
+    )
+
+def _send_registration_email_batch(messages: list[dict]) -> None:
+    send_mailgun_message(
+        to=[message['email'] for message in messages],
+        subject="Successfully signed up",
+        body="Hi %recipient.username%, you have successfully signed up for our service!",
+        html=render_template("email/registration.html", username="%recipient.username%"),
+        recipient_variables={message['email']: {"username": message['username']} for message in messages},
+    )
+
 @celery.task(
     bind=True,
     autoretry_for=(EmailTemporaryError,),
@@ -55,15 +191,90 @@ def send_mailgun_message(to: str, subject: str, body: str, html: str) -> None:
 )
 def send_user_registration_email(self, email: str, username: str) -> None:
     try:
-        send_mailgun_message(
-            to=email,
-            subject="Successfully signed up",
-            body=f"Hi {username}, you have successfully signed up for our service!",
-            html=render_template("email/registration.html", username=username),
-        )
+        _send_registration_email({"email": email, "username": username})
     except EmailPermanentError as e:
         current_app.logger.error(
             "Permanent error sending registration email.",
             extra={"error": str(e), "user_email": email}
         )
-        return
\ No newline at end of file
+        return
+
+@celery.task(
+    bind=True,
+    retry_kwargs={"max_retries": 3}
+)
+def send_registration_email_batch(self, messages: list[dict] | None = None, batch: bool = True) -> None:
+    """
+    Send queued registration emails. Uses a single Mailgun batch request when
+    EMAIL_BATCH_SENDING is enabled, otherwise one request per email over the pooled session.
+    A batch rejected as a whole is resent per recipient, so errors are classified per
+    recipient: permanent ones are logged, temporary ones are retried with backoff.
+    Emails taken from the queue are acknowledged once sent or carried by the retry, so
+    a worker dying mid-batch only delays them (at-least-once).
+    """
+    config = current_app.config
+
+    if messages is not None:
+        _send_registration_emails(self, messages, batch)
+        return
+
+    requeued = _requeue_stale_registration_emails(config['EMAIL_BATCH_ACK_TIMEOUT'])
+    if requeued:
+        current_app.logger.warning("Requeued registration emails of an unfinished batch.", extra={"emails": requeued})
+
+    messages = _take_registration_emails(config['EMAIL_BATCH_MAX_SIZE'], self.request.id)
+    if len(messages) == config['EMAIL_BATCH_MAX_SIZE'] or requeued:
+        send_registration_email_batch.delay()
+
+    if not messages:
+        return
+
+    try:
+        _send_registration_emails(self, messages, batch)
+    except Retry:
+        # The retry message carries the emails from now on.
+        _ack_registration_emails(self.request.id)
+        raise
+    _ack_registration_emails(self.request.id)
+
+def _send_registration_emails(task, messages: list[dict], batch: bool) -> None:
+    config = current_app.config
+
+    if batch and config['EMAIL_BATCH_SENDING'] and len(messages) > 1:
+        try:
+            _send_registration_email_batch(messages)
+            return
+        except EmailTemporaryError as e:
+            raise task.retry(exc=e, args=(messages,), kwargs={"batch": True}, countdown=30 * (2 ** task.request.retries))
+        except EmailPermanentError as e:
+            current_app.logger.warning(
+                "Batch registration email rejected, sending individually.",
+                extra={"error": str(e), "recipients": len(messages)}
+            )
+
+    failed = []
+    for message in messages:
+        try:
+            _send_registration_email(message)
+        except EmailTemporaryError:
+            failed.append(message)
+        except EmailPermanentError as e:
+            current_app.logger.error(
+                "Permanent error sending registration email.",
+                extra={"error": str(e), "user_email": message['email']}
+            )
+
+    if failed:
+        if task.request.retries >= task.max_retries:
+            current_app.logger.error(
+                "Giving up on registration emails after temporary errors.",
+                extra={"user_emails": [message['email'] for message in failed]}
+            )
+            return
+        # Retried individually, a batch could be rejected again by the same bad address.
+        raise task.retry(
+            exc=EmailTemporaryError(f"{len(failed)} registration emails failed temporarily"),
+            args=(failed,),
+            kwargs={"batch": False},
+            countdown=30 * (2 ** task.request.retries)
+        )
@@ -0,0 +1,159 @@
+import os
+import time
+import redis
+from datetime import datetime
+from celery.signals import (
+    before_task_publish,
+    task_prerun,
+    task_postrun,
+    task_retry,
+    task_failure,
+    worker_init,
+    worker_process_shutdown
+)
+from prometheus_client import CollectorRegistry, REGISTRY, multiprocess, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+
+from api.exceptions import (
+    BusinessLogicError,
+    TemporaryInfrastructureError,
+    EmailPermanentError,
+    EmailTemporaryError
+)
+from api.metrics.tasks import (
+    celery_task_runtime_seconds,
+    celery_task_queue_wait_seconds,
+    celery_task_retries_total,
+    celery_task_failures_total
+)
+
+# Worker metrics are served by the worker's main process. With PROMETHEUS_MULTIPROC_DIR
+# set (required for prefork pools) the pool processes write their samples to that
+# directory and the main process aggregates them on scrape.
+
+FAILURE_REASONS = (
+    (BusinessLogicError, "business"),
+    (EmailPermanentError, "business"),
+    (TemporaryInfrastructureError, "infrastructure"),
+    (EmailTemporaryError, "infrastructure"),
+)
+
+_metrics_port = None
+_started_at: dict[str, float] = {}
+
+def init_task_monitoring(app) -> None:
+    global _metrics_port
+    _metrics_port = app.config['CELERY_METRICS_PORT']
+
+def failure_reason(exc: BaseException | None) -> str:
+    for exc_type, reason in FAILURE_REASONS:
+        if isinstance(exc, exc_type):
+            return reason
+    return "unexpected"
+
+def record_task_failure(task_name: str, reason: str) -> None:
+    """
+    Count a failure the task handled itself instead of raising.
+    """
+    celery_task_failures_total.labels(task_name=task_name, reason=reason).inc()
+
+@before_task_publish.connect
+def _stamp_enqueued_at(headers=None, **kwargs) -> None:
+    # Also called for retries, so wait time is measured from the latest publish.
+    if headers is not None:
+        headers['enqueued_at'] = time.time()
+
+@task_prerun.connect
+def _task_started(task_id=None, task=None, **kwargs) -> None:
+    now = time.time()
+    _started_at[task_id] = time.perf_counter()
+
+    enqueued_at = task.request.get('enqueued_at')
+    if enqueued_at is None:
+        return
+
+    # A retry with a countdown waits for its ETA on purpose, that part isn't queueing.
+    ready_at = enqueued_at
+    if task.request.eta:
+        ready_at = max(ready_at, datetime.fromisoformat(task.request.eta).timestamp())
+
+    queue = (task.request.delivery_info or {}).get('routing_key') or "unknown"
+    celery_task_queue_wait_seconds.labels(task_name=task.name, queue=queue).observe(max(now - ready_at, 0))
+
+@task_postrun.connect
+def _task_finished(task_id=None, task=None, **kwargs) -> None:
+    started_at = _started_at.pop(task_id, None)
+    if started_at is not None:
+        celery_task_runtime_seconds.labels(task_name=task.name).observe(time.perf_counter() - started_at)
+
+@task_retry.connect
+def _task_retried(sender=None, reason=None, **kwargs) -> None:
+    celery_task_retries_total.labels(task_name=sender.name, reason=failure_reason(reason)).inc()
+
+@task_failure.connect
+def _task_failed(sender=None, exception=None, **kwargs) -> None:
+    record_task_failure(sender.name, failure_reason(exception))
+
+def queue_depths(client, queues: list[str], priority_steps: list[int], sep: str) -> dict[str, int]:
+    """
+    Messages waiting in each queue. The Redis transport keeps one list per priority
+    step: the queue name for step 0, `<queue><sep><step>` for the others.
+    """
+    pipe = client.pipeline(transaction=False)
+    for queue in queues:
+        for step in priority_steps:
+            pipe.llen(f"{queue}{sep}{step}" if step else queue)
+    lengths = iter(pipe.execute())
+
+    return {queue: sum(next(lengths) for _ in priority_steps) for queue in queues}
+
+class QueueDepthCollector:
+    """
+    Samples broker queue depth on scrape, so it is never stale and needs no
+    multiprocess gauge.
+    """
+    def __init__(self, client, queues: list[str], priority_steps: list[int], sep: str):
+        self.client = client
+        self.queues = queues
+        self.priority_steps = priority_steps
+        self.sep = sep
+
+    def collect(self):
+        depth = GaugeMetricFamily(
+            "celery_queue_depth",
+            "Number of messages waiting in a broker queue",
+            labels=["queue"]
+        )
+        try:
+            for queue, length in queue_depths(self.client, self.queues, self.priority_steps, self.sep).items():
+                depth.add_metric([queue], length)
+        except redis.RedisError:
+            pass  # leave the series out rather than fail the whole scrape
+        yield depth
+
+@worker_init.connect
+def _start_metrics_server(sender=None, **kwargs) -> None:
+    if _metrics_port is None:
+        return
+
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    conf = sender.app.conf
+    if conf.broker_url.startswith(("redis://", "rediss://")):
+        options = conf.broker_transport_options
+        registry.register(QueueDepthCollector(
+            redis.Redis.from_url(conf.broker_url),
+            sorted(sender.app.amqp.queues.consume_from),
+            options.get('priority_steps', [0]),
+            options.get('sep', ":")
+        ))
+
+    start_http_server(_metrics_port, registry=registry)
+
+@worker_process_shutdown.connect
+def _mark_process_dead(pid=None, **kwargs) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ and pid is not None:
+        multiprocess.mark_process_dead(pid)
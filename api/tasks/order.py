@@ -1,24 +1,60 @@
-import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import or_, update
 
 from api.extensions import db
 from api.celery_app import celery
 from api.models import (
     OrderModel, 
-    OrderEventModel, 
     OrderStatus, 
     OrderEventType
 )
 from api.exceptions import BusinessLogicError, TemporaryInfrastructureError
+from api.services.order_processing import get_processing_engine
+from api.services.order_status import transition_order_status, commit_order_event
+from api.services.order_cancellation import is_order_cancelled
+from api.tasks.monitoring import record_task_failure
+
+def order_task_priority(total_amount: Decimal) -> int:
+    """
+    Broker priority of a fresh order: orders below ORDER_SMALL_TOTAL yield to larger ones.
+    """
+    config = current_app.config
+    if total_amount < config['ORDER_SMALL_TOTAL']:
+        return config['ORDER_SMALL_TOTAL_PRIORITY']
+    return config['ORDER_TASK_PRIORITY']
+
+def _transition_order(
+    order_id: int,
+    expected: OrderStatus,
+    new: OrderStatus,
+    event_type: OrderEventType,
+    payload: dict | None = None,
+    values: dict | None = None,
+) -> str | None:
+    """
+    Change the order status (and `values` columns) and record the event in one transaction,
+    then drop the cached status and notify live event streams.
+    Returns the order's uuid, or None without writing anything when the order
+    wasn't in `expected` status.
+    """
+    order_uuid = transition_order_status(order_id, expected, new, values)
+    if order_uuid is None:
+        db.session.rollback()
+        return None
+
+    commit_order_event(order_id, order_uuid, event_type, payload)
+
+    return order_uuid
 
 def _mark_order_failed(
-    order: OrderModel,
+    order_id: int,
     *,
     reason: str,
     error: str,
     retries: int | None = None,
 ) -> None:
-    order.status = OrderStatus.FAILED
-
     payload = {
         "reason": reason,
         "error": error
@@ -26,39 +62,87 @@ def _mark_order_failed(
     if retries is not None:
         payload['retries'] = retries
 
-    db.session.add(
-        OrderEventModel(
-            order_id=order.id,
-            event_type=OrderEventType.PROCESSING_FAILED,
-            payload=payload,
+    _transition_order(
+        order_id,
+        OrderStatus.PROCESSING,
+        OrderStatus.FAILED,
+        OrderEventType.PROCESSING_FAILED,
+        payload
+    )
+
+def _claim_order(order_id: int) -> bool:
+    """
+    Take the order for processing, leased for ORDER_CLAIM_LEASE seconds. A PENDING order
+    moves to PROCESSING. A PROCESSING order is taken over only when its lease was
+    released (its task scheduled a retry) or has expired (the worker died mid-attempt),
+    so a duplicate delivery (outbox redelivery, broker visibility timeout) backs off
+    while the attempt owning the order runs, and an order left behind by a crash is
+    resumed by its redelivery.
+    """
+    now = datetime.now(timezone.utc)
+    if _transition_order(
+        order_id,
+        OrderStatus.PENDING,
+        OrderStatus.PROCESSING,
+        OrderEventType.PROCESSING_STARTED,
+        values={"claimed_at": now}
+    ) is not None:
+        return True
+
+    expired = now - timedelta(seconds=current_app.config['ORDER_CLAIM_LEASE'])
+    resumed = db.session.execute(
+        update(OrderModel)
+        .where(
+            OrderModel.id == order_id,
+            OrderModel.status == OrderStatus.PROCESSING,
+            or_(OrderModel.claimed_at.is_(None), OrderModel.claimed_at < expired)
         )
+        .values(claimed_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return resumed == 1
+
+def _release_order(order_id: int) -> None:
+    # Lets the retry take the order over right away, before the lease expires.
+    db.session.execute(
+        update(OrderModel)
+        .where(OrderModel.id == order_id, OrderModel.status == OrderStatus.PROCESSING)
+        .values(claimed_at=None)
+        .execution_options(synchronize_session=False)
     )
     db.session.commit()
 
+def _log_cancelled(order_id: int, task_id: str) -> None:
+    current_app.logger.info(
+        "Order was cancelled, stopping task.",
+        extra={"order_id": order_id, "task_id": task_id}
+    )
+
 @celery.task(
     bind=True,
     retry_kwargs={"max_retries": 3}
 )
 def process_order_task(self, order_id: int, error: str | None) -> None:
-    order = OrderModel.query.filter_by(id=order_id).first()
-    if not order:
+    # Also ends the transaction, so no pooled connection is held while waiting on downstream services.
+    if not _claim_order(order_id):
+        current_app.logger.info(
+            "Order is missing, already handled or claimed by another delivery, skipping task.",
+            extra={"order_id": order_id, "task_id": self.request.id}
+        )
         return
 
-    if order.status != OrderStatus.PROCESSING:
-        order.status = OrderStatus.PROCESSING
-        db.session.add(
-            OrderEventModel(
-                order_id=order.id,
-                event_type=OrderEventType.PROCESSING_STARTED
-            )
-        )
-        db.session.commit()
+    # Cheap check before the expensive part, the order may have been cancelled meanwhile.
+    if is_order_cancelled(order_id):
+        _log_cancelled(order_id, self.request.id)
+        return
 
     try:
-        process_order_business_logic(error)
+        process_order_business_logic(order_id, error)
     except BusinessLogicError as e:
+        record_task_failure(self.name, "business")
         _mark_order_failed(
-            order,
+            order_id,
             reason="business",
             error=str(e)
         )
@@ -66,35 +150,100 @@ def process_order_task(self, order_id: int, error: str | None) -> None:
     except TemporaryInfrastructureError as e:
         if self.request.retries >= self.max_retries:
             _mark_order_failed(
-                    order,
+                    order_id,
                     reason="infrastructure",
                     error=str(e),
                     retries=self.request.retries
                 )
             raise
 
+        if is_order_cancelled(order_id):
+            _log_cancelled(order_id, self.request.id)
+            return
+
         countdown = 30 * (2 ** self.request.retries)
-        raise self.retry(exc=e, countdown=countdown)
+        _release_order(order_id)
+        raise self.retry(exc=e, countdown=countdown, priority=current_app.config['ORDER_RETRY_PRIORITY'])
 
-    order.status = OrderStatus.COMPLETED
-    db.session.add(
-        OrderEventModel(
-            order_id=order.id,
-            event_type=OrderEventType.ORDER_COMPLETED
-        )
+    _transition_order(
+        order_id,
+        OrderStatus.PROCESSING,
+        OrderStatus.COMPLETED,
+        OrderEventType.ORDER_COMPLETED
     )
-    db.session.commit()
 
-def process_order_business_logic(error: str | None) -> None:
+@celery.task(bind=True)
+def process_orders_task(self, orders: list[tuple[int, str | None]]) -> None:
     """
-    Simulate order processing business logic.
-    This function can raise exceptions to simulate different failure scenarios.
-    1. BusinessLogicError: Simulates a business logic failure (e.g., validation error).
-    2. TemporaryInfrastructureError: Simulates a temporary infrastructure failure (e.g., network issue).
+    Process a batch of (order_id, error) pairs at once on the async engine, so a single
+    worker slot keeps up to ORDER_PROCESSING_CONCURRENCY orders in flight whatever the
+    pool. An order hitting a temporary infrastructure error is released and handed to
+    process_order_task, which takes over its remaining retries.
     """
-    time.sleep(5)
+    claimed = []
+    for order_id, error in orders:
+        if not _claim_order(order_id):
+            current_app.logger.info(
+                "Order is missing, already handled or claimed by another delivery, skipping it.",
+                extra={"order_id": order_id, "task_id": self.request.id}
+            )
+        elif is_order_cancelled(order_id):
+            _log_cancelled(order_id, self.request.id)
+        else:
+            claimed.append((order_id, error))
+
+    unexpected = None
+    for (order_id, error), exc in zip(claimed, process_orders_business_logic(claimed)):
+        if exc is None:
+            _transition_order(
+                order_id,
+                OrderStatus.PROCESSING,
+                OrderStatus.COMPLETED,
+                OrderEventType.ORDER_COMPLETED
+            )
+        elif isinstance(exc, BusinessLogicError):
+            record_task_failure(self.name, "business")
+            _mark_order_failed(
+                order_id,
+                reason="business",
+                error=str(exc)
+            )
+        elif isinstance(exc, TemporaryInfrastructureError):
+            if is_order_cancelled(order_id):
+                _log_cancelled(order_id, self.request.id)
+                continue
 
-    if error == "business":
-        raise BusinessLogicError("Simulated business logic error.")
-    elif error == "infrastructure":
-        raise TemporaryInfrastructureError("Simulated temporary infrastructure error.")
\ No newline at end of file
+            _release_order(order_id)
+            # This attempt counts as the first one, as if process_order_task had retried.
+            process_order_task.apply_async(
+                args=(order_id, error),
+                countdown=30,
+                retries=1,
+                priority=current_app.config['ORDER_RETRY_PRIORITY']
+            )
+        else:
+            # Left PROCESSING under its lease, like an order whose task crashed.
+            current_app.logger.error(
+                "Order processing failed unexpectedly.",
+                extra={"order_id": order_id, "task_id": self.request.id, "error": str(exc)}
+            )
+            unexpected = unexpected or exc
+
+    if unexpected is not None:
+        raise unexpected
+
+def process_order_business_logic(order_id: int, error: str | None) -> None:
+    """
+    Run order processing business logic (inventory, payment, shipping) on the async engine.
+    Can raise exceptions to signal different failure scenarios:
+    1. BusinessLogicError: A business logic failure (e.g., validation error).
+    2. TemporaryInfrastructureError: A temporary infrastructure failure (e.g., network issue).
+    """
+    get_processing_engine().run(order_id, error)
+
+def process_orders_business_logic(orders: list[tuple[int, str | None]]) -> list[BaseException | None]:
+    """
+    Run the business logic of many orders concurrently on the async engine.
+    Returns the exception raised for each order, or None if it succeeded.
+    """
+    return get_processing_engine().run_many(orders)
\ No newline at end of file
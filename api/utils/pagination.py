@@ -0,0 +1,21 @@
+import base64
+import binascii
+import json
+
+from api.exceptions import InvalidCursorError
+
+def encode_cursor(order_id: int) -> str:
+    raw = json.dumps({"id": order_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        order_id = json.loads(base64.urlsafe_b64decode(padded))['id']
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Malformed pagination cursor.") from e
+
+    if not isinstance(order_id, int):
+        raise InvalidCursorError("Malformed pagination cursor.")
+
+    return order_id
@@ -0,0 +1,216 @@
+"""
+End-to-end benchmark of the API and the order processing pipeline.
+
+Drives register -> login -> create order -> poll status against `create_app` with the
+Flask test client, an SQLite (or local Postgres) database, fakeredis and an in-memory
+Celery broker. Order processing tasks are taken from the outbox and executed eagerly
+in-process. Reports throughput, latency percentiles and DB queries per request for
+every endpoint as JSON, so results can be compared across commits and dependency
+upgrades.
+
+Usage:
+    python -m bench.api_load --users 200 --output bench_results.json
+    python -m bench.api_load --users 200 --compare bench_results.json --max-regression 0.2
+"""
+import argparse
+import importlib.metadata
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from unittest import mock
+
+import fakeredis
+from sqlalchemy import event
+
+from api import create_app
+from api.extensions import db
+from api.models import OutboxMessageModel
+from api.celery_app import celery
+
+PACKAGES = ("flask", "flask-smorest", "sqlalchemy", "flask-sqlalchemy", "marshmallow", "celery", "redis")
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[index]
+
+class Recorder:
+    """
+    Collects latency and SQL statement counts per endpoint.
+    """
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self._statements = 0
+
+    def count_statement(self, *args, **kwargs) -> None:
+        self._statements += 1
+
+    def call(self, endpoint: str, fn, *args, **kwargs):
+        self._statements = 0
+        start = time.perf_counter()
+        response = fn(*args, **kwargs)
+        self.latencies[endpoint].append((time.perf_counter() - start) * 1000)
+        self.queries[endpoint].append(self._statements)
+
+        if response.status_code >= 400:
+            raise RuntimeError(f"{endpoint} failed with {response.status_code}: {response.get_data(as_text=True)}")
+        return response
+
+    def summary(self) -> dict:
+        return {
+            endpoint: {
+                "requests": len(latencies),
+                "throughput_rps": round(len(latencies) / (sum(latencies) / 1000), 1),
+                "mean_ms": round(statistics.mean(latencies), 3),
+                "p50_ms": round(percentile(latencies, 50), 3),
+                "p95_ms": round(percentile(latencies, 95), 3),
+                "p99_ms": round(percentile(latencies, 99), 3),
+                "queries_per_request": round(statistics.mean(self.queries[endpoint]), 2),
+            }
+            for endpoint, latencies in self.latencies.items()
+        }
+
+def process_outbox_eagerly() -> int:
+    """
+    Stand-in for the outbox relay and the Celery worker: runs queued tasks in-process.
+    """
+    messages = OutboxMessageModel.query.order_by(OutboxMessageModel.id).all()
+    tasks = [(message.task_name, message.args) for message in messages]
+    for message in messages:
+        db.session.delete(message)
+    db.session.commit()
+
+    for task_name, args in tasks:
+        celery.tasks[task_name].apply(args=args)
+    return len(tasks)
+
+def run_scenario(client, recorder: Recorder, user_index: int, items: int, polls: int) -> None:
+    email = f"bench{user_index}@example.com"
+    password = "bench-password"
+
+    recorder.call(
+        "POST /auth/register", client.post, "/auth/register",
+        json={"username": f"bench{user_index}", "email": email, "password": password}
+    )
+    tokens = recorder.call(
+        "POST /auth/login", client.post, "/auth/login",
+        json={"email": email, "password": password}
+    ).json
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    order = recorder.call(
+        "POST /api/orders", client.post, "/api/orders",
+        json={"items": [
+            {"product_name": f"Item {i}", "quantity": 1 + i % 3, "unit_price": "9.99"}
+            for i in range(items)
+        ]},
+        headers=headers
+    ).json
+
+    recorder.call("GET /api/orders/<uuid>", client.get, f"/api/orders/{order['uuid']}", headers=headers)
+    process_outbox_eagerly()
+    for _ in range(polls):
+        status = recorder.call("GET /api/orders/<uuid>", client.get, f"/api/orders/{order['uuid']}", headers=headers)
+    if status.json['status'] != "completed":
+        raise RuntimeError(f"Order {order['uuid']} ended as {status.json['status']}")
+
+    recorder.call("GET /api/orders", client.get, "/api/orders", headers=headers)
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "packages": {name: importlib.metadata.version(name) for name in PACKAGES},
+    }
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    regressions = []
+    for endpoint, stats in results['endpoints'].items():
+        before = baseline['endpoints'].get(endpoint)
+        if before is None:
+            continue
+        for key in ("p95_ms", "queries_per_request"):
+            if before[key] and stats[key] > before[key] * (1 + max_regression):
+                regressions.append(f"{endpoint} {key}: {before[key]} -> {stats[key]}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--items", type=int, default=5, help="items per order")
+    parser.add_argument("--polls", type=int, default=3, help="status polls after the order was processed")
+    parser.add_argument("--database-url", default="sqlite:///:memory:")
+    parser.add_argument("--rate-limit", action="store_true", help="keep the rate limiter on")
+    parser.add_argument("--output", help="write JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed relative p95/query growth")
+    args = parser.parse_args()
+
+    fake_redis = fakeredis.FakeRedis()
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": args.database_url,
+        "JWT_SECRET_KEY": "bench-secret-key-of-a-reasonable-length",
+        "CELERY_BROKER_URL": "memory://",
+        "CELERY_RESULT_BACKEND": "cache+memory://",
+        "BLOCKLIST_PUBSUB_ENABLED": False,
+        "ORDER_PROCESSING_SIMULATED_LATENCY": 0,
+        # Every simulated user comes from the same address: with the limiter on, register
+        # and login answer 429 after the first burst.
+        "RATE_LIMIT_ENABLED": args.rate_limit,
+    })
+
+    recorder = Recorder()
+    with app.app_context(), mock.patch("api.infra.redis._redis", fake_redis):
+        db.drop_all()
+        db.create_all()
+        event.listen(db.engine, "before_cursor_execute", recorder.count_statement)
+
+        client = app.test_client()
+        start = time.perf_counter()
+        for user_index in range(args.users):
+            run_scenario(client, recorder, user_index, args.items, args.polls)
+        wall = time.perf_counter() - start
+
+        db.drop_all()
+
+    endpoints = recorder.summary()
+    results = {
+        "environment": environment(),
+        "parameters": vars(args) | {"compare": None, "output": None},
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(sum(e['requests'] for e in endpoints.values()) / wall, 1),
+        "endpoints": endpoints,
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Micro-benchmark of order response serialization: marshmallow `Schema().dump()` against
+the dump functions compiled from the same schemas (api/schemas/compiled.py), for the
+order status payload of GET /api/orders/<uuid> and the order payload of the listings.
+
+Orders are transient model instances, no database is involved.
+
+Usage:
+    python -m bench.serialization --orders 2000 --items 5 --events 6
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from api.models import OrderModel, OrderStatus, OrderItemModel, OrderEventModel, OrderEventType
+from api.schemas import OrderResponseSchema, OrderStatusResponseSchema, dump_order, dump_order_status
+
+def make_orders(orders: int, items: int, events: int) -> list[OrderModel]:
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    event_types = list(OrderEventType)
+    result = []
+    for index in range(orders):
+        order = OrderModel(
+            uuid=f"00000000-0000-4000-8000-{index:012d}",
+            status=OrderStatus.COMPLETED,
+            total_amount=Decimal("12.50") * items,
+            created_at=created_at
+        )
+        order.items = [
+            OrderItemModel(product_name=f"Item {i}", quantity=1, unit_price=Decimal("12.50"))
+            for i in range(items)
+        ]
+        order.recent_events = [
+            OrderEventModel(
+                id=i,
+                event_type=event_types[i % len(event_types)],
+                payload={"attempt": i},
+                created_at=created_at + timedelta(seconds=i)
+            )
+            for i in range(events)
+        ]
+        result.append(order)
+    return result
+
+def measure(name: str, orders: list[OrderModel], dump) -> dict:
+    start = time.perf_counter()
+    for order in orders:
+        dump(order)
+    seconds = time.perf_counter() - start
+
+    return {
+        "name": name,
+        "orders": len(orders),
+        "seconds": round(seconds, 4),
+        "us_per_order": round(seconds / len(orders) * 1_000_000, 2),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=5, help="items per order")
+    parser.add_argument("--events", type=int, default=6, help="events per order")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    orders = make_orders(args.orders, args.items, args.events)
+    status_schema = OrderStatusResponseSchema()
+    order_schema = OrderResponseSchema()
+
+    # Same payload both ways, or the comparison means nothing.
+    for order in orders[:10]:
+        assert json.dumps(dump_order_status(order)) == json.dumps(status_schema.dump(order))
+
+    # Warm up attribute loaders of the model instances.
+    for order in orders:
+        status_schema.dump(order)
+
+    results = [
+        measure("order_status_marshmallow", orders, status_schema.dump),
+        measure("order_status_compiled", orders, dump_order_status),
+        measure("order_marshmallow", orders, order_schema.dump),
+        measure("order_compiled", orders, dump_order),
+    ]
+
+    if args.json:
+        print(json.dumps({"items": args.items, "events": args.events, "results": results}, indent=2))
+        return
+
+    print(f"items={args.items} events={args.events}")
+    for result in results:
+        print(
+            f"{result['name']:<26} {result['orders']:>6} orders in {result['seconds']:>8.4f} s "
+            f"-> {result['us_per_order']:>8.2f} us/order"
+        )
+
+if __name__ == "__main__":
+    main()
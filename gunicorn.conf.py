@@ -0,0 +1,54 @@
+import os
+import glob
+import multiprocessing
+
+# Production server for the web tier: `gunicorn` picks this file up from the working directory.
+
+# prometheus_client decides between in-memory and multiprocess metrics when it is first
+# imported, so the directory has to be set before anything imports it (this file included).
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-web")
+os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+from prometheus_client.multiprocess import mark_process_dead  # noqa: E402
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+wsgi_app = "api.wsgi:app"
+
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# Requests mostly wait on Postgres and Redis, threads let a worker overlap them. An open
+# event stream holds a thread until it ends: ORDER_EVENTS_MAX_STREAMS (per worker) must
+# stay below this, streams are meant for an instance of their own (`web-events`).
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_class = "gthread"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+# Off by default: every recycled worker leaves its counter files behind for /metrics to read
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 0))
+
+# create_app() runs once in the master, workers fork with the app already imported
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+def on_starting(server):
+    # Samples left by a previous run would be added to the new one. The master's own
+    # files were created while preloading and are kept.
+    own_files = f"_{os.getpid()}.db"
+    for path in glob.glob(os.path.join(PROMETHEUS_MULTIPROC_DIR, "*.db")):
+        if not path.endswith(own_files):
+            os.remove(path)
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master must not be shared with the workers.
+    from api.extensions import db
+
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
+
+def child_exit(server, worker):
+    # Drops the dead worker's live gauges. Its counter and histogram files stay, so
+    # totals don't go backwards when a worker is replaced.
+    mark_process_dead(worker.pid)
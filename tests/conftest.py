@@ -1,15 +1,32 @@
 import pytest
 import fakeredis
+from sqlalchemy import event
 
 from api import create_app
 from api.extensions import db
+from api.services import blocklist
 
 @pytest.fixture
-def app():
+def database_url(request, tmp_path):
+    """
+    In-memory database, or a file one with `@pytest.mark.parametrize("database_url",
+    ["file"], indirect=True)`: threads need their own connections to one database, an
+    in-memory one is per connection.
+    """
+    if getattr(request, "param", None) == "file":
+        return f"sqlite:///{tmp_path / 'test.db'}"
+    return "sqlite:///:memory:"
+
+@pytest.fixture
+def app(database_url):
     app = create_app({
         "TESTING": True,
-        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-        "JWT_SECRET_KEY": "test-secret"
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "JWT_SECRET_KEY": "test-secret",
+        "BLOCKLIST_PUBSUB_ENABLED": False,
+        "ORDER_PROCESSING_SIMULATED_LATENCY": 0,
+        "PASSWORD_HASH_WORKERS": 0,
+        "RATE_LIMIT_ENABLED": False
     })
 
     with app.app_context():
@@ -23,6 +40,19 @@ def app():
 def client(app):
     return app.test_client()
 
+@pytest.fixture
+def auth_headers(client):
+    client.post(
+        "/auth/register",
+        json={"username": "user", "email": "test@example.com", "password": "abc123"},
+    )
+    response = client.post(
+        "/auth/login",
+        json={"email": "test@example.com", "password": "abc123"},
+    )
+
+    return {"Authorization": f"Bearer {response.json['access_token']}"}
+
 @pytest.fixture
 def db_session(app):
     with app.app_context():
@@ -36,4 +66,28 @@ def mock_auth_redis(mocker):
     """
     fake_redis = fakeredis.FakeRedis()
     mocker.patch("api.services.blocklist.get_redis", return_value=fake_redis)
-    yield fake_redis
\ No newline at end of file
+    blocklist.clear_blocklist_cache()
+    yield fake_redis
+
+@pytest.fixture
+def query_counter(app):
+    """
+    Counts SQL statements executed against the test database.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+@pytest.fixture(autouse=True)
+def mock_redis(mocker):
+    """
+    Global fake Redis for services using the shared client (caches, etc.).
+    """
+    fake_redis = fakeredis.FakeRedis()
+    mocker.patch("api.infra.redis._redis", fake_redis)
+    yield fake_redis
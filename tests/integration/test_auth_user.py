@@ -1,6 +1,11 @@
 import pytest
 from flask_jwt_extended import create_access_token, decode_token
 from datetime import timedelta
+from passlib.hash import pbkdf2_sha256 as sha256
+
+from api.exceptions import PasswordHashingSaturatedError
+from api.models import UserModel
+from api.resources import auth as auth_resources
 
 @pytest.fixture
 def create_user_details(client):
@@ -242,4 +247,57 @@ def test_get_user_details_missing(client):
     )
 
     assert response.status_code == 404
-    assert response.json == {"code": 404, "status": "Not Found"}
\ No newline at end of file
+    assert response.json == {"code": 404, "status": "Not Found"}
+
+def test_login_user_busy(client, create_user_details, mocker):
+    _, email, password = create_user_details
+    mocker.patch(
+        "api.resources.auth.verify_password",
+        side_effect=PasswordHashingSaturatedError("saturated")
+    )
+
+    response = client.post(
+        "/auth/login",
+        json={"email": email, "password": password},
+    )
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == "1"
+
+def test_login_user_rehashes_password_when_rounds_change(app, client, create_user_details):
+    _, email, password = create_user_details
+    app.config['PASSWORD_HASH_ROUNDS'] = 1000
+
+    response = client.post(
+        "/auth/login",
+        json={"email": email, "password": password},
+    )
+
+    assert response.status_code == 200
+    user = UserModel.query.filter_by(email=email).one()
+    assert sha256.from_string(user.password).rounds == 1000
+
+def test_login_rate_limited_by_ip(app, client, create_user_details, mocker):
+    _, email, password = create_user_details
+    app.config['RATE_LIMIT_ENABLED'] = True
+    app.config['RATE_LIMITS'] = dict(app.config['RATE_LIMITS'], auth={
+        "capacity": 2, "rate": 0.01, "global_capacity": 100, "global_rate": 100
+    })
+    verify = mocker.spy(auth_resources, "verify_password")
+
+    for _ in range(2):
+        response = client.post("/auth/login", json={"email": email, "password": password})
+        assert response.status_code == 200
+
+    response = client.post("/auth/login", json={"email": email, "password": password})
+
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert verify.call_count == 2
+
+    response = client.post(
+        "/auth/login",
+        json={"email": email, "password": password},
+        environ_base={"REMOTE_ADDR": "10.0.0.2"}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from bench.api_load import Recorder, run_scenario, compare
+
+ROOT = Path(__file__).resolve().parents[2]
+
+def test_api_load_scenario_runs(client):
+    recorder = Recorder()
+
+    run_scenario(client, recorder, user_index=0, items=2, polls=2)
+
+    summary = recorder.summary()
+    assert summary['POST /api/orders']['requests'] == 1
+    assert summary['GET /api/orders/<uuid>']['requests'] == 3
+
+def test_bench_main_is_not_rate_limited():
+    # A fresh interpreter: Celery tasks stay bound to the first app created in this one.
+    # More users than the auth burst, all from the test client's address.
+    result = subprocess.run(
+        [sys.executable, "-m", "bench.api_load", "--users", "12", "--items", "1", "--polls", "1"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+
+    assert result.returncode == 0, result.stderr
+    endpoints = json.loads(result.stdout)['endpoints']
+    assert endpoints['POST /auth/register']['requests'] == 12
+    assert endpoints['POST /auth/login']['requests'] == 12
+
+def test_compare_reports_regressions():
+    baseline = {"endpoints": {"GET /x": {"p95_ms": 10.0, "queries_per_request": 3}}}
+    results = {"endpoints": {"GET /x": {"p95_ms": 13.0, "queries_per_request": 3}}}
+
+    assert compare(results, baseline, max_regression=0.2) == ["GET /x p95_ms: 10.0 -> 13.0"]
+    assert compare(results, baseline, max_regression=0.5) == []
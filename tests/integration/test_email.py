@@ -0,0 +1,155 @@
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from api.tasks import email as email_tasks
+
+class MailgunStub(ThreadingHTTPServer):
+    """
+    Local stand-in for the Mailgun messages API.
+    Answers with the queued status codes (then 200) and records every request.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MailgunStubHandler)
+        self.requests = []
+        self.statuses = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v3"
+
+class MailgunStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        form = parse_qs(self.rfile.read(length).decode())
+        self.server.requests.append({"path": self.path, "form": form, "client_port": self.client_address[1]})
+
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = json.dumps({"message": "stub"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def mailgun(app, mocker):
+    server = MailgunStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    mocker.patch.object(email_tasks, "API_URL", server.url)
+    mocker.patch.object(email_tasks, "DOMAIN", "example.test")
+    mocker.patch.object(email_tasks, "_session", None)
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def mock_batch_apply_async(mocker):
+    return mocker.patch.object(email_tasks.send_registration_email_batch, "apply_async")
+
+def recipients(request):
+    return request['form']['to']
+
+def test_messages_reuse_pooled_connection(mailgun):
+    email_tasks.send_mailgun_message("a@example.com", "Hi", "body", "<p>body</p>")
+    email_tasks.send_mailgun_message("b@example.com", "Hi", "body", "<p>body</p>")
+
+    assert [r['path'] for r in mailgun.requests] == ["/v3/example.test/messages"] * 2
+    assert mailgun.requests[0]['client_port'] == mailgun.requests[1]['client_port']
+
+def test_queue_registration_email_schedules_one_batch_per_window(app, mock_batch_apply_async, mock_redis):
+    email_tasks.queue_registration_email("a@example.com", "alice")
+    email_tasks.queue_registration_email("b@example.com", "bob")
+
+    assert mock_redis.llen(email_tasks.REGISTRATION_QUEUE_KEY) == 2
+    mock_batch_apply_async.assert_called_once_with(countdown=app.config['EMAIL_BATCH_WINDOW'])
+
+def test_batch_is_sent_with_recipient_variables(mailgun, mock_batch_apply_async, mock_redis):
+    email_tasks.queue_registration_email("a@example.com", "alice")
+    email_tasks.queue_registration_email("b@example.com", "bob")
+
+    email_tasks.send_registration_email_batch.apply()
+
+    assert len(mailgun.requests) == 1
+    form = mailgun.requests[0]['form']
+    assert form['to'] == ["a@example.com", "b@example.com"]
+    assert json.loads(form['recipient-variables'][0]) == {
+        "a@example.com": {"username": "alice"},
+        "b@example.com": {"username": "bob"},
+    }
+    assert "%recipient.username%" in form['html'][0]
+    assert mock_redis.llen(email_tasks.REGISTRATION_QUEUE_KEY) == 0
+
+def test_rejected_batch_is_classified_per_recipient(mailgun):
+    # Batch rejected, then: first recipient permanently invalid, second sent.
+    mailgun.statuses = [400, 400, 200]
+    messages = [{"email": "bad@example", "username": "bad"}, {"email": "b@example.com", "username": "bob"}]
+
+    result = email_tasks.send_registration_email_batch.apply(args=(messages,))
+
+    assert result.successful()
+    assert [recipients(r) for r in mailgun.requests] == [
+        ["bad@example", "b@example.com"],
+        ["bad@example"],
+        ["b@example.com"],
+    ]
+
+def test_temporary_failures_are_retried_individually(mailgun):
+    # Individual sends: first fails temporarily, second is sent. The retry resends only the first.
+    mailgun.statuses = [503, 200, 200]
+    messages = [{"email": "a@example.com", "username": "alice"}, {"email": "b@example.com", "username": "bob"}]
+
+    result = email_tasks.send_registration_email_batch.apply(args=(messages,), kwargs={"batch": False})
+
+    assert result.successful()
+    assert [recipients(r) for r in mailgun.requests] == [
+        ["a@example.com"],
+        ["b@example.com"],
+        ["a@example.com"],
+    ]
+
+def test_failed_batch_scheduling_clears_flush_key(app, mock_batch_apply_async, mock_redis):
+    mock_batch_apply_async.side_effect = ConnectionError("broker down")
+
+    with pytest.raises(ConnectionError):
+        email_tasks.queue_registration_email("a@example.com", "alice")
+
+    assert not mock_redis.exists(email_tasks.REGISTRATION_FLUSH_KEY)
+    assert mock_redis.llen(email_tasks.REGISTRATION_QUEUE_KEY) == 1
+
+def test_sent_batch_is_acknowledged(mailgun, mock_batch_apply_async, mock_redis):
+    email_tasks.queue_registration_email("a@example.com", "alice")
+
+    email_tasks.send_registration_email_batch.apply()
+
+    assert len(mailgun.requests) == 1
+    assert mock_redis.zcard(email_tasks.REGISTRATION_PROCESSING_KEY) == 0
+    assert mock_redis.keys(email_tasks.REGISTRATION_PROCESSING_PREFIX + "*") == []
+
+def test_emails_of_a_dead_batch_are_requeued(mailgun, mock_batch_apply_async, mock_redis):
+    email_tasks.queue_registration_email("a@example.com", "alice")
+    email_tasks.queue_registration_email("b@example.com", "bob")
+    # Taken by a worker that died before sending them.
+    email_tasks._take_registration_emails(500, "dead-task")
+    email_tasks.send_registration_email_batch.apply()
+    assert mailgun.requests == []
+
+    # Taken longer than EMAIL_BATCH_ACK_TIMEOUT ago.
+    mock_redis.zadd(email_tasks.REGISTRATION_PROCESSING_KEY, {email_tasks.REGISTRATION_PROCESSING_PREFIX + "dead-task": 0})
+    email_tasks.send_registration_email_batch.apply()
+
+    assert [recipients(r) for r in mailgun.requests] == [["a@example.com", "b@example.com"]]
+    assert mock_redis.zcard(email_tasks.REGISTRATION_PROCESSING_KEY) == 0
+    assert mock_redis.llen(email_tasks.REGISTRATION_QUEUE_KEY) == 0
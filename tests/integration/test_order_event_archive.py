@@ -0,0 +1,73 @@
+import json
+import pytest
+
+from api.extensions import db
+from api.models import OrderModel, OrderEventModel, OrderEventType, OrderEventArchiveModel, OrderStatus
+
+@pytest.fixture
+def archived_order(client, auth_headers):
+    """
+    An order whose creation events were archived, as `flask events archive` leaves it,
+    with one event still in order_events.
+    """
+    created = client.post(
+        "/api/orders",
+        json={"items": [{"product_name": "Book", "quantity": 1, "unit_price": "10.00"}]},
+        headers=auth_headers
+    ).json
+    order = OrderModel.query.filter_by(uuid=created['uuid']).one()
+
+    events = list(order.recent_events)
+    db.session.add(OrderEventArchiveModel(
+        order_id=order.id,
+        events=[
+            {
+                "id": event.id,
+                "event_type": event.event_type.name,
+                "payload": event.payload,
+                "created_at": event.created_at.isoformat()
+            }
+            for event in events
+        ]
+    ))
+    for event in events:
+        db.session.delete(event)
+    order.status = OrderStatus.CANCELLED
+    db.session.add(OrderEventModel(
+        order_id=order.id,
+        event_type=OrderEventType.ORDER_CANCELLED,
+        payload={"reason": "test"}
+    ))
+    db.session.commit()
+    db.session.expunge_all()
+
+    return created['uuid']
+
+def test_order_status_includes_archived_events(client, auth_headers, archived_order, query_counter):
+    query_counter.clear()
+    response = client.get(f"/api/orders/{archived_order}", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [event['event_type'] for event in response.json['events']] == [
+        "order_created", "order_enqueued", "order_cancelled"
+    ]
+    assert response.json['events'][-1]['payload'] == {"reason": "test"}
+    assert len(query_counter) == 3
+
+def test_event_stream_replays_archived_events(client, auth_headers, archived_order):
+    response = client.get(f"/api/orders/{archived_order}/events/stream", headers=auth_headers)
+
+    events = [
+        json.loads(line.removeprefix("data: "))['event_type']
+        for line in response.get_data(as_text=True).splitlines()
+        if line.startswith("data: ")
+    ]
+    assert events == ["order_created", "order_enqueued", "order_cancelled"]
+
+def test_export_includes_archived_events(client, auth_headers, archived_order):
+    response = client.get("/api/orders/export", headers=auth_headers)
+
+    order = json.loads(response.get_data(as_text=True))
+    assert [event['event_type'] for event in order['events']] == [
+        "order_created", "order_enqueued", "order_cancelled"
+    ]
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import uuid
+import tracemalloc
+from decimal import Decimal
+
+from api.extensions import db
+from api.models import UserModel, OrderModel, OrderItemModel, OrderStatus
+
+def make_order(price: str) -> dict:
+    return {"items": [{"product_name": "Book", "quantity": 2, "unit_price": price}]}
+
+def insert_orders(count: int) -> None:
+    user_id = UserModel.query.filter_by(email="test@example.com").one().id
+    order_ids = db.session.scalars(
+        db.insert(OrderModel).returning(OrderModel.id),
+        [
+            {
+                "uuid": str(uuid.uuid4()),
+                "user_id": user_id,
+                "status": OrderStatus.PENDING,
+                "total_amount": Decimal("10.00")
+            }
+            for _ in range(count)
+        ]
+    ).all()
+    db.session.execute(
+        db.insert(OrderItemModel),
+        [
+            {"order_id": order_id, "product_name": "Book", "quantity": 1, "unit_price": Decimal("10.00")}
+            for order_id in order_ids
+        ]
+    )
+    db.session.commit()
+
+def export_peak_memory(client, auth_headers) -> int:
+    tracemalloc.start()
+    try:
+        response = client.get("/api/orders/export", headers=auth_headers, buffered=False)
+        lines = sum(chunk.count(b"\n") for chunk in response.response)
+        response.close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert lines == OrderModel.query.count()
+    return peak
+
+def test_export_ndjson(client, auth_headers):
+    created = [
+        client.post("/api/orders", json=make_order(price), headers=auth_headers).json
+        for price in ("10.00", "2.50")
+    ]
+
+    response = client.get("/api/orders/export", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers['Content-Disposition'] == 'attachment; filename="orders.ndjson"'
+
+    orders = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [order['uuid'] for order in orders] == [order['uuid'] for order in created]
+    assert orders[0]['total_amount'] == "20.00"
+    assert orders[0]['items'] == [{"product_name": "Book", "quantity": 2, "unit_price": "10.00"}]
+    assert orders[0]['events'][0]['event_type'] == "order_created"
+
+def test_export_csv(client, auth_headers):
+    created = client.post("/api/orders", json=make_order("10.00"), headers=auth_headers).json
+
+    response = client.get("/api/orders/export?format=csv", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 1
+    assert rows[0]['uuid'] == created['uuid']
+    assert rows[0]['status'] == "pending"
+    assert rows[0]['total_amount'] == "20.00"
+    assert json.loads(rows[0]['items']) == [{"product_name": "Book", "quantity": 2, "unit_price": "10.00"}]
+    assert json.loads(rows[0]['events'])[0]['event_type'] == "order_created"
+
+def test_export_only_own_orders(client, auth_headers):
+    client.post("/api/orders", json=make_order("10.00"), headers=auth_headers)
+    client.post(
+        "/auth/register",
+        json={"username": "other", "email": "other@example.com", "password": "abc123"},
+    )
+    token = client.post(
+        "/auth/login",
+        json={"email": "other@example.com", "password": "abc123"},
+    ).json['access_token']
+
+    response = client.get("/api/orders/export", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.get_data() == b""
+
+def test_export_invalid_format(client, auth_headers):
+    response = client.get("/api/orders/export?format=xml", headers=auth_headers)
+
+    assert response.status_code == 422
+
+def test_export_memory_does_not_grow_with_orders(app, client, auth_headers):
+    app.config['ORDER_EXPORT_BATCH_SIZE'] = 50
+
+    insert_orders(100)
+    export_peak_memory(client, auth_headers)  # warm up caches of the first request
+    small = export_peak_memory(client, auth_headers)
+
+    insert_orders(900)
+    large = export_peak_memory(client, auth_headers)
+
+    # Ten times the orders, but only one batch is held at a time
+    assert large < small * 2
@@ -0,0 +1,681 @@
+import json
+import pytest
+import threading
+from unittest.mock import ANY
+from datetime import timedelta
+from prometheus_client import REGISTRY
+from redis.exceptions import RedisError
+from sqlalchemy.orm.attributes import set_committed_value
+
+from api.extensions import db
+from api.exceptions import TemporaryInfrastructureError
+from api.models import (
+    OrderModel,
+    OrderItemModel,
+    OrderEventModel,
+    OrderEventType,
+    OrderStatus,
+    OutboxMessageModel,
+    UserModel
+)
+from api.resources import order as order_resources
+from api.schemas import OrderCreateSchema
+from api.schemas.order import ORDERS_BATCH_MAX_SIZE, ORDERS_BATCH_MAX_ITEMS, ORDER_MAX_ITEMS
+from api.services.idempotency import begin_idempotent_request, request_fingerprint
+from api.services.order_events import init_order_events
+from api.utils.pagination import encode_cursor
+from api.tasks import order as order_tasks
+from api.tasks.order import process_order_task, process_orders_task
+
+def make_order(*items):
+    return {
+        "items": [
+            {"product_name": name, "quantity": quantity, "unit_price": price}
+            for name, quantity, price in items
+        ]
+    }
+
+def test_create_order(client, auth_headers):
+    response = client.post(
+        "/api/orders",
+        json=make_order(("Book", 2, "10.50"), ("Pen", 1, "2.00")),
+        headers=auth_headers
+    )
+
+    assert response.status_code == 201
+    assert response.json['status'] == "pending"
+    assert response.json['total_amount'] == "23.00"
+
+    order = OrderModel.query.one()
+    message = OutboxMessageModel.query.one()
+    assert message.task_name == process_order_task.name
+    assert message.args == [order.id, None]
+
+def test_create_order_rejects_too_many_items(client, auth_headers):
+    response = client.post(
+        "/api/orders",
+        json=make_order(*[("Book", 1, "1.00")] * 101),
+        headers=auth_headers
+    )
+
+    assert response.status_code == 422
+    assert response.json['errors']['json'] == {"items": ["Length must be between 1 and 100."]}
+    assert OrderModel.query.count() == 0
+
+def test_create_order_reports_item_errors(client, auth_headers):
+    response = client.post(
+        "/api/orders",
+        json=make_order(("Book", 0, "10.50"), ("Pen", 1, "abc")),
+        headers=auth_headers
+    )
+
+    assert response.status_code == 422
+    assert response.json['errors']['json'] == {"items": {
+        "0": {"quantity": ["Must be greater than or equal to 1."]},
+        "1": {"unit_price": ["Not a valid number."]}
+    }}
+
+def test_create_order_rejects_oversized_body(client, app, auth_headers):
+    app.config['MAX_CONTENT_LENGTH'] = 1024
+
+    response = client.post(
+        "/api/orders",
+        json=make_order(*[("Book" * 10, 1, "1.00")] * 50),
+        headers=auth_headers
+    )
+
+    assert response.status_code == 413
+    assert OrderModel.query.count() == 0
+
+def test_create_order_batch(client, auth_headers):
+    response = client.post(
+        "/api/orders/batch",
+        json={"orders": [
+            make_order(("Book", 2, "10.50")),
+            make_order(("Pen", 3, "1.00"), ("Ink", 1, "4.25")),
+        ]},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.json['created'] == 2
+    assert response.json['rejected'] == 0
+    assert [r['order']['total_amount'] for r in response.json['results']] == ["21.00", "7.25"]
+
+    assert OrderModel.query.count() == 2
+    assert OrderItemModel.query.count() == 3
+    assert OrderEventModel.query.filter_by(event_type=OrderEventType.ORDER_ENQUEUED).count() == 2
+    assert OutboxMessageModel.query.count() == 2
+
+def test_create_order_batch_of_maximal_size(app, client, auth_headers):
+    # Every limit at its maximum: orders, items in total and size of every field.
+    per_order = ORDERS_BATCH_MAX_ITEMS // ORDERS_BATCH_MAX_SIZE
+    order = make_order(*[("B" * 120, 2147483647, "99999999.99")] * per_order)
+    body = {"orders": [order] * ORDERS_BATCH_MAX_SIZE}
+    assert len(json.dumps(body)) > app.config['MAX_CONTENT_LENGTH']
+
+    response = client.post("/api/orders/batch", json=body, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json['created'] == ORDERS_BATCH_MAX_SIZE
+
+def test_create_order_batch_rejects_too_many_items_in_total(client, auth_headers):
+    order = make_order(*[("Book", 1, "1.00")] * ORDER_MAX_ITEMS)
+    orders = [order] * (ORDERS_BATCH_MAX_ITEMS // ORDER_MAX_ITEMS + 1)
+
+    response = client.post("/api/orders/batch", json={"orders": orders}, headers=auth_headers)
+
+    assert response.status_code == 422
+    assert "orders" in response.json['errors']['json']
+    assert OrderModel.query.count() == 0
+
+def test_create_order_batch_reports_rejected_orders(client, auth_headers):
+    response = client.post(
+        "/api/orders/batch",
+        json={"orders": [
+            make_order(("Book", 0, "10.50")),
+            make_order(("Pen", 1, "1.00")),
+            {"items": []},
+        ]},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.json['created'] == 1
+    assert response.json['rejected'] == 2
+
+    results = response.json['results']
+    assert [r['result'] for r in results] == ["rejected", "created", "rejected"]
+    assert "items" in results[0]['errors']
+    assert "items" in results[2]['errors']
+
+    order = OrderModel.query.one()
+    assert results[1]['order']['uuid'] == order.uuid
+    assert OutboxMessageModel.query.one().args == [order.id, None]
+
+def test_create_order_batch_empty(client, auth_headers):
+    response = client.post("/api/orders/batch", json={"orders": []}, headers=auth_headers)
+
+    assert response.status_code == 422
+    assert "orders" in response.json['errors']['json']
+
+def add_events(order_uuid, count):
+    order = OrderModel.query.filter_by(uuid=order_uuid).one()
+    for _ in range(count):
+        db.session.add(OrderEventModel(order_id=order.id, event_type=OrderEventType.PROCESSING_FAILED))
+    db.session.commit()
+    db.session.expunge_all()
+
+def test_get_order_status(client, auth_headers):
+    created = client.post(
+        "/api/orders",
+        json=make_order(("Book", 2, "10.50")),
+        headers=auth_headers
+    )
+
+    response = client.get(f"/api/orders/{created.json['uuid']}", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json['uuid'] == created.json['uuid']
+    assert response.json['items'][0]['product_name'] == "Book"
+    assert [e['event_type'] for e in response.json['events']] == ["order_created", "order_enqueued"]
+
+def test_get_order_status_not_found(client, auth_headers):
+    response = client.get("/api/orders/missing", headers=auth_headers)
+
+    assert response.status_code == 404
+
+def test_get_order_status_query_count_is_constant(client, auth_headers, query_counter):
+    small = client.post(
+        "/api/orders",
+        json=make_order(("Book", 1, "1.00")),
+        headers=auth_headers
+    )
+    large = client.post(
+        "/api/orders",
+        json=make_order(*[(f"Item {i}", 1, "1.00") for i in range(25)]),
+        headers=auth_headers
+    )
+    add_events(large.json['uuid'], 25)
+
+    query_counter.clear()
+    client.get(f"/api/orders/{small.json['uuid']}", headers=auth_headers)
+    small_queries = len(query_counter)
+
+    query_counter.clear()
+    response = client.get(f"/api/orders/{large.json['uuid']}", headers=auth_headers)
+    large_queries = len(query_counter)
+
+    assert len(response.json['items']) == 25
+    assert len(response.json['events']) == 27
+    assert small_queries == large_queries == 3
+
+def test_list_orders_paginates_with_cursor(client, auth_headers):
+    created = [
+        client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers).json['uuid']
+        for _ in range(5)
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        query = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = client.get("/api/orders", query_string=query, headers=auth_headers)
+        assert response.status_code == 200
+        assert len(response.json['orders']) <= 2
+
+        seen.extend(order['uuid'] for order in response.json['orders'])
+        cursor = response.json['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == list(reversed(created))
+
+def test_list_orders_filters_by_status(client, auth_headers):
+    client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order = OrderModel.query.one()
+
+    response = client.get("/api/orders", query_string={"status": "pending"}, headers=auth_headers)
+    assert [o['uuid'] for o in response.json['orders']] == [order.uuid]
+
+    response = client.get("/api/orders", query_string={"status": "completed"}, headers=auth_headers)
+    assert response.json == {"orders": [], "next_cursor": None}
+
+def test_list_orders_invalid_cursor(client, auth_headers):
+    response = client.get("/api/orders", query_string={"cursor": "not-a-cursor"}, headers=auth_headers)
+
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("cursor_id", [999, "other"])
+def test_list_orders_rejects_cursor_of_unknown_order(client, auth_headers, cursor_id):
+    if cursor_id == "other":
+        client.post(
+            "/auth/register",
+            json={"username": "other", "email": "other@example.com", "password": "abc123"},
+        )
+        token = client.post(
+            "/auth/login",
+            json={"email": "other@example.com", "password": "abc123"},
+        ).json['access_token']
+        client.post(
+            "/api/orders",
+            json=make_order(("Book", 1, "1.00")),
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        cursor_id = OrderModel.query.one().id
+
+    response = client.get(
+        "/api/orders",
+        query_string={"cursor": encode_cursor(cursor_id)},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 400
+    assert response.json['message'] == "Invalid pagination cursor."
+
+def test_list_orders_invalid_date_range(client, auth_headers):
+    response = client.get(
+        "/api/orders",
+        query_string={"created_from": "2026-02-01T00:00:00", "created_to": "2026-01-01T00:00:00"},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 422
+
+def test_get_order_status_is_served_from_cache(client, auth_headers, query_counter, mocker):
+    mocker.patch("api.tasks.order.process_order_business_logic")
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order_uuid = created.json['uuid']
+
+    first = client.get(f"/api/orders/{order_uuid}", headers=auth_headers)
+    query_counter.clear()
+    second = client.get(f"/api/orders/{order_uuid}", headers=auth_headers)
+
+    assert second.json == first.json
+    assert query_counter == []
+
+    order = OrderModel.query.filter_by(uuid=order_uuid).one()
+    process_order_task.apply(args=(order.id, None))
+
+    response = client.get(f"/api/orders/{order_uuid}", headers=auth_headers)
+    assert response.json['status'] == "completed"
+    assert response.json['events'][-1]['event_type'] == "order_completed"
+
+def read_sse_ids(response):
+    return [
+        int(line.removeprefix("id: "))
+        for line in response.get_data(as_text=True).splitlines()
+        if line.startswith("id: ")
+    ]
+
+def test_stream_order_events_replays_history_of_finished_order(client, auth_headers, mocker):
+    mocker.patch("api.tasks.order.process_order_business_logic")
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order = OrderModel.query.filter_by(uuid=created.json['uuid']).one()
+    process_order_task.apply(args=(order.id, None))
+    event_ids = [event.id for event in order.events]
+
+    response = client.get(f"/api/orders/{order.uuid}/events/stream", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert read_sse_ids(response) == event_ids
+    assert "event: order_completed" in response.get_data(as_text=True)
+
+def test_stream_order_events_resumes_from_last_event_id(client, auth_headers, mocker):
+    mocker.patch("api.tasks.order.process_order_business_logic")
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order = OrderModel.query.filter_by(uuid=created.json['uuid']).one()
+    process_order_task.apply(args=(order.id, None))
+    event_ids = [event.id for event in order.events]
+
+    response = client.get(
+        f"/api/orders/{order.uuid}/events/stream",
+        headers=auth_headers | {"Last-Event-ID": str(event_ids[1])}
+    )
+
+    assert read_sse_ids(response) == event_ids[2:]
+
+def test_stream_order_events_delivers_published_events(client, auth_headers, mocker):
+    mocker.patch("api.tasks.order.process_order_business_logic")
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order = OrderModel.query.filter_by(uuid=created.json['uuid']).one()
+    order_id = order.id
+
+    response = client.get(f"/api/orders/{order.uuid}/events/stream", headers=auth_headers)
+    # Runs after the stream subscribed, its events arrive through pub/sub.
+    process_order_task.apply(args=(order_id, None))
+
+    body = response.get_data(as_text=True)
+    assert "event: processing_started" in body
+    assert body.rstrip().split("\n\n")[-1].startswith(f"id: {read_sse_ids(response)[-1]}\nevent: order_completed")
+    assert len(read_sse_ids(response)) == len(set(read_sse_ids(response))) == 4
+
+def test_stream_order_events_ends_when_order_finished_before_subscribing(app, client, auth_headers, mocker):
+    app.config['ORDER_EVENTS_STREAM_TIMEOUT'] = 2
+    app.config['ORDER_EVENTS_STREAM_HEARTBEAT'] = 0.1
+    mocker.patch("api.tasks.order.process_order_business_logic")
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order_id = OrderModel.query.filter_by(uuid=created.json['uuid']).one().id
+
+    subscribe = order_resources.subscribe_order_events
+    def finish_then_subscribe(uuid):
+        # Completed after the order was read, before the stream subscribed. The request
+        # still holds the status it read first.
+        process_order_task.apply(args=(order_id, None))
+        set_committed_value(db.session.get(OrderModel, order_id), "status", OrderStatus.PENDING)
+        return subscribe(uuid)
+    mocker.patch("api.resources.order.subscribe_order_events", side_effect=finish_then_subscribe)
+
+    response = client.get(f"/api/orders/{created.json['uuid']}/events/stream", headers=auth_headers)
+
+    body = response.get_data(as_text=True)
+    assert "event: order_completed" in body
+    assert ": keep-alive" not in body
+
+def test_stream_order_events_ends_on_redis_error(client, auth_headers, mocker):
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    pubsub = mocker.Mock()
+    pubsub.get_message.side_effect = RedisError("connection lost")
+    mocker.patch("api.resources.order.subscribe_order_events", return_value=pubsub)
+
+    response = client.get(f"/api/orders/{created.json['uuid']}/events/stream", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert "event: order_enqueued" in response.get_data(as_text=True)
+    pubsub.close.assert_called_once()
+
+def test_stream_order_events_limits_open_streams(app, client, auth_headers, mocker):
+    app.config['ORDER_EVENTS_MAX_STREAMS'] = 1
+    init_order_events(app)
+    mocker.patch("api.tasks.order.process_order_business_logic")
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    process_order_task.apply(args=(OrderModel.query.filter_by(uuid=created.json['uuid']).one().id, None))
+    url = f"/api/orders/{created.json['uuid']}/events/stream"
+
+    # Holds the only slot until closed.
+    first = client.get(url, headers=auth_headers, buffered=False)
+    rejected = client.get(url, headers=auth_headers)
+    first.close()
+    after_close = client.get(url, headers=auth_headers, buffered=True)
+
+    assert first.status_code == 200
+    assert rejected.status_code == 503
+    assert rejected.headers['Retry-After'] == "5"
+    assert after_close.status_code == 200
+
+def test_stream_order_events_not_found(client, auth_headers):
+    response = client.get("/api/orders/missing/events/stream", headers=auth_headers)
+
+    assert response.status_code == 404
+
+@pytest.mark.parametrize("error, status, last_event", [
+    (None, "completed", "order_completed"),
+    ("business", "failed", "processing_failed"),
+])
+def test_process_order_task(client, auth_headers, error, status, last_event):
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order = OrderModel.query.filter_by(uuid=created.json['uuid']).one()
+
+    process_order_task.apply(args=(order.id, error))
+
+    response = client.get(f"/api/orders/{order.uuid}", headers=auth_headers)
+    assert response.json['status'] == status
+    assert response.json['events'][-1]['event_type'] == last_event
+
+def test_process_orders_task(client, auth_headers, mocker):
+    retry = mocker.patch.object(process_order_task, "apply_async")
+    order_ids = []
+    for _ in range(4):
+        created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+        order_ids.append(OrderModel.query.filter_by(uuid=created.json['uuid']).one().id)
+    done, declined, unreachable, claimed_elsewhere = order_ids
+    order_tasks._claim_order(claimed_elsewhere)
+
+    process_orders_task.apply(args=([
+        (done, None), (declined, "business"), (unreachable, "infrastructure"), (claimed_elsewhere, None)
+    ],))
+
+    statuses = [db.session.get(OrderModel, order_id).status for order_id in order_ids]
+    assert statuses == [OrderStatus.COMPLETED, OrderStatus.FAILED, OrderStatus.PROCESSING, OrderStatus.PROCESSING]
+    assert db.session.get(OrderModel, unreachable).claimed_at is None
+    retry.assert_called_once_with(
+        args=(unreachable, "infrastructure"), countdown=30, retries=1, priority=ANY
+    )
+
+def test_create_order_idempotency_key_replays_response(client, auth_headers, query_counter):
+    headers = auth_headers | {"Idempotency-Key": "order-1"}
+    payload = make_order(("Book", 1, "1.00"))
+
+    first = client.post("/api/orders", json=payload, headers=headers)
+    query_counter.clear()
+    retry = client.post("/api/orders", json=payload, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json == first.json
+    assert retry.headers['Idempotent-Replayed'] == "true"
+    assert query_counter == []
+    assert OrderModel.query.count() == 1
+    assert OutboxMessageModel.query.count() == 1
+
+def test_create_order_idempotency_key_reused_for_other_payload(client, auth_headers):
+    headers = auth_headers | {"Idempotency-Key": "order-1"}
+    client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=headers)
+
+    response = client.post("/api/orders", json=make_order(("Pen", 1, "1.00")), headers=headers)
+
+    assert response.status_code == 422
+
+def test_create_order_idempotency_key_in_progress(app, client, auth_headers):
+    app.config['IDEMPOTENCY_WAIT'] = 0
+    payload = make_order(("Book", 1, "1.00"))
+    # First request with the same key still running.
+    begin_idempotent_request("1", "order-1", request_fingerprint(OrderCreateSchema().load(payload)))
+
+    response = client.post("/api/orders", json=payload, headers=auth_headers | {"Idempotency-Key": "order-1"})
+
+    assert response.status_code == 409
+    assert OrderModel.query.count() == 0
+
+def test_create_order_idempotency_key_released_on_failure(client, auth_headers, mocker):
+    headers = auth_headers | {"Idempotency-Key": "order-1"}
+    payload = make_order(("Book", 1, "1.00"))
+    failing_enqueue = mocker.patch("api.resources.order.enqueue_task", side_effect=RuntimeError("boom"))
+    with pytest.raises(RuntimeError):
+        client.post("/api/orders", json=payload, headers=headers)
+    db.session.rollback()
+    mocker.stop(failing_enqueue)
+
+    response = client.post("/api/orders", json=payload, headers=headers)
+
+    assert response.status_code == 201
+
+def test_create_order_rate_limited_per_user(app, client, auth_headers):
+    app.config['RATE_LIMIT_ENABLED'] = True
+    app.config['RATE_LIMITS'] = dict(app.config['RATE_LIMITS'], orders={
+        "capacity": 2, "rate": 0.01, "global_capacity": 100, "global_rate": 100
+    })
+
+    statuses = [
+        client.post("/api/orders", json=make_order(("Book", 1, "10.00")), headers=auth_headers).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [201, 201, 429]
+    assert OrderModel.query.count() == 2
+
+def test_create_order_rate_limiter_fails_open(app, client, auth_headers, mocker):
+    app.config['RATE_LIMIT_ENABLED'] = True
+    mocker.patch("api.services.rate_limit.consume_token", side_effect=RedisError("down"))
+
+    response = client.post("/api/orders", json=make_order(("Book", 1, "10.00")), headers=auth_headers)
+
+    assert response.status_code == 201
+
+def test_small_orders_are_enqueued_with_lower_priority(app, client, auth_headers):
+    client.post("/api/orders", json=make_order(("Book", 2, "50.00")), headers=auth_headers)
+    client.post("/api/orders", json=make_order(("Pen", 1, "2.00")), headers=auth_headers)
+    client.post(
+        "/api/orders/batch",
+        json={"orders": [make_order(("Book", 2, "50.00")), make_order(("Pen", 1, "2.00"))]},
+        headers=auth_headers
+    )
+
+    priorities = [m.priority for m in OutboxMessageModel.query.order_by(OutboxMessageModel.id)]
+    large, small = app.config['ORDER_TASK_PRIORITY'], app.config['ORDER_SMALL_TOTAL_PRIORITY']
+    assert priorities == [large, small, large, small]
+
+def test_process_order_task_counts_business_failure(client, auth_headers):
+    labels = {"task_name": process_order_task.name, "reason": "business"}
+    before = REGISTRY.get_sample_value("celery_task_failures_total", labels) or 0
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order = OrderModel.query.filter_by(uuid=created.json['uuid']).one()
+
+    process_order_task.apply(args=(order.id, "business"))
+
+    assert REGISTRY.get_sample_value("celery_task_failures_total", labels) == before + 1
+
+def test_process_order_task_duplicate_delivery_is_noop(client, auth_headers):
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order = OrderModel.query.filter_by(uuid=created.json['uuid']).one()
+    order_id = order.id
+
+    process_order_task.apply(args=(order_id, None))
+    process_order_task.apply(args=(order_id, None))
+
+    event_types = [e.event_type for e in OrderEventModel.query.filter_by(order_id=order_id)]
+    assert event_types == [
+        OrderEventType.ORDER_CREATED,
+        OrderEventType.ORDER_ENQUEUED,
+        OrderEventType.PROCESSING_STARTED,
+        OrderEventType.ORDER_COMPLETED,
+    ]
+
+def test_process_order_task_redelivered_after_crash(app, client, auth_headers, mocker):
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order_id = OrderModel.query.filter_by(uuid=created.json['uuid']).one().id
+    business_logic = mocker.patch("api.tasks.order.process_order_business_logic")
+    # The first delivery claimed the order, then its worker died.
+    assert order_tasks._claim_order(order_id)
+
+    # Duplicate delivered while the lease runs.
+    process_order_task.apply(args=(order_id, None))
+    business_logic.assert_not_called()
+
+    order = db.session.get(OrderModel, order_id)
+    order.claimed_at -= timedelta(seconds=app.config['ORDER_CLAIM_LEASE'] + 1)
+    db.session.commit()
+    process_order_task.apply(args=(order_id, None))
+
+    business_logic.assert_called_once()
+    event_types = [e.event_type for e in OrderEventModel.query.filter_by(order_id=order_id)]
+    assert event_types[-2:] == [OrderEventType.PROCESSING_STARTED, OrderEventType.ORDER_COMPLETED]
+    assert db.session.get(OrderModel, order_id).status == OrderStatus.COMPLETED
+
+def test_process_order_task_duplicate_retry_backs_off(client, auth_headers, mocker):
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order_id = OrderModel.query.filter_by(uuid=created.json['uuid']).one().id
+    business_logic = mocker.patch("api.tasks.order.process_order_business_logic")
+    # The first attempt failed and released the order, one delivery of its retry took it.
+    order_tasks._claim_order(order_id)
+    order_tasks._release_order(order_id)
+    assert order_tasks._claim_order(order_id)
+
+    process_order_task.apply(args=(order_id, None), retries=1)
+
+    business_logic.assert_not_called()
+    assert db.session.get(OrderModel, order_id).status == OrderStatus.PROCESSING
+
+@pytest.mark.parametrize("database_url", ["file"], indirect=True)
+def test_process_order_task_concurrent_deliveries(app, mocker):
+    user = UserModel(username="user", email="test@example.com", password="secret")
+    db.session.add(user)
+    db.session.flush()
+    order = OrderModel(uuid="abc", user_id=user.id, total_amount=1, status=OrderStatus.PENDING)
+    db.session.add(order)
+    db.session.commit()
+    order_id = order.id
+    business_logic = mocker.patch("api.tasks.order.process_order_business_logic")
+
+    workers = 8
+    barrier = threading.Barrier(workers)
+
+    def deliver():
+        with app.app_context():
+            barrier.wait()
+            process_order_task.apply(args=(order_id, None))
+
+    threads = [threading.Thread(target=deliver) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db.session.expire_all()
+    event_types = [e.event_type for e in OrderEventModel.query.filter_by(order_id=order_id)]
+    assert event_types == [OrderEventType.PROCESSING_STARTED, OrderEventType.ORDER_COMPLETED]
+    assert db.session.get(OrderModel, order_id).status == OrderStatus.COMPLETED
+    business_logic.assert_called_once()
+
+@pytest.fixture
+def mock_revoke(mocker):
+    return mocker.patch("api.services.order_cancellation.celery.control.revoke")
+
+def test_cancel_pending_order(client, auth_headers, mock_redis, mock_revoke):
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order = OrderModel.query.filter_by(uuid=created.json['uuid']).one()
+    message = OutboxMessageModel.query.one()
+    assert message.task_id == order.task_id
+
+    response = client.post(f"/api/orders/{order.uuid}/cancel", headers=auth_headers)
+
+    assert response.status_code == 200
+    status = client.get(f"/api/orders/{order.uuid}", headers=auth_headers)
+    assert status.json['status'] == "cancelled"
+    assert status.json['events'][-1]['event_type'] == "order_cancelled"
+    assert mock_redis.exists(f"order_cancelled:{order.id}")
+    mock_revoke.assert_called_once_with(order.task_id)
+
+def test_cancelled_order_is_not_processed(client, auth_headers, mock_revoke, mocker):
+    business_logic = mocker.patch("api.tasks.order.process_order_business_logic")
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order_id = OrderModel.query.filter_by(uuid=created.json['uuid']).one().id
+    client.post(f"/api/orders/{created.json['uuid']}/cancel", headers=auth_headers)
+
+    process_order_task.apply(args=(order_id, None))
+
+    business_logic.assert_not_called()
+    assert db.session.get(OrderModel, order_id).status == OrderStatus.CANCELLED
+
+def test_cancel_during_processing_skips_retry(client, auth_headers, mock_revoke, mocker):
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    order_uuid = created.json['uuid']
+    order_id = OrderModel.query.filter_by(uuid=order_uuid).one().id
+
+    def cancel_then_fail(*args):
+        client.post(f"/api/orders/{order_uuid}/cancel", headers=auth_headers)
+        raise TemporaryInfrastructureError("timeout")
+
+    mocker.patch("api.tasks.order.process_order_business_logic", side_effect=cancel_then_fail)
+    retry = mocker.patch.object(process_order_task, "retry")
+
+    process_order_task.apply(args=(order_id, None))
+
+    retry.assert_not_called()
+    event_types = [e.event_type for e in OrderEventModel.query.filter_by(order_id=order_id)]
+    assert event_types[-2:] == [OrderEventType.PROCESSING_STARTED, OrderEventType.ORDER_CANCELLED]
+    assert db.session.get(OrderModel, order_id).status == OrderStatus.CANCELLED
+
+def test_cancel_finished_order_conflict(client, auth_headers, mock_revoke):
+    created = client.post("/api/orders", json=make_order(("Book", 1, "1.00")), headers=auth_headers)
+    process_order_task.apply(args=(OrderModel.query.one().id, None))
+
+    response = client.post(f"/api/orders/{created.json['uuid']}/cancel", headers=auth_headers)
+
+    assert response.status_code == 409
+    mock_revoke.assert_not_called()
+
+def test_cancel_order_not_found(client, auth_headers, mock_revoke):
+    response = client.post("/api/orders/missing/cancel", headers=auth_headers)
+
+    assert response.status_code == 404
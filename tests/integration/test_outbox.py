@@ -0,0 +1,57 @@
+import pytest
+
+from api.extensions import db
+from api.models import OutboxMessageModel
+from api.services import outbox
+from api.tasks.order import process_order_task
+
+@pytest.fixture
+def mock_send_task(mocker):
+    return mocker.patch("api.services.outbox.celery.send_task")
+
+def test_enqueue_task_is_published_only_after_commit(app, mock_send_task):
+    outbox.enqueue_task(process_order_task, 1, None)
+    db.session.rollback()
+
+    assert outbox.relay_outbox_batch(batch_size=10) == 0
+    mock_send_task.assert_not_called()
+
+def test_relay_publishes_and_deletes_messages(app, mock_send_task):
+    outbox.enqueue_task(process_order_task, 1, None)
+    outbox.enqueue_task(process_order_task, 2, "business")
+    db.session.commit()
+
+    assert outbox.relay_outbox_batch(batch_size=10) == 2
+
+    assert [c.args[0] for c in mock_send_task.call_args_list] == [process_order_task.name] * 2
+    assert [c.kwargs['args'] for c in mock_send_task.call_args_list] == [[1, None], [2, "business"]]
+    assert OutboxMessageModel.query.count() == 0
+
+def test_relay_drains_in_batches(app, mock_send_task):
+    for order_id in range(5):
+        outbox.enqueue_task(process_order_task, order_id, None)
+    db.session.commit()
+
+    assert outbox.relay_outbox_batch(batch_size=2) == 2
+    assert OutboxMessageModel.query.count() == 3
+    assert [m.args[0] for m in OutboxMessageModel.query.order_by(OutboxMessageModel.id)] == [2, 3, 4]
+
+def test_relay_keeps_messages_when_publishing_fails(app, mock_send_task):
+    mock_send_task.side_effect = ConnectionError("broker down")
+    outbox.enqueue_task(process_order_task, 1, None)
+    db.session.commit()
+
+    with pytest.raises(ConnectionError):
+        outbox.relay_outbox_batch(batch_size=10)
+    db.session.rollback()
+
+    assert OutboxMessageModel.query.count() == 1
+
+def test_relay_publishes_with_message_priority(app, mock_send_task):
+    outbox.enqueue_task(process_order_task, 1, None, priority=3)
+    outbox.enqueue_task(process_order_task, 2, None)
+    db.session.commit()
+
+    outbox.relay_outbox_batch(batch_size=10)
+
+    assert [c.kwargs['priority'] for c in mock_send_task.call_args_list] == [3, None]
@@ -16,4 +16,41 @@ def test_adding_same_jti_twice_is_safe():
     assert blocklist.is_jti_blocked(jti) is True
 
 def test_is_jti_blocked_returns_false():
-    assert blocklist.is_jti_blocked("non_existing_jti") is False
\ No newline at end of file
+    assert blocklist.is_jti_blocked("non_existing_jti") is False
+
+def test_negative_result_is_cached(mock_auth_redis):
+    assert blocklist.is_jti_blocked("cached_jti") is False
+
+    # Written behind the back of this process, e.g. by another worker.
+    mock_auth_redis.set("blocklist:cached_jti", "true")
+
+    assert blocklist.is_jti_blocked("cached_jti") is False
+
+def test_negative_result_expires_after_ttl(mock_auth_redis, mocker):
+    mocker.patch.object(blocklist._cache, "negative_ttl", 0)
+
+    assert blocklist.is_jti_blocked("expiring_jti") is False
+    mock_auth_redis.set("blocklist:expiring_jti", "true")
+
+    assert blocklist.is_jti_blocked("expiring_jti") is True
+
+def test_add_jti_publishes_revocation(mock_auth_redis):
+    pubsub = mock_auth_redis.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(blocklist.BLOCKLIST_CHANNEL)
+    pubsub.get_message()
+
+    blocklist.add_jti_to_blocklist("published_jti", exp=60)
+
+    message = pubsub.get_message(timeout=1)
+    assert message['data'] == b"published_jti"
+
+def test_local_cache_evicts_least_recently_used():
+    cache = blocklist._LocalBlocklistCache(maxsize=2, negative_ttl=60)
+    cache.set("a", True)
+    cache.set("b", False)
+    cache.get("a")
+    cache.set("c", True)
+
+    assert cache.get("a") is True
+    assert cache.get("b") is None
+    assert cache.get("c") is True
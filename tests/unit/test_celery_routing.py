@@ -0,0 +1,27 @@
+import pytest
+
+from api.celery_app import celery
+from api.tasks.order import process_order_task
+from api.tasks.email import send_registration_email_batch, send_user_registration_email
+from api.tasks.debug import long_running_task, test_retry_task
+
+def _queue(task_name: str) -> str:
+    return celery.amqp.router.route({}, task_name)['queue'].name
+
+@pytest.mark.parametrize("task, queue", [
+    (process_order_task, "orders"),
+    (send_registration_email_batch, "email"),
+    (send_user_registration_email, "email"),
+    (long_running_task, "debug"),
+    (test_retry_task, "debug"),
+])
+def test_tasks_are_routed_to_dedicated_queues(app, task, queue):
+    assert _queue(task.name) == queue
+
+def test_unrouted_tasks_use_default_queue(app):
+    assert _queue("api.tasks.unknown_task") == "celery"
+
+def test_every_route_has_a_declared_queue(app):
+    declared = {queue.name for queue in celery.conf.task_queues}
+
+    assert {route['queue'] for route in celery.conf.task_routes.values()} <= declared
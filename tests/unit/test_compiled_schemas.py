@@ -0,0 +1,195 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+from marshmallow import Schema, fields, ValidationError
+
+from api.models import (
+    OrderModel,
+    OrderStatus,
+    OrderItemModel,
+    OrderEventModel,
+    OrderEventType,
+    OrderEventArchiveModel
+)
+from api.schemas import (
+    OrderCreateSchema,
+    OrderResponseSchema,
+    OrderStatusResponseSchema,
+    dump_order,
+    dump_order_status
+)
+from api.schemas import compiled
+from api.schemas.compiled import compile_dump, compile_load, CompiledLoadSchema, FALLBACK
+
+def make_order(total_amount=Decimal("10.50"), created_at=datetime(2026, 10, 18, 12, 30, 1, 5, tzinfo=timezone.utc)):
+    order = OrderModel(
+        uuid="0b1f6c8e-4f7a-4a51-9d0c-2e6f4a1b9c3d",
+        status=OrderStatus.COMPLETED,
+        total_amount=total_amount,
+        created_at=created_at
+    )
+    order.items = [
+        OrderItemModel(product_name="Book", quantity=2, unit_price=Decimal("5.25")),
+        OrderItemModel(product_name="Zeszyt ą", quantity=1, unit_price=Decimal("0E-2")),
+    ]
+    order.recent_events = [
+        OrderEventModel(id=3, event_type=OrderEventType.PROCESSING_STARTED, created_at=datetime(2026, 10, 18, 12, 30, 2)),
+        OrderEventModel(
+            id=4,
+            event_type=OrderEventType.ORDER_COMPLETED,
+            payload={"attempt": 1, "nested": {"ok": True}},
+            created_at=datetime(2026, 10, 18, 12, 30, 3, tzinfo=timezone.utc)
+        ),
+    ]
+    order.event_archive = OrderEventArchiveModel(events=[
+        {"id": 1, "event_type": "ORDER_CREATED", "payload": None, "created_at": "2026-10-18T12:30:01.000005+00:00"},
+    ])
+    return order
+
+def as_json(payload: dict) -> str:
+    # No sort_keys: the key order has to match as well.
+    return json.dumps(payload)
+
+@pytest.mark.parametrize("total_amount", [Decimal("10.50"), Decimal("1E+3"), Decimal("-0.00"), 7, "3.10"])
+def test_dump_order_status_matches_marshmallow(total_amount):
+    order = make_order(total_amount=total_amount)
+
+    assert as_json(dump_order_status(order)) == as_json(OrderStatusResponseSchema().dump(order))
+
+def test_dump_order_matches_marshmallow():
+    order = make_order()
+
+    assert as_json(dump_order(order)) == as_json(OrderResponseSchema().dump(order))
+
+def test_dump_keeps_none_values():
+    order = make_order(created_at=None)
+    order.total_amount = None
+
+    assert dump_order(order) == OrderResponseSchema().dump(order)
+    assert dump_order(order)['created_at'] is None
+
+def test_dump_order_status_matches_marshmallow_for_stored_order(app):
+    from api.extensions import db
+    from api.models import UserModel
+
+    user = UserModel(username="user", email="test@example.com", password="secret")
+    db.session.add(user)
+    db.session.flush()
+    order = make_order()
+    order.user_id = user.id
+    db.session.add(order)
+    db.session.commit()
+    db.session.expire_all()
+
+    assert as_json(dump_order_status(order)) == as_json(OrderStatusResponseSchema().dump(order))
+
+def test_compile_rejects_unsupported_fields():
+    class WithMethod(Schema):
+        name = fields.Method("get_name")
+
+        def get_name(self, obj):
+            return "x"
+
+    with pytest.raises(TypeError, match="WithMethod.name"):
+        compile_dump(WithMethod)
+
+def test_compile_respects_data_key_and_load_only():
+    class Renamed(Schema):
+        name = fields.String(data_key="displayName")
+        secret = fields.String(load_only=True)
+
+    class Obj:
+        name = "x"
+        secret = "hidden"
+
+    assert compile_dump(Renamed)(Obj()) == Renamed().dump(Obj()) == {"displayName": "x"}
+
+def marshmallow_load(data):
+    """
+    Load through plain marshmallow, bypassing the compiled loader.
+    Returns the loaded data or the error messages.
+    """
+    try:
+        return super(CompiledLoadSchema, OrderCreateSchema()).load(data)
+    except ValidationError as e:
+        return e.messages
+
+def compiled_load(data):
+    try:
+        return OrderCreateSchema().load(data)
+    except ValidationError as e:
+        return e.messages
+
+def item(**overrides):
+    return {"product_name": "Book", "quantity": 2, "unit_price": "10.50", **overrides}
+
+@pytest.mark.parametrize("data", [
+    {"items": [item()]},
+    {"items": [item(), item(unit_price=3), item(unit_price=2.25), item(unit_price="1E+1")]},
+    {"items": [item()], "error": None},
+    {"items": [item()], "error": "business"},
+])
+def test_compiled_load_matches_marshmallow(data):
+    load = compile_load(OrderCreateSchema)
+
+    assert load(data) is not FALLBACK
+    assert load(data) == marshmallow_load(data)
+
+@pytest.mark.parametrize("quantity", ["2", 2.0])
+def test_unusual_values_are_loaded_by_marshmallow(quantity):
+    data = {"items": [item(quantity=quantity)]}
+
+    assert compile_load(OrderCreateSchema)(data) is FALLBACK
+    assert OrderCreateSchema().load(data) == marshmallow_load(data)
+
+@pytest.mark.parametrize("data", [
+    [],
+    {},
+    {"items": None},
+    {"items": []},
+    {"items": "Book"},
+    {"items": [item()], "unknown": 1},
+    {"items": [item(), "Book"]},
+    {"items": [item(quantity=0)]},
+    {"items": [item(quantity=True)]},
+    {"items": [item(unit_price="0.00")]},
+    {"items": [item(unit_price="abc")]},
+    {"items": [item(unit_price="NaN")]},
+    {"items": [item(unit_price=None)]},
+    {"items": [item(product_name="")]},
+    {"items": [item(product_name=7)]},
+    {"items": [{"product_name": "Book"}]},
+    {"items": [item(color="red")]},
+    {"items": [item()], "error": 5},
+    {"items": [item(product_name="B" * 121)]},
+    # Too many items along with other errors: all of them are reported.
+    {"items": [item()] * 101, "error": 5},
+    {"items": [item()] * 101, "unknown": 1},
+])
+def test_malformed_payloads_get_marshmallow_errors(data):
+    with pytest.raises(ValidationError):
+        OrderCreateSchema().load(data)
+
+    assert compiled_load(data) == marshmallow_load(data)
+
+def test_too_many_items_are_rejected_without_marshmallow(mocker):
+    marshmallow = mocker.spy(Schema, "load")
+    data = {"items": [item()] * 5_000}
+
+    with pytest.raises(ValidationError) as e:
+        OrderCreateSchema().load(data)
+
+    assert marshmallow.call_count == 0
+    assert e.value.messages == {"items": ["Length must be between 1 and 100."]}
+    assert e.value.messages == marshmallow_load(data)
+
+def test_too_many_items_are_rejected_before_loading_them(mocker):
+    load_decimal = mocker.patch.dict(compiled.LOAD_NAMESPACE, {"_load_decimal": mocker.Mock()})["_load_decimal"]
+    load = compile_load(OrderCreateSchema)
+
+    with pytest.raises(ValidationError) as e:
+        load({"items": [item(quantity=0)] + [item()] * 100})
+
+    load_decimal.assert_not_called()
+    assert e.value.messages == {"items": ["Length must be between 1 and 100."]}
@@ -0,0 +1,47 @@
+import os
+import pytest
+
+from api.services import email_templates
+
+@pytest.fixture
+def template_cache_dir(app, tmp_path):
+    app.config['EMAIL_TEMPLATE_CACHE_DIR'] = str(tmp_path)
+    email_templates.init_email_templates(app)
+    yield tmp_path
+    email_templates.get_template_env.cache_clear()
+
+def test_render_does_not_depend_on_working_directory(template_cache_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    html = email_templates.render_template("email/registration.html", username="alice")
+
+    assert "<strong>alice</strong>" in html
+
+def test_precompile_writes_bytecode_cache(template_cache_dir):
+    compiled = email_templates.precompile_email_templates()
+
+    assert compiled == 1
+    assert len(os.listdir(template_cache_dir)) == 1
+
+def test_render_memoizes_identical_contexts(template_cache_dir):
+    first = email_templates.render_template("email/registration.html", username="alice")
+    second = email_templates.render_template("email/registration.html", username="alice")
+    email_templates.render_template("email/registration.html", username="bob")
+
+    info = email_templates._render_memoized.cache_info()
+    assert first == second
+    assert (info.hits, info.misses) == (1, 2)
+
+def test_render_with_unhashable_context(template_cache_dir):
+    html = email_templates.render_template("email/registration.html", username="alice", tags=["a"])
+
+    assert "alice" in html
+
+def test_render_cache_size_comes_from_config(app, template_cache_dir):
+    app.config['EMAIL_TEMPLATE_RENDER_CACHE_SIZE'] = 1
+    email_templates.init_email_templates(app)
+
+    email_templates.render_template("email/registration.html", username="alice")
+    email_templates.render_template("email/registration.html", username="bob")
+
+    assert email_templates._render_memoized.cache_info().currsize == 1
@@ -0,0 +1,63 @@
+import os
+import runpy
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+
+CONFIG_PATH = Path(__file__).resolve().parents[2] / "gunicorn.conf.py"
+
+@pytest.fixture
+def multiproc_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    return tmp_path
+
+def test_worker_sizing_from_env(multiproc_dir, monkeypatch):
+    monkeypatch.setenv("GUNICORN_WORKERS", "3")
+    monkeypatch.setenv("GUNICORN_THREADS", "8")
+
+    config = runpy.run_path(str(CONFIG_PATH))
+
+    assert config['workers'] == 3
+    assert config['threads'] == 8
+    assert config['preload_app'] is True
+    assert config['wsgi_app'] == "api.wsgi:app"
+
+def test_on_starting_removes_stale_metric_files(multiproc_dir):
+    config = runpy.run_path(str(CONFIG_PATH))
+    stale = multiproc_dir / "counter_1.db"
+    own = multiproc_dir / f"counter_{os.getpid()}.db"
+    stale.touch()
+    own.touch()
+
+    config['on_starting'](server=None)
+
+    assert not stale.exists()
+    assert own.exists()
+
+def test_child_exit_drops_live_gauges_of_dead_worker(multiproc_dir):
+    config = runpy.run_path(str(CONFIG_PATH))
+    live_gauge = multiproc_dir / "gauge_livesum_42.db"
+    counter = multiproc_dir / "counter_42.db"
+    live_gauge.touch()
+    counter.touch()
+
+    config['child_exit'](server=None, worker=SimpleNamespace(pid=42))
+
+    assert not live_gauge.exists()
+    assert counter.exists()
+
+def test_config_enables_multiprocess_metrics_before_importing_prometheus():
+    # Runs in a fresh interpreter: prometheus_client is already imported in this one.
+    env = {k: v for k, v in os.environ.items() if k.upper() != "PROMETHEUS_MULTIPROC_DIR"}
+    script = (
+        "import runpy, sys\n"
+        f"runpy.run_path({str(CONFIG_PATH)!r})\n"
+        "from prometheus_client import values\n"
+        "sys.stdout.write(values.ValueClass.__name__)\n"
+    )
+
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+
+    assert result.stdout == "MmapedValue"
@@ -0,0 +1,37 @@
+from api.services import order_cache
+
+PAYLOAD = {"uuid": "abc", "status": "pending"}
+
+def test_cache_miss_then_hit(app):
+    payload, generation = order_cache.get_cached_order_status("abc", 1)
+    assert payload is None
+
+    order_cache.cache_order_status("abc", 1, PAYLOAD, generation)
+
+    payload, _ = order_cache.get_cached_order_status("abc", 1)
+    assert payload == PAYLOAD
+
+def test_cache_is_scoped_to_order_owner(app):
+    order_cache.cache_order_status("abc", 1, PAYLOAD, 0)
+
+    payload, _ = order_cache.get_cached_order_status("abc", 2)
+    assert payload is None
+
+def test_invalidate_drops_cached_payload(app):
+    order_cache.cache_order_status("abc", 1, PAYLOAD, 0)
+
+    order_cache.invalidate_order_status("abc")
+
+    payload, generation = order_cache.get_cached_order_status("abc", 1)
+    assert payload is None
+    assert generation == 1
+
+def test_stale_payload_from_previous_generation_is_ignored(app):
+    _, generation = order_cache.get_cached_order_status("abc", 1)
+
+    # Order changes while the reader is still loading it from the database.
+    order_cache.invalidate_order_status("abc")
+    order_cache.cache_order_status("abc", 1, PAYLOAD, generation)
+
+    payload, _ = order_cache.get_cached_order_status("abc", 1)
+    assert payload is None
@@ -0,0 +1,67 @@
+import pytest
+from datetime import date
+
+from api.services import order_event_archive
+from api.services.order_event_archive import add_months, partition_name, partition_month
+
+@pytest.mark.parametrize("month, months, expected", [
+    (date(2026, 10, 1), 1, date(2026, 11, 1)),
+    (date(2026, 12, 1), 1, date(2027, 1, 1)),
+    (date(2026, 1, 1), -1, date(2025, 12, 1)),
+    (date(2026, 10, 1), -22, date(2024, 12, 1)),
+])
+def test_add_months(month, months, expected):
+    assert add_months(month, months) == expected
+
+def test_partition_name_round_trips():
+    assert partition_name(date(2026, 3, 1)) == "order_events_2026_03"
+    assert partition_month("order_events_2026_03") == date(2026, 3, 1)
+
+def test_default_partition_has_no_month():
+    assert partition_month("order_events_default") is None
+
+def test_cli_refuses_unpartitioned_database(app):
+    result = app.test_cli_runner().invoke(args=["events", "archive"])
+
+    assert result.exit_code != 0
+    assert "only partitioned on Postgres" in result.output
+
+@pytest.fixture
+def fake_session(mocker):
+    mocker.patch.object(order_event_archive, "current_month", return_value=date(2026, 10, 1))
+    return mocker.patch.object(order_event_archive, "db").session
+
+def executed(session) -> list[str]:
+    return [str(call.args[0]).split(" (")[0] for call in session.execute.call_args_list]
+
+def test_create_partitions_skips_existing_months(fake_session, mocker):
+    fake_session.scalars.side_effect = [
+        mocker.Mock(all=lambda: []),
+        mocker.Mock(all=lambda: ["order_events_2026_10", "order_events_default"]),
+    ]
+
+    created = order_event_archive.create_partitions(months_ahead=1)
+
+    assert created == ["order_events_2026_11"]
+    assert executed(fake_session) == ["CREATE TABLE order_events_2026_11 PARTITION OF order_events FOR VALUES FROM"]
+    fake_session.commit.assert_called_once()
+
+def test_create_partitions_moves_events_out_of_default_partition(fake_session, mocker):
+    # A missed run: September's events landed in the default partition.
+    fake_session.scalars.side_effect = [
+        mocker.Mock(all=lambda: [date(2026, 9, 1)]),
+        mocker.Mock(all=lambda: ["order_events_2026_08", "order_events_default"]),
+    ]
+
+    created = order_event_archive.create_partitions(months_ahead=0)
+
+    assert created == ["order_events_2026_09", "order_events_2026_10"]
+    assert executed(fake_session) == [
+        "ALTER TABLE order_events DETACH PARTITION order_events_default",
+        "CREATE TABLE order_events_2026_09 PARTITION OF order_events FOR VALUES FROM",
+        "INSERT INTO order_events_2026_09",
+        "DELETE FROM order_events_default WHERE created_at >= '2026-09-01' AND created_at < '2026-10-01'",
+        "CREATE TABLE order_events_2026_10 PARTITION OF order_events FOR VALUES FROM",
+        "ALTER TABLE order_events ATTACH PARTITION order_events_default DEFAULT",
+    ]
+    fake_session.commit.assert_called_once()
@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from api.exceptions import BusinessLogicError, TemporaryInfrastructureError
+from api.services.order_processing import OrderProcessingEngine, SimulatedDownstream
+
+class TrackingDownstream(SimulatedDownstream):
+    def __init__(self, latency):
+        super().__init__(latency)
+        self.active = 0
+        self.max_active = 0
+
+    async def reserve_inventory(self, order_id, error):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await super().reserve_inventory(order_id, error)
+
+    async def create_shipment(self, order_id, error):
+        await super().create_shipment(order_id, error)
+        self.active -= 1
+
+def test_process_many_respects_concurrency_limit():
+    downstream = TrackingDownstream(latency=0.03)
+    engine = OrderProcessingEngine(downstream, concurrency=4)
+
+    results = asyncio.run(engine.process_many([(i, None) for i in range(20)]))
+
+    assert results == [None] * 20
+    assert downstream.max_active == 4
+
+def test_run_many_reports_errors_per_order():
+    engine = OrderProcessingEngine(SimulatedDownstream(latency=0), concurrency=10)
+
+    results = engine.run_many([(1, None), (2, "business"), (3, "infrastructure")])
+
+    assert results[0] is None
+    assert isinstance(results[1], BusinessLogicError)
+    assert isinstance(results[2], TemporaryInfrastructureError)
+
+def test_run_many_shares_concurrency_limit_with_run():
+    downstream = TrackingDownstream(latency=0.05)
+    engine = OrderProcessingEngine(downstream, concurrency=6)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        singles = [executor.submit(engine.run, order_id, None) for order_id in range(4)]
+        engine.run_many([(order_id, None) for order_id in range(4, 20)])
+        [single.result() for single in singles]
+
+    assert downstream.max_active == 6
+
+def test_run_raises_business_errors_in_calling_thread():
+    engine = OrderProcessingEngine(SimulatedDownstream(latency=0), concurrency=10)
+
+    with pytest.raises(BusinessLogicError):
+        engine.run(1, "business")
+    with pytest.raises(TemporaryInfrastructureError):
+        engine.run(1, "infrastructure")
+
+def test_run_shares_one_event_loop_between_threads():
+    downstream = TrackingDownstream(latency=0.05)
+    engine = OrderProcessingEngine(downstream, concurrency=8)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda order_id: engine.run(order_id, None), range(16)))
+
+    assert downstream.max_active == 8
@@ -0,0 +1,50 @@
+import pytest
+
+from api.extensions import db
+from api.exceptions import InvalidOrderTransitionError
+from api.models import OrderModel, OrderStatus, UserModel, ORDER_STATUS_TRANSITIONS
+from api.services.order_status import can_transition, transition_order_status
+
+@pytest.fixture
+def order(app):
+    user = UserModel(username="user", email="test@example.com", password="secret")
+    db.session.add(user)
+    db.session.flush()
+    order = OrderModel(uuid="abc", user_id=user.id, total_amount=10, status=OrderStatus.PENDING)
+    db.session.add(order)
+    db.session.commit()
+    return order
+
+def test_every_status_has_transitions():
+    assert set(ORDER_STATUS_TRANSITIONS) == set(OrderStatus)
+
+@pytest.mark.parametrize("status", [OrderStatus.COMPLETED, OrderStatus.FAILED, OrderStatus.CANCELLED])
+def test_final_statuses_have_no_way_out(status):
+    assert not any(can_transition(status, new) for new in OrderStatus)
+
+def test_transition_updates_status(order):
+    assert transition_order_status(order.id, OrderStatus.PENDING, OrderStatus.PROCESSING) == "abc"
+    db.session.commit()
+
+    db.session.refresh(order)
+    assert order.status == OrderStatus.PROCESSING
+
+def test_transition_from_unexpected_status_is_a_noop(order):
+    assert transition_order_status(order.id, OrderStatus.PROCESSING, OrderStatus.COMPLETED) is None
+    db.session.commit()
+
+    db.session.refresh(order)
+    assert order.status == OrderStatus.PENDING
+
+def test_transition_does_not_read_the_order_first(order, query_counter):
+    order_id = order.id
+    query_counter.clear()
+
+    transition_order_status(order_id, OrderStatus.PENDING, OrderStatus.PROCESSING)
+
+    assert query_counter[0].startswith("UPDATE orders")
+    assert not any(statement.startswith("SELECT") for statement in query_counter)
+
+def test_disallowed_transition_raises(order):
+    with pytest.raises(InvalidOrderTransitionError):
+        transition_order_status(order.id, OrderStatus.PENDING, OrderStatus.COMPLETED)
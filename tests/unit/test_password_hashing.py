@@ -0,0 +1,85 @@
+import threading
+import pytest
+from passlib.hash import pbkdf2_sha256 as sha256
+
+from api.exceptions import PasswordHashingSaturatedError
+from api.services import password_hashing
+
+@pytest.fixture
+def fresh_executor(mocker):
+    mocker.patch.object(password_hashing, "_executor", None)
+    mocker.patch.object(password_hashing, "_slots", None)
+
+def test_hash_and_verify_password(app):
+    hashed = password_hashing.hash_password("abc123")
+
+    assert password_hashing.verify_password("abc123", hashed) is True
+    assert password_hashing.verify_password("wrong", hashed) is False
+
+def test_hash_uses_configured_rounds(app):
+    app.config['PASSWORD_HASH_ROUNDS'] = 1000
+
+    hashed = password_hashing.hash_password("abc123")
+
+    assert sha256.from_string(hashed).rounds == 1000
+    assert password_hashing.needs_rehash(hashed) is False
+    app.config['PASSWORD_HASH_ROUNDS'] = 2000
+    assert password_hashing.needs_rehash(hashed) is True
+
+def test_saturated_pool_rejects_immediately(app, mocker):
+    mocker.patch.object(
+        password_hashing,
+        "_get_executor",
+        return_value=(password_hashing._InlineExecutor(), threading.BoundedSemaphore(1))
+    )
+    _, slots = password_hashing._get_executor()
+    slots.acquire()
+
+    with pytest.raises(PasswordHashingSaturatedError):
+        password_hashing.hash_password("abc123")
+
+def test_hashing_runs_in_process_pool(app, fresh_executor):
+    app.config['PASSWORD_HASH_WORKERS'] = 1
+
+    hashed = password_hashing.hash_password("abc123")
+
+    assert isinstance(password_hashing._executor, password_hashing.ProcessPoolExecutor)
+    assert sha256.verify("abc123", hashed)
+    password_hashing._executor.shutdown()
+
+def test_process_pool_works_from_threaded_process(app, fresh_executor):
+    app.config['PASSWORD_HASH_WORKERS'] = 1
+    held = threading.Lock()
+    held.acquire()
+    # Another thread of the worker process, running while the pool starts.
+    thread = threading.Thread(target=held.acquire)
+    thread.start()
+
+    try:
+        hashed = password_hashing.hash_password("abc123")
+    finally:
+        held.release()
+        thread.join()
+
+    assert password_hashing._executor._mp_context.get_start_method() == "forkserver"
+    assert sha256.verify("abc123", hashed)
+    password_hashing._executor.shutdown()
+
+def test_broken_pool_is_replaced_and_job_retried(app, mocker, fresh_executor):
+    class BrokenExecutor(password_hashing._InlineExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            future = password_hashing.Future()
+            future.set_exception(password_hashing.BrokenProcessPool("worker died"))
+            return future
+
+    app.config['PASSWORD_HASH_WORKERS'] = 0
+    broken = BrokenExecutor()
+    mocker.patch.object(password_hashing, "_executor", broken)
+    mocker.patch.object(password_hashing, "_executor_pid", password_hashing.os.getpid())
+    mocker.patch.object(password_hashing, "_slots", threading.BoundedSemaphore(1))
+
+    hashed = password_hashing.hash_password("abc123")
+
+    assert sha256.verify("abc123", hashed)
+    assert isinstance(password_hashing._executor, password_hashing._InlineExecutor)
+    assert password_hashing._executor is not broken
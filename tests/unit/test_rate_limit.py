@@ -0,0 +1,52 @@
+import pytest
+
+from api.exceptions import RateLimitExceededError
+from api.services.rate_limit import consume_token
+
+@pytest.fixture
+def limits(app):
+    app.config['RATE_LIMITS'] = {
+        "test": {"capacity": 3, "rate": 1, "global_capacity": 5, "global_rate": 1},
+    }
+
+def test_bucket_allows_burst_then_rejects(limits):
+    for _ in range(3):
+        consume_token("test", "user:1")
+
+    with pytest.raises(RateLimitExceededError) as e:
+        consume_token("test", "user:1")
+    assert e.value.args[0] == 1
+
+def test_buckets_are_per_client(limits):
+    for _ in range(3):
+        consume_token("test", "user:1")
+
+    consume_token("test", "user:2")
+
+def test_global_bucket_limits_all_clients(limits):
+    for client_id in range(5):
+        consume_token("test", f"user:{client_id}")
+
+    with pytest.raises(RateLimitExceededError):
+        consume_token("test", "user:99")
+
+def test_rejected_request_does_not_take_a_token(limits, mock_redis):
+    for client_id in range(5):
+        consume_token("test", f"user:{client_id}")
+    with pytest.raises(RateLimitExceededError):
+        consume_token("test", "user:99")
+
+    assert mock_redis.hget("rate_limit:test:user:99", "tokens") is None
+
+def test_bucket_refills_over_time(limits, mock_redis):
+    for _ in range(3):
+        consume_token("test", "user:1")
+
+    # Move the last refill two seconds back instead of sleeping.
+    ts = int(mock_redis.hget("rate_limit:test:user:1", "ts"))
+    mock_redis.hset("rate_limit:test:user:1", "ts", ts - 2000)
+
+    consume_token("test", "user:1")
+    consume_token("test", "user:1")
+    with pytest.raises(RateLimitExceededError):
+        consume_token("test", "user:1")
@@ -0,0 +1,76 @@
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from celery.app.task import Context
+from celery.signals import task_prerun, task_postrun
+from prometheus_client import REGISTRY
+
+from api.exceptions import BusinessLogicError, TemporaryInfrastructureError
+from api.celery_app import celery
+from api.tasks.monitoring import QueueDepthCollector, failure_reason, queue_depths
+
+@celery.task
+def failing_task():
+    raise BusinessLogicError("invalid order")
+
+class StubTask:
+    def __init__(self, name: str, **request):
+        self.name = name
+        self.request = Context(**request)
+
+def sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+@pytest.mark.parametrize("exc, reason", [
+    (BusinessLogicError("invalid"), "business"),
+    (TemporaryInfrastructureError("timeout"), "infrastructure"),
+    (ValueError("bug"), "unexpected"),
+])
+def test_failure_reason(exc, reason):
+    assert failure_reason(exc) == reason
+
+def test_queue_depths_sum_priority_steps(mock_redis):
+    mock_redis.rpush("orders", "a", "b")
+    mock_redis.rpush("orders:6", "c")
+    mock_redis.rpush("email", "d")
+
+    assert queue_depths(mock_redis, ["orders", "email", "debug"], list(range(10)), ":") == {
+        "orders": 3,
+        "email": 1,
+        "debug": 0,
+    }
+
+def test_queue_depth_collector(mock_redis):
+    mock_redis.rpush("orders:3", "a")
+
+    family, = QueueDepthCollector(mock_redis, ["orders"], [0, 3], ":").collect()
+
+    assert [(s.labels, s.value) for s in family.samples] == [({"queue": "orders"}, 1)]
+
+def test_queue_wait_and_runtime_are_recorded(app):
+    task = StubTask("tests.slow_task", enqueued_at=time.time() - 2, eta=None, delivery_info={"routing_key": "orders"})
+    labels = {"task_name": task.name, "queue": "orders"}
+
+    task_prerun.send(sender=task, task_id="1", task=task)
+    task_postrun.send(sender=task, task_id="1", task=task)
+
+    assert sample("celery_task_queue_wait_seconds_count", labels) == 1
+    assert sample("celery_task_queue_wait_seconds_sum", labels) >= 2
+    assert sample("celery_task_runtime_seconds_count", {"task_name": task.name}) == 1
+
+def test_queue_wait_excludes_eta_delay(app):
+    # Published 30 seconds ago with a countdown that ran out a second ago.
+    eta = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+    task = StubTask("tests.retried_task", enqueued_at=time.time() - 30, eta=eta, delivery_info={"routing_key": "orders"})
+
+    task_prerun.send(sender=task, task_id="2", task=task)
+
+    assert sample("celery_task_queue_wait_seconds_sum", {"task_name": task.name, "queue": "orders"}) < 5
+
+def test_failed_task_is_counted_by_reason(app):
+    labels = {"task_name": failing_task.name, "reason": "business"}
+    before = sample("celery_task_failures_total", labels)
+
+    failing_task.apply()
+
+    assert sample("celery_task_failures_total", labels) == before + 1